@@ -16,10 +16,12 @@
 """Utilities for use with asynchronous code."""
 
 import asyncio
+from contextlib import suppress
 from functools import partial, wraps
 import os
 from pathlib import Path
-from typing import List, Union
+from queue import Queue
+from typing import List, Optional, Union
 
 from cylc.flow import LOG
 
@@ -465,3 +467,87 @@ def make_async(fcn):
 
 
 async_listdir = make_async(os.listdir)
+
+
+class Wakeup:
+    """Thread-safe signal for waking a coroutine which is sleeping.
+
+    The coroutine calls ``bind`` from within the event loop and then
+    ``wait``s. Any thread may call ``set`` to wake it up early.
+
+    Examples:
+        >>> async def test():
+        ...     wakeup = Wakeup()
+        ...     wakeup.bind()
+        ...     asyncio.get_running_loop().call_later(0.01, wakeup.set)
+        ...     return await wakeup.wait(5)
+        >>> asyncio.run(test())
+        True
+
+    """
+
+    def __init__(self):
+        self._event: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def bind(self) -> None:
+        """Bind to the running event loop."""
+        self._loop = asyncio.get_running_loop()
+        self._event = asyncio.Event()
+
+    def set(self) -> None:  # noqa: A003 (method name)
+        """Wake up the waiting coroutine (safe to call from any thread)."""
+        if self._loop is None or self._event is None:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._event.set()
+        else:
+            # RuntimeError if the loop has been closed
+            with suppress(RuntimeError):
+                self._loop.call_soon_threadsafe(self._event.set)
+
+    def clear(self) -> None:
+        """Forget any wake up calls received so far."""
+        if self._event is not None:
+            self._event.clear()
+
+    async def wait(self, timeout: float) -> bool:
+        """Sleep until woken up or the timeout (in seconds) is reached.
+
+        Returns:
+            True if woken up, False if the timeout was reached.
+
+        """
+        if self._event is None or timeout <= 0:
+            await asyncio.sleep(max(timeout, 0))
+            return False
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        self._event.clear()
+        return True
+
+
+class WakeupQueue(Queue):
+    """A queue which calls ``Wakeup.set`` whenever an item is put into it.
+
+    Examples:
+        >>> queue = WakeupQueue(Wakeup())
+        >>> queue.put(42)
+        >>> queue.get()
+        42
+
+    """
+
+    def __init__(self, wakeup: Wakeup, maxsize: int = 0):
+        super().__init__(maxsize)
+        self.wakeup = wakeup
+
+    def put(self, item, block=True, timeout=None):
+        super().put(item, block=block, timeout=timeout)
+        self.wakeup.set()
@@ -618,6 +618,147 @@ with Conf('global.cylc', desc='''
 
                Moved into the ``[scheduler]`` section from the top level.
         ''')
+        Conf('process pool asyncio', VDR.V_BOOLEAN, False, desc='''
+            Run process pool commands as asyncio subprocesses.
+
+            By default the scheduler checks on running commands (e.g. job
+            submission, polling and event handlers) and starts queued ones
+            each time the main loop runs.
+
+            If this is set, commands are started as soon as there is space
+            in the pool. The scheduler is notified as soon as each one exits,
+            rather than the next time the main loop checks.
+
+            .. seealso::
+
+               :cylc:conf:`global.cylc[scheduler]event driven main loop`
+
+            .. versionadded:: 8.2.0
+        ''')
+        Conf('xtrigger executor size', VDR.V_INTEGER, 0, desc='''
+            Number of worker processes for running xtrigger functions.
+
+            By default each xtrigger function call runs in a new
+            ``cylc function-run`` subprocess via the process pool.
+
+            If this is greater than zero, xtrigger functions that are
+            declared safe to do so (by setting ``executor_safe = True`` as an
+            attribute of the function) run in a pool of this many
+            long-lived worker processes instead. This avoids the cost of
+            starting a new Python interpreter for each call. The built-in
+            ``echo`` and ``workflow_state`` xtriggers are executor safe.
+
+            Functions run this way are not subject to the
+            :cylc:conf:`[..]process pool timeout` and each call occupies a
+            worker until it returns, so functions which sleep or block
+            should not be declared executor safe.
+
+            .. versionadded:: 8.2.0
+        ''')
+        Conf('batch job script syntax checks', VDR.V_BOOLEAN, False,
+             desc='''
+            Check the syntax of job scripts in batches, in the background.
+
+            Each job script is checked with ``bash -n`` before it is
+            submitted. By default this is done for one job at a time,
+            blocking the scheduler whilst each check runs.
+
+            If this is set, the job scripts written in each main loop
+            iteration are checked together by a single process pool command.
+            The jobs are submitted once the check has completed. A job script
+            with a syntax error causes its job to submit-fail as before.
+
+            .. versionadded:: 8.2.0
+        ''')
+        Conf('cache job script syntax checks', VDR.V_BOOLEAN, False, desc='''
+            Skip syntax checks for job scripts which are known to be valid.
+
+            If this is set, the user-defined parts of each job script which
+            passes its syntax check (the scripts and environment) are
+            remembered by their hash. Later job scripts with the same
+            user-defined parts (e.g. subsequent cycles of the same task) are
+            not checked again.
+
+            .. versionadded:: 8.2.0
+        ''')
+        Conf('event driven main loop', VDR.V_BOOLEAN, False, desc='''
+            Sleep until something happens rather than polling at a fixed
+            interval.
+
+            By default the scheduler main loop runs every second (or every
+            half second whilst subprocesses are running) whether or not
+            anything has happened.
+
+            If this is set the main loop sleeps until it is woken by an
+            incoming task message, command or external trigger, or until
+            the next timed event (e.g. a retry, timeout, poll or clock
+            trigger) is due. This reduces CPU usage for idle workflows and
+            reduces the latency of responding to task messages.
+
+            .. seealso::
+
+               :cylc:conf:`global.cylc[scheduler]main loop maximum sleep`
+
+            .. versionadded:: 8.2.0
+        ''')
+        Conf('main loop maximum sleep', VDR.V_INTERVAL, DurationFloat(10),
+             desc='''
+            The longest the main loop will sleep for in event driven mode.
+
+            Some time based checks (e.g. clock expiry and late task
+            detection) are not used to wake the main loop so may be delayed
+            by up to this interval.
+
+            .. seealso::
+
+               :cylc:conf:`global.cylc[scheduler]event driven main loop`
+
+            .. versionadded:: 8.2.0
+        ''')
+        Conf('persistent database connection', VDR.V_BOOLEAN, False,
+             desc='''
+            Keep the scheduler's connection to the workflow's private
+            database open.
+
+            By default the scheduler opens the private database, writes to
+            it, and closes it again on every main loop iteration that has
+            something to write.
+
+            If this is set the connection is kept open for the life of the
+            scheduler and the database uses write-ahead logging (WAL) with
+            ``synchronous=NORMAL``. This greatly reduces the I/O required
+            for each write. The scheduler still detects if the database
+            file is removed (e.g. by deletion of the run directory).
+
+            The public database (``log/db``) is unaffected.
+
+            .. note::
+
+               WAL mode requires the private database to be accessed from
+               one host at a time. The most recent writes may be lost (but
+               the database will not be corrupted) in the event of a power
+               failure.
+
+            .. versionadded:: 8.2.0
+        ''')
+        Conf('public database writer thread', VDR.V_BOOLEAN, False,
+             desc='''
+            Write to the workflow's public database (``log/db``) in a
+            background thread.
+
+            By default the scheduler writes each change to the private and
+            then the public database in the main loop. If the public
+            database is locked (e.g. by a process reading it), writes are
+            retried and eventually the public database is replaced by a
+            copy of the private database.
+
+            If this is set the changes are applied to the public database
+            by a background thread, so the main loop is never held up by
+            it. If the public database gets stuck, the thread replaces it
+            using the SQLite online backup API instead of copying the file.
+
+            .. versionadded:: 8.2.0
+        ''')
         Conf('auto restart delay', VDR.V_INTERVAL, desc=f'''
             Maximum number of seconds the auto-restart mechanism will delay
             before restarting workflows.
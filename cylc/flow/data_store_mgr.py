@@ -63,6 +63,8 @@ import json
 from time import time
 from typing import (
     Any,
+    Collection,
+    Dict,
     Optional,
     TYPE_CHECKING,
     Tuple,
@@ -80,8 +82,8 @@ from cylc.flow.id import Tokens
 from cylc.flow.network import API
 from cylc.flow.parsec.util import (
     listjoin,
-    pdeepcopy,
-    poverride
+    poverlay,
+    pshallowcopy,
 )
 from cylc.flow.workflow_status import get_workflow_status
 from cylc.flow.task_job_logs import JOB_LOG_OPTS, get_task_job_log
@@ -158,6 +160,18 @@ DELTAS_MAP = {
 
 DELTA_FIELDS = {DELTA_ADDED, DELTA_UPDATED, DELTA_PRUNED}
 
+# The node attributes indexed for each node type (see NodeIndex).
+NODE_INDEX_ATTRS = {
+    TASK_PROXIES: ('state', 'cycle_point', 'name', 'is_held', 'is_queued'),
+    FAMILY_PROXIES: ('state', 'cycle_point', 'name', 'is_held', 'is_queued'),
+    JOBS: ('state', 'cycle_point', 'name'),
+}
+
+# The field numbers of each delta type in the AllDeltas message.
+ALL_DELTAS_FIELD_NUMBERS = {
+    field.name: field.number for field in AllDeltas.DESCRIPTOR.fields
+}
+
 JOB_STATUSES_ALL = [
     TASK_STATUS_SUBMITTED,
     TASK_STATUS_SUBMIT_FAILED,
@@ -220,10 +234,36 @@ def setbuff(obj, key, value):
         setattr(obj, key, value)
 
 
-def generate_checksum(in_strings):
-    """Generate cross platform & python checksum from strings."""
+def element_checksum(in_string):
+    """Generate the checksum of a single element from its stamp (or ID)."""
     # can't use hash(), it's not the same across 32-64bit or python invocations
-    return zlib.adler32(''.join(sorted(in_strings)).encode()) & 0xffffffff
+    return zlib.crc32(in_string.encode())
+
+
+def generate_checksum(in_strings):
+    """Generate cross platform & python checksum from strings.
+
+    The checksum is independent of the order of the strings, and is the sum
+    of the checksums of the individual strings, so can be maintained
+    incrementally as elements are added, updated and pruned
+    (see DataStoreMgr.update_checksums).
+
+    Note: this differs from the checksum of API version 5 and earlier (the
+    adler32 of the sorted strings), hence API version 6.
+
+    Examples:
+        >>> generate_checksum(['a@1', 'b@2']) == generate_checksum(
+        ...     ['b@2', 'a@1'])
+        True
+        >>> checksum = generate_checksum(['a@1', 'b@2'])
+        >>> checksum = (
+        ...     checksum - element_checksum('b@2') + element_checksum('b@3')
+        ... ) & 0xffffffff
+        >>> checksum == generate_checksum(['a@1', 'b@3'])
+        True
+
+    """
+    return sum(map(element_checksum, in_strings)) & 0xffffffff
 
 
 def task_mean_elapsed_time(tdef):
@@ -371,6 +411,37 @@ def apply_delta(key, delta, data):
             del data[key][del_id]
 
 
+def encode_delimited_field(field_number, payload):
+    """Encode a length-delimited protobuf field (e.g. a sub-message).
+
+    This allows a message to be assembled from the serialisations of its
+    sub-messages without serialising them again.
+
+    Args:
+        field_number (int): The number of the field in the message.
+        payload (bytes): The serialised field value.
+
+    Returns:
+        bytes
+
+    Examples:
+        >>> jobs = JDeltas(pruned=['a'] * 100)
+        >>> all_bytes = encode_delimited_field(
+        ...     ALL_DELTAS_FIELD_NUMBERS[JOBS], jobs.SerializeToString())
+        >>> all_bytes == AllDeltas(jobs=jobs).SerializeToString()
+        True
+
+    """
+    header = bytearray()
+    for value in ((field_number << 3) | 2, len(payload)):
+        # base 128 varint
+        while value > 0x7f:
+            header.append((value & 0x7f) | 0x80)
+            value >>= 7
+        header.append(value)
+    return bytes(header) + payload
+
+
 def create_delta_store(delta=None, workflow_id=None):
     """Create a mini data-store out of the all deltas message.
 
@@ -415,6 +486,167 @@ def create_delta_store(delta=None, workflow_id=None):
     return delta_store
 
 
+def merge_delta_stores(older, newer):
+    """Coalesce two consecutive delta stores of a workflow into one.
+
+    Applying the result has the same effect as applying the older then the
+    newer delta store. Neither of the arguments is modified.
+
+    Args:
+        older (dict): A delta store (see create_delta_store).
+        newer (dict): The following delta store for the same workflow.
+
+    Returns:
+        dict
+
+    Examples:
+        >>> older = create_delta_store()
+        >>> older[DELTA_ADDED][JOBS]['a'] = PbJob(id='a', state='submitted')
+        >>> older[DELTA_PRUNED][JOBS].append('b')
+        >>> newer = create_delta_store()
+        >>> newer[DELTA_UPDATED][JOBS]['a'] = PbJob(id='a', state='running')
+        >>> newer[DELTA_ADDED][JOBS]['b'] = PbJob(id='b')
+        >>> merged = merge_delta_stores(older, newer)
+        >>> merged[DELTA_ADDED][JOBS]['a'].state
+        'running'
+        >>> sorted(merged[DELTA_ADDED][JOBS]), merged[DELTA_PRUNED][JOBS]
+        (['a', 'b'], [])
+        >>> older[DELTA_ADDED][JOBS]['a'].state
+        'submitted'
+
+    """
+    merged = create_delta_store(workflow_id=newer.get('id', older.get('id')))
+    for key in DATA_TEMPLATE:
+        if key == WORKFLOW:
+            new_added = newer[DELTA_ADDED][WORKFLOW]
+            merged[DELTA_ADDED][WORKFLOW].CopyFrom(
+                new_added if new_added.ListFields()
+                else older[DELTA_ADDED][WORKFLOW]
+            )
+            merged[DELTA_UPDATED][WORKFLOW] = _merge_element(
+                WORKFLOW,
+                older[DELTA_UPDATED][WORKFLOW],
+                newer[DELTA_UPDATED][WORKFLOW],
+            )
+            with suppress(KeyError):
+                merged[DELTA_PRUNED][WORKFLOW] = older[DELTA_PRUNED][WORKFLOW]
+            with suppress(KeyError):
+                merged[DELTA_PRUNED][WORKFLOW] = newer[DELTA_PRUNED][WORKFLOW]
+            continue
+        added = dict(older[DELTA_ADDED][key])
+        updated = dict(older[DELTA_UPDATED][key])
+        pruned = dict.fromkeys(older[DELTA_PRUNED][key])
+        for id_ in newer[DELTA_PRUNED][key]:
+            added.pop(id_, None)
+            updated.pop(id_, None)
+            pruned[id_] = None
+        for id_, element in newer[DELTA_ADDED][key].items():
+            pruned.pop(id_, None)
+            updated.pop(id_, None)
+            added[id_] = element
+        for id_, element in newer[DELTA_UPDATED][key].items():
+            if id_ in added:
+                added[id_] = _merge_element(key, added[id_], element)
+            elif id_ in updated:
+                updated[id_] = _merge_element(key, updated[id_], element)
+            else:
+                updated[id_] = element
+        merged[DELTA_ADDED][key] = added
+        merged[DELTA_UPDATED][key] = updated
+        merged[DELTA_PRUNED][key] = list(pruned)
+    return merged
+
+
+def _merge_element(key, element, update):
+    """Return a copy of a data element with an update merged in.
+
+    (as apply_delta would merge the update into the element)
+    """
+    merged = element.__class__()
+    merged.CopyFrom(element)
+    for field, _ in update.ListFields():
+        if field.name in CLEAR_FIELD_MAP[key]:
+            merged.ClearField(field.name)
+    merged.MergeFrom(update)
+    return merged
+
+
+class NodeIndex:
+    """Secondary indexes of the nodes of one type in a workflow data-store.
+
+    Maps the values of selected node attributes to the IDs of the nodes with
+    those values, allowing nodes to be selected without scanning the whole
+    store. Also caches the parsed node IDs.
+
+    Maintained as deltas are applied to the data-store
+    (see DataStoreMgr.apply_delta_batch).
+
+    Args:
+        attrs: The node attributes to index.
+
+    Examples:
+        >>> index = NodeIndex(('state',))
+        >>> node = PbJob(id='~u/w//1/a/01', state='running')
+        >>> index.update(node.id, node)
+        >>> list(index.get('state', 'running'))
+        ['~u/w//1/a/01']
+        >>> index.tokens[node.id]['task']
+        'a'
+        >>> index.update(node.id, None)
+        >>> list(index.get('state', 'running'))
+        []
+
+    """
+
+    __slots__ = ('attrs', 'index', 'values', 'tokens')
+
+    def __init__(self, attrs: Tuple[str, ...]):
+        self.attrs = attrs
+        # {attr: {value: {node_id: None}}}
+        self.index: Dict[str, Dict[Any, Dict[str, None]]] = {
+            attr: {} for attr in attrs
+        }
+        # {node_id: (value, ...)}
+        self.values: Dict[str, tuple] = {}
+        # {node_id: tokens}
+        self.tokens: Dict[str, Tokens] = {}
+
+    def update(self, node_id: str, node: Optional[Any]) -> None:
+        """Re-index a node.
+
+        Args:
+            node_id: The node ID.
+            node: The node, or None if it has been removed from the store.
+
+        """
+        values = (
+            None if node is None
+            else tuple(getattr(node, attr) for attr in self.attrs)
+        )
+        old_values = self.values.get(node_id)
+        if values == old_values:
+            return
+        if old_values is not None:
+            for attr, value in zip(self.attrs, old_values):
+                ids = self.index[attr][value]
+                del ids[node_id]
+                if not ids:
+                    del self.index[attr][value]
+        if values is None:
+            del self.values[node_id]
+            del self.tokens[node_id]
+            return
+        self.values[node_id] = values
+        for attr, value in zip(self.attrs, values):
+            self.index[attr].setdefault(value, {})[node_id] = None
+        if node_id not in self.tokens:
+            self.tokens[node_id] = Tokens(node_id)
+
+    def get(self, attr: str, value: Any) -> Collection[str]:
+        """Return the IDs of the nodes with the given attribute value."""
+        return self.index[attr].get(value, {}).keys()
+
+
 class DataStoreMgr:
     """Manage the workflow data store.
 
@@ -443,7 +675,8 @@ class DataStoreMgr:
         .parents (dict):
             Local store of config.get_parent_lists()
         .publish_deltas (list):
-            Collection of the latest applied deltas for publishing.
+            The latest applied deltas serialised for publishing,
+            [(topic, bytes), ...].
         .schd (cylc.flow.scheduler.Scheduler):
             Workflow scheduler object.
         .workflow_id (str):
@@ -493,12 +726,25 @@ class DataStoreMgr:
         }
         # internal delta
         self.delta_queues = {self.workflow_id: {}}
+        # Running (order independent) checksums of the data-store elements,
+        # see generate_checksum.
+        self.checksums = {key: 0 for key in DATA_TEMPLATE if key != WORKFLOW}
+        # Secondary indexes of the data-store nodes (for the resolvers).
+        self.node_indexes = {
+            self.workflow_id: {
+                key: NodeIndex(attrs)
+                for key, attrs in NODE_INDEX_ATTRS.items()
+            }
+        }
         self.publish_deltas = []
         # internal n-window
         self.all_task_pool = set()
         self.n_window_nodes = {}
         self.n_window_edges = {}
         self.n_window_boundary_nodes = {}
+        # memoised graph neighbours of n-window nodes (see
+        # get_graph_neighbours), [tp_id] = (has_children, children, parents)
+        self.graph_neighbours = {}
         self.db_load_task_proxies = {}
         self.family_pruned_ids = set()
         self.prune_trigger_nodes = {}
@@ -774,14 +1020,12 @@ class DataStoreMgr:
         edge_distance += 1
 
         # Don't expand window about orphan task.
-        child_tokens: Tokens
-        parent_tokens: Tokens
         if not is_orphan:
-            tdef = self.schd.config.taskdefs[source_tokens['task']]
-            if graph_children is None:
-                graph_children = generate_graph_children(tdef, point)
+            has_children, children, parents = self.get_graph_neighbours(
+                source_tokens, point, graph_children
+            )
             if (
-                    (not any(graph_children.values()) and descendant)
+                    (not has_children and descendant)
                     or self.n_edge_distance == 0
             ):
                 self.n_window_boundary_nodes[
@@ -790,65 +1034,50 @@ class DataStoreMgr:
 
             # TODO: xtrigger is workflow_state edges too
             # Reference set for workflow relations
-            final_point = self.schd.config.final_point
             if edge_distance == 1:
                 descendant = True
             # Children/downstream nodes
-            for items in graph_children.values():
-                for child_name, child_point, _ in items:
-                    if child_point > final_point:
-                        continue
-                    child_tokens = self.id_.duplicate(
-                        cycle=str(child_point),
-                        task=child_name,
-                    )
-                    # We still increment the graph one further to find
-                    # boundary nodes, but don't create elements.
-                    if edge_distance <= self.n_edge_distance:
-                        self.generate_edge(
-                            source_tokens,
-                            child_tokens,
-                            active_id
-                        )
-                    if child_tokens.id in self.n_window_nodes[active_id]:
-                        continue
-                    self.increment_graph_window(
+            for child_tokens, child_point in children:
+                # We still increment the graph one further to find
+                # boundary nodes, but don't create elements.
+                if edge_distance <= self.n_edge_distance:
+                    self.generate_edge(
+                        source_tokens,
                         child_tokens,
-                        child_point,
-                        flow_nums,
-                        edge_distance,
-                        active_id,
-                        descendant,
-                        False
+                        active_id
                     )
+                if child_tokens.id in self.n_window_nodes[active_id]:
+                    continue
+                self.increment_graph_window(
+                    child_tokens,
+                    child_point,
+                    flow_nums,
+                    edge_distance,
+                    active_id,
+                    descendant,
+                    False
+                )
 
             # Parents/upstream nodes
-            for items in generate_graph_parents(tdef, point).values():
-                for parent_name, parent_point, _ in items:
-                    if parent_point > final_point:
-                        continue
-                    parent_tokens = self.id_.duplicate(
-                        cycle=str(parent_point),
-                        task=parent_name,
-                    )
-                    if edge_distance <= self.n_edge_distance:
-                        # reverse for parent
-                        self.generate_edge(
-                            parent_tokens,
-                            source_tokens,
-                            active_id
-                        )
-                    if parent_tokens.id in self.n_window_nodes[active_id]:
-                        continue
-                    self.increment_graph_window(
+            for parent_tokens, parent_point in parents:
+                if edge_distance <= self.n_edge_distance:
+                    # reverse for parent
+                    self.generate_edge(
                         parent_tokens,
-                        parent_point,
-                        flow_nums,
-                        edge_distance,
-                        active_id,
-                        False,
-                        True
+                        source_tokens,
+                        active_id
                     )
+                if parent_tokens.id in self.n_window_nodes[active_id]:
+                    continue
+                self.increment_graph_window(
+                    parent_tokens,
+                    parent_point,
+                    flow_nums,
+                    edge_distance,
+                    active_id,
+                    False,
+                    True
+                )
 
         # If this is the active task (edge_distance has been incremented),
         # then add the most distant child as a trigger to prune it.
@@ -867,6 +1096,66 @@ class DataStoreMgr:
                 getattr(self.updated[WORKFLOW], EDGES).edges.extend(
                     self.n_window_edges[active_id])
 
+    def get_graph_neighbours(
+        self,
+        tokens: Tokens,
+        point,
+        graph_children: Optional[dict] = None,
+    ) -> Tuple[bool, list, list]:
+        """Return the graph children and parents of a task proxy node.
+
+        The result is memoised (until the node is pruned), as overlapping
+        graph windows of active tasks would otherwise generate the same
+        neighbours over again.
+
+        Args:
+            tokens: The node ID tokens.
+            point (PointBase): The node cycle point.
+            graph_children:
+                The graph children of the node, if already generated.
+
+        Returns:
+            (has_children, children, parents)
+
+            has_children:
+                Whether the node has any graph children (including those
+                beyond the final cycle point).
+            children, parents:
+                [(tokens, point), ...] of the neighbours up to the final
+                cycle point.
+
+        """
+        try:
+            return self.graph_neighbours[tokens.id]
+        except KeyError:
+            pass
+        tdef = self.schd.config.taskdefs[tokens['task']]
+        final_point = self.schd.config.final_point
+        if graph_children is None:
+            graph_children = generate_graph_children(tdef, point)
+        children = [
+            (
+                self.id_.duplicate(cycle=str(child_point), task=child_name),
+                child_point,
+            )
+            for items in graph_children.values()
+            for child_name, child_point, _ in items
+            if not child_point > final_point
+        ]
+        parents = [
+            (
+                self.id_.duplicate(cycle=str(parent_point), task=parent_name),
+                parent_point,
+            )
+            for items in generate_graph_parents(tdef, point).values()
+            for parent_name, parent_point, _ in items
+            if not parent_point > final_point
+        ]
+        neighbours = self.graph_neighbours[tokens.id] = (
+            any(graph_children.values()), children, parents
+        )
+        return neighbours
+
     def generate_edge(
         self,
         parent_tokens: Tokens,
@@ -1314,10 +1603,7 @@ class DataStoreMgr:
     def _apply_broadcasts_to_runtime(self, tokens, rtconfig):
         # Handle broadcasts
         overrides = self.schd.broadcast_mgr.get_broadcast(tokens)
-        if overrides:
-            rtconfig = pdeepcopy(rtconfig)
-            poverride(rtconfig, overrides, prepend=True)
-        return rtconfig
+        return poverlay(rtconfig, overrides, prepend=True)
 
     def insert_job(self, name, cycle_point, status, job_conf):
         """Insert job into data-store.
@@ -1367,7 +1653,7 @@ class DataStoreMgr:
         )
         # Not all fields are populated with some submit-failures,
         # so use task cfg as base.
-        j_cfg = pdeepcopy(self._apply_broadcasts_to_runtime(
+        j_cfg = pshallowcopy(self._apply_broadcasts_to_runtime(
             tp_tokens,
             self.schd.config.cfg['runtime'][tproxy.name]
         ))
@@ -1548,6 +1834,7 @@ class DataStoreMgr:
         j_updated = self.updated[JOBS]
         parent_ids = set()
         for tp_id in list(node_ids):
+            self.graph_neighbours.pop(tp_id, None)
             if tp_id in self.n_window_nodes:
                 del self.n_window_nodes[tp_id]
             if tp_id in self.n_window_edges:
@@ -2267,24 +2554,52 @@ class DataStoreMgr:
         data = self.data[self.workflow_id]
         for key, delta in self.deltas.items():
             if delta.ListFields():
+                if key == WORKFLOW:
+                    apply_delta(key, delta, data)
+                    continue
+                ids = {e.id for e in delta.added}
+                ids.update(e.id for e in delta.updated)
+                ids.update(delta.pruned)
+                self.update_checksums(key, ids, data)
                 apply_delta(key, delta, data)
+                self.update_checksums(key, ids, data, applied=True)
+                node_index = self.node_indexes[self.workflow_id].get(key)
+                if node_index is not None:
+                    for id_ in ids:
+                        node_index.update(id_, data[key].get(id_))
 
     def apply_delta_checksum(self):
         """Construct checksum on deltas for export."""
-        data = self.data[self.workflow_id]
         update_time = time()
         for key, delta in self.deltas.items():
             if delta.ListFields():
                 delta.time = update_time
                 if hasattr(delta, 'checksum'):
-                    if key == EDGES:
-                        s_att = 'id'
-                    else:
-                        s_att = 'stamp'
-                    delta.checksum = generate_checksum(
-                        [getattr(e, s_att)
-                         for e in data[key].values()]
-                    )
+                    delta.checksum = self.checksums[key]
+
+    def update_checksums(self, key, ids, data, applied=False):
+        """Maintain the data-store checksums through the application of deltas.
+
+        Call before (applied=False) and after (applied=True) applying a delta,
+        the checksums of the elements it touches are removed then restored,
+        so the cost scales with the size of the delta, not the data-store.
+
+        Args:
+            key (str): Element type (e.g. TASK_PROXIES).
+            ids (set): IDs of the elements the delta adds, updates or prunes.
+            data (dict): The workflow data-store.
+            applied (bool): Whether the delta has been applied yet.
+
+        """
+        s_att = 'id' if key == EDGES else 'stamp'
+        elements = data[key]
+        sign = 1 if applied else -1
+        checksum = self.checksums[key]
+        for id_ in ids:
+            element = elements.get(id_)
+            if element is not None:
+                checksum += sign * element_checksum(getattr(element, s_att))
+        self.checksums[key] = checksum & 0xffffffff
 
     def clear_delta_batch(self):
         """Clear current deltas."""
@@ -2328,19 +2643,49 @@ class DataStoreMgr:
         return workflow_msg
 
     def get_publish_deltas(self):
-        """Return deltas for publishing."""
-        all_deltas = DELTAS_MAP[ALL_DELTAS]()
+        """Return deltas for publishing.
+
+        Each delta is serialised once, the "all" deltas message is assembled
+        from the same serialisations. The published items are immutable, so
+        need not be copied for the publisher thread.
+
+        Returns:
+            list: [(topic, serialised delta), ...]
+
+        """
         result = []
+        all_fields = []
         for key, delta in self.deltas.items():
             if delta.ListFields():
-                result.append(
-                    (key.encode('utf-8'), delta, 'SerializeToString'))
-                getattr(all_deltas, key).CopyFrom(delta)
-        result.append(
-            (ALL_DELTAS.encode('utf-8'), all_deltas, 'SerializeToString')
+                delta_bytes = delta.SerializeToString()
+                result.append((key.encode('utf-8'), delta_bytes))
+                all_fields.append((ALL_DELTAS_FIELD_NUMBERS[key], delta_bytes))
+        all_bytes = b''.join(
+            encode_delimited_field(field_number, delta_bytes)
+            for field_number, delta_bytes in sorted(all_fields)
         )
+        result.append((ALL_DELTAS.encode('utf-8'), all_bytes))
         self.publish_pending = True
-        return deepcopy(result)
+        self.put_subscriber_deltas(all_bytes)
+        return result
+
+    def put_subscriber_deltas(self, all_bytes):
+        """Pass deltas to any GraphQL subscriptions to this workflow.
+
+        Args:
+            all_bytes (bytes):
+                The serialised AllDeltas message being published.
+
+        """
+        delta_queues = self.delta_queues[self.workflow_id]
+        if not delta_queues:
+            return
+        # (parse a fresh copy, the delta batch elements are referenced by
+        # the data-store and will be modified by later updates)
+        delta_store = create_delta_store(
+            AllDeltas.FromString(all_bytes), self.workflow_id)
+        for delta_queue in list(delta_queues.values()):
+            delta_queue.put((self.workflow_id, ALL_DELTAS, delta_store))
 
     def get_data_elements(self, element_type):
         """Get elements of a given type in the form of a delta.
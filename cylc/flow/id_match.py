@@ -21,6 +21,7 @@ from typing import (
     Dict,
     Iterable,
     List,
+    Optional,
     TYPE_CHECKING,
     # Tuple,
     # Union,
@@ -37,7 +38,7 @@ from cylc.flow.cycling.loader import get_point
 if TYPE_CHECKING:
     # from typing_extensions import Literal
 
-    from cylc.flow.task_pool import Pool
+    from cylc.flow.task_pool import NameIndex, Pool
     from cylc.flow.task_proxy import TaskProxy
     from cylc.flow.cycling import PointBase
 
@@ -82,6 +83,7 @@ def filter_ids(
     warn: 'bool' = True,
     out: 'IDTokens' = IDTokens.Task,
     pattern_match: 'bool' = True,
+    tasks_by_name: 'Optional[NameIndex]' = None,
     # ) -> _RET:
 ):
     """Filter IDs against a pool of tasks.
@@ -99,6 +101,11 @@ def filter_ids(
               be returned.
         warn:
             Whether to log a warning if no matching tasks are found.
+        tasks_by_name:
+            Index of the tasks in the pools by name then cycle point.
+            If provided, IDs which specify a task name (rather than a
+            family name or pattern) are looked up in the index rather than
+            by searching the pools.
 
     TODO:
         Consider using wcmatch which would add support for
@@ -176,7 +183,15 @@ def filter_ids(
             task = tokens[IDTokens.Task.value]
             task_sel_raw = tokens.get(IDTokens.Task.value + '_sel')
             task_sel = task_sel_raw or '*'
-            for pool in pools:
+            task_pools = pools
+            if tasks_by_name is not None and task in tasks_by_name:
+                # Only search instances of this task (task names cannot also
+                # be family names).
+                task_pools = [{
+                    icycle: {itask.identity: itask}
+                    for icycle, itask in tasks_by_name[task].items()
+                }]
+            for pool in task_pools:
                 for icycle, itasks in pool.items():
                     if not point_match(icycle, cycle, pattern_match):
                         continue
@@ -16,34 +16,178 @@
 """Write job files."""
 
 from contextlib import suppress
+from functools import lru_cache
+from hashlib import sha256
+from io import StringIO
 import os
 import re
 import stat
 from subprocess import Popen, PIPE, DEVNULL
 from textwrap import dedent
+from typing import Dict, Optional, Set, Tuple, Union
 
 from cylc.flow import __version__ as CYLC_VERSION
 from cylc.flow.job_runner_mgr import JobRunnerManager
 import cylc.flow.flags
 from cylc.flow.option_parsers import verbosity_to_env
 from cylc.flow.config import interpolate_template, ParamExpandError
+from cylc.flow.subprocctx import SubProcContext
 
 
 class JobFileWriter:
 
     """Write job files."""
 
-    def __init__(self):
+    # Check the syntax of the job files listed (null separated) on stdin
+    # with "bash -n", so that a whole batch of job files is checked by a
+    # single subprocess. For each file which fails, print
+    # "<file>\0<error>\0".
+    # Note: "bash -n" takes a single script so this still forks one bash per
+    # job file, checking the files together in one parse could let errors in
+    # one file (e.g. an unmatched quote or brace) cancel out those in another.
+    SYNTAX_CHECK_SCRIPT = dedent(r'''
+        while IFS= read -r -d '' job_file; do
+            if ! err="$(bash -n "${job_file}" 2>&1)"; then
+                printf '%s\0%s\n\0' "${job_file}" "${err}"
+            fi
+        done
+    ''')
+
+    REINVOCATION = dedent('''
+        if [[ $1 == 'noreinvoke' ]]; then
+            shift
+        else
+            exec bash -l "$0" noreinvoke "$@"
+        fi
+    ''')
+
+    def __init__(self, cache_syntax_checks=False):
         self.workflow_env = {}
+        # The rendered workflow environment section: (uuid_str, text)
+        self._workflow_environment: Optional[Tuple[str, str]] = None
         self.job_runner_mgr = JobRunnerManager()
+        # Hashes of the user-defined parts of job scripts which have passed
+        # syntax checks, if caching is enabled.
+        self.syntax_check_cache: Optional[Set[str]] = (
+            set() if cache_syntax_checks else None)
+        # Job files written by self.write_deferred:
+        # {local_job_file_path: (tmp_name, cache_key)}
+        self.syntax_check_queue: Dict[str, Tuple[str, Optional[str]]] = {}
+        # Results of deferred syntax checks:
+        # {local_job_file_path: None (in progress) | True | RuntimeError}
+        self.syntax_checks: Dict[
+            str, Optional[Union[bool, Exception]]
+        ] = {}
 
     def set_workflow_env(self, workflow_env):
         """Configure workflow environment for all job files."""
         self.workflow_env.clear()
         self.workflow_env.update(workflow_env)
+        self._workflow_environment = None
 
     def write(self, local_job_file_path, job_conf, check_syntax=True):
         """Write each job script section in turn."""
+        tmp_name = self._write_tmp(local_job_file_path, job_conf)
+        # check syntax
+        if check_syntax:
+            key = self._get_syntax_check_key(job_conf)
+            if key is None or key not in self.syntax_check_cache:
+                self._check_syntax(tmp_name)
+                if key is not None:
+                    self.syntax_check_cache.add(key)
+        self._install(tmp_name, local_job_file_path)
+
+    def write_deferred(self, local_job_file_path, job_conf):
+        """Write a job file, deferring the syntax check.
+
+        The syntax checks for job files written this way are run together
+        by the command returned by self.get_syntax_check_ctx.
+
+        Returns:
+            True if the job file is ready (its syntax is known to be valid),
+            else False (see self.syntax_checks for the result).
+
+        """
+        tmp_name = self._write_tmp(local_job_file_path, job_conf)
+        key = self._get_syntax_check_key(job_conf)
+        if key is not None and key in self.syntax_check_cache:
+            self._install(tmp_name, local_job_file_path)
+            return True
+        self.syntax_check_queue[local_job_file_path] = (tmp_name, key)
+        self.syntax_checks[local_job_file_path] = None
+        return False
+
+    def discard_syntax_check(self, local_job_file_path):
+        """Forget the syntax check of a job file which is no longer needed.
+
+        E.g. if its task has left the pool before the check completed.
+        Temporary files which have not been checked yet are removed.
+
+        """
+        self.syntax_checks.pop(local_job_file_path, None)
+        with suppress(KeyError):
+            tmp_name, _ = self.syntax_check_queue.pop(local_job_file_path)
+            with suppress(OSError):
+                os.unlink(tmp_name)
+
+    def get_syntax_check_ctx(self):
+        """Return a command to check the job files awaiting syntax checks.
+
+        Returns:
+            (SubProcContext, dict) - the command context and the job files
+            it checks (for self.syntax_check_callback), or None if there
+            is nothing to check.
+
+        """
+        if not self.syntax_check_queue:
+            return None
+        job_files = self.syntax_check_queue
+        self.syntax_check_queue = {}
+        ctx = SubProcContext(
+            'job-syntax-check',
+            ['/usr/bin/env', 'bash', '-c', self.SYNTAX_CHECK_SCRIPT],
+            stdin_str=''.join(
+                f'{tmp_name}\0' for tmp_name, _ in job_files.values()
+            ),
+        )
+        return ctx, job_files
+
+    def syntax_check_callback(self, ctx, job_files):
+        """Record the results of a batch of job file syntax checks."""
+        errors = {}
+        if ctx.out:
+            items = ctx.out.split('\0')
+            errors = dict(zip(items[0::2], items[1::2]))
+        for local_job_file_path, (tmp_name, key) in job_files.items():
+            if local_job_file_path not in self.syntax_checks:
+                # Discarded whilst being checked.
+                with suppress(OSError):
+                    os.unlink(tmp_name)
+                continue
+            if ctx.ret_code:
+                # Could not run the check.
+                # Remove temporary file
+                with suppress(OSError):
+                    os.unlink(tmp_name)
+                self.syntax_checks[local_job_file_path] = RuntimeError(
+                    ctx.err)
+            elif errors.get(tmp_name):
+                # This will leave behind the temporary file,
+                # which is useful for debugging syntax errors, etc.
+                self.syntax_checks[local_job_file_path] = RuntimeError(
+                    errors[tmp_name])
+            else:
+                try:
+                    self._install(tmp_name, local_job_file_path)
+                except OSError as exc:
+                    self.syntax_checks[local_job_file_path] = exc
+                    continue
+                if key is not None:
+                    self.syntax_check_cache.add(key)
+                self.syntax_checks[local_job_file_path] = True
+
+    def _write_tmp(self, local_job_file_path, job_conf):
+        """Write the job file to a temporary file, return its path."""
 
         # ########### !!!!!!!! WARNING !!!!!!!!!!! #####################
         # BE EXTREMELY WARY OF CHANGING THE ORDER OF JOB SCRIPT SECTIONS
@@ -76,31 +220,52 @@ class JobFileWriter:
             with suppress(OSError):
                 os.unlink(tmp_name)
             raise exc
-        # check syntax
-        if check_syntax:
-            try:
-                with Popen(  # nosec
-                    ['/usr/bin/env', 'bash', '-n', tmp_name],
-                    stderr=PIPE,
-                    stdin=DEVNULL,
-                    text=True
-                    # * the purpose of this is to evaluate user defined code
-                    #   prior to it being executed
-                ) as proc:
-                    if proc.wait():
-                        # This will leave behind the temporary file,
-                        # which is useful for debugging syntax errors, etc.
-                        raise RuntimeError(proc.communicate()[1])
-            except OSError as exc:
-                # Popen has a bad habit of not telling you anything if it fails
-                # to run the executable.
-                if exc.filename is None:
-                    exc.filename = 'bash'
-                # Remove temporary file
-                with suppress(OSError):
-                    os.unlink(tmp_name)
-                raise exc
-        # Make job file executable
+        return tmp_name
+
+    def _get_syntax_check_key(self, job_conf):
+        """Return the syntax check cache key for a job, if caching.
+
+        This is a hash of the user-defined parts of the job script, the rest
+        is generated by Cylc.
+
+        """
+        if self.syntax_check_cache is None:
+            return None
+        handle = StringIO()
+        self._write_runtime_environment(handle, job_conf)
+        self._write_script(handle, job_conf)
+        self._write_global_init_script(handle, job_conf)
+        return sha256(handle.getvalue().encode()).hexdigest()
+
+    @staticmethod
+    def _check_syntax(tmp_name):
+        """Check the syntax of a job file with "bash -n"."""
+        try:
+            with Popen(  # nosec
+                ['/usr/bin/env', 'bash', '-n', tmp_name],
+                stderr=PIPE,
+                stdin=DEVNULL,
+                text=True
+                # * the purpose of this is to evaluate user defined code
+                #   prior to it being executed
+            ) as proc:
+                if proc.wait():
+                    # This will leave behind the temporary file,
+                    # which is useful for debugging syntax errors, etc.
+                    raise RuntimeError(proc.communicate()[1])
+        except OSError as exc:
+            # Popen has a bad habit of not telling you anything if it fails
+            # to run the executable.
+            if exc.filename is None:
+                exc.filename = 'bash'
+            # Remove temporary file
+            with suppress(OSError):
+                os.unlink(tmp_name)
+            raise exc
+
+    @staticmethod
+    def _install(tmp_name, local_job_file_path):
+        """Make the job file executable and move it into place."""
         mode = (
             os.stat(tmp_name).st_mode |
             stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
@@ -151,13 +316,7 @@ class JobFileWriter:
         # option and GNU env doesn't support additional arguments (recent
         # versions permit this with the -S option similar to BSD env but we
         # cannot make the jump to this until is it more widely adopted)
-        handle.write(dedent('''
-            if [[ $1 == 'noreinvoke' ]]; then
-                shift
-            else
-                exec bash -l "$0" noreinvoke "$@"
-            fi
-        '''))
+        handle.write(self.REINVOCATION)
 
     def _write_prelude(self, handle, job_conf):
         """Job script prelude."""
@@ -198,18 +357,30 @@ class JobFileWriter:
 
     def _write_workflow_environment(self, handle, job_conf):
         """Workflow and task environment."""
-        handle.write("\n\ncylc__job__inst__cylc_env() {")
-        handle.write("\n    # CYLC WORKFLOW ENVIRONMENT:")
-        # write the static workflow variables
-        for var, val in sorted(self.workflow_env.items()):
-            if var not in ('CYLC_DEBUG', 'CYLC_VERBOSE', 'CYLC_WORKFLOW_ID'):
-                handle.write('\n    export %s="%s"' % (var, val))
+        # This is the same for every job, so is only rendered once
+        # (until the workflow environment is next set).
+        uuid_str = job_conf['uuid_str']
+        if (
+            self._workflow_environment is None
+            or self._workflow_environment[0] != uuid_str
+        ):
+            lines = [
+                "\n\ncylc__job__inst__cylc_env() {",
+                "\n    # CYLC WORKFLOW ENVIRONMENT:"
+            ]
+            # write the static workflow variables
+            for var, val in sorted(self.workflow_env.items()):
+                if var not in (
+                    'CYLC_DEBUG', 'CYLC_VERBOSE', 'CYLC_WORKFLOW_ID'
+                ):
+                    lines.append('\n    export %s="%s"' % (var, val))
 
-        if str(self.workflow_env.get('CYLC_UTC')) == 'True':
-            handle.write('\n    export TZ="UTC"')
+            if str(self.workflow_env.get('CYLC_UTC')) == 'True':
+                lines.append('\n    export TZ="UTC"')
 
-        handle.write(
-            '\n    export CYLC_WORKFLOW_UUID="%s"' % job_conf['uuid_str'])
+            lines.append('\n    export CYLC_WORKFLOW_UUID="%s"' % uuid_str)
+            self._workflow_environment = (uuid_str, ''.join(lines))
+        handle.write(self._workflow_environment[1])
 
     def _write_task_environment(self, handle, job_conf):
         comm_meth = job_conf['platform']['communication method']
@@ -238,33 +409,56 @@ class JobFileWriter:
                 "\n    CYLC_TASK_WORK_DIR_BASE='%s'" % job_conf['work_d'])
         handle.write("\n}")
 
-    @staticmethod
-    def _write_runtime_environment(handle, job_conf):
+    @classmethod
+    def _write_runtime_environment(cls, handle, job_conf):
         if job_conf['environment']:
-            handle.write("\n\ncylc__job__inst__user_env() {")
-            # Generate variable assignment expressions
-            handle.write("\n    # TASK RUNTIME ENVIRONMENT:")
-
-            # NOTE: the reason for separate export of user-specified
-            # variables is this: inline export does not activate the
-            # error trap if sub-expressions fail, e.g. (note typo in
-            # 'echo' command name):
-            #   export FOO=$( ecko foo )  # error not trapped!
-            #   FOO=$( ecko foo )  # error trapped
-            # The export is done before variable definition to enable
-            # use of already defined variables by command substitutions
-            # in later definitions:
-            #   FOO='foo'
-            #   BAR=$(script_using_FOO)
-            handle.write("\n    export")
-            for var in job_conf['environment']:
-                handle.write(f' {var}')
-            for var, val in job_conf['environment'].items():
-                value = JobFileWriter._get_variable_value_definition(
-                    str(val), job_conf.get('param_var', {})
-                )
-                handle.write(f'\n    {var}={value}')
-            handle.write("\n}")
+            handle.write(cls._render_runtime_environment(
+                tuple(
+                    (var, str(val))
+                    for var, val in job_conf['environment'].items()
+                ),
+                tuple(job_conf.get('param_var', {}).items()),
+            ))
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _render_runtime_environment(environment, param_vars):
+        """Return the runtime environment section of a job script.
+
+        This is the same for all jobs of a task (unless broadcasts change it),
+        so results are cached.
+
+        Args:
+            environment (tuple): ((var, value), ...)
+            param_vars (tuple): ((var, value), ...)
+
+        """
+        lines = ["\n\ncylc__job__inst__user_env() {"]
+        # Generate variable assignment expressions
+        lines.append("\n    # TASK RUNTIME ENVIRONMENT:")
+
+        # NOTE: the reason for separate export of user-specified
+        # variables is this: inline export does not activate the
+        # error trap if sub-expressions fail, e.g. (note typo in
+        # 'echo' command name):
+        #   export FOO=$( ecko foo )  # error not trapped!
+        #   FOO=$( ecko foo )  # error trapped
+        # The export is done before variable definition to enable
+        # use of already defined variables by command substitutions
+        # in later definitions:
+        #   FOO='foo'
+        #   BAR=$(script_using_FOO)
+        lines.append("\n    export")
+        for var, _ in environment:
+            lines.append(f' {var}')
+        param_var = dict(param_vars)
+        for var, val in environment:
+            value = JobFileWriter._get_variable_value_definition(
+                val, param_var
+            )
+            lines.append(f'\n    {var}={value}')
+        lines.append("\n}")
+        return ''.join(lines)
 
     @staticmethod
     def _get_variable_value_definition(value, param_vars):
@@ -317,6 +511,8 @@ class JobFileWriter:
             handle.write("\n\n# GLOBAL INIT-SCRIPT:\n")
             handle.write(global_init_script)
 
+    SCRIPT_PREFIXES = ('init-', 'env-', 'err-', 'pre-', '', 'post-', 'exit-')
+
     @classmethod
     def _write_script(cls, handle, job_conf):
         """Write (*-)script in functions.
@@ -324,14 +520,31 @@ class JobFileWriter:
         init-script, env-script, err-script, pre-script, script, post-script,
         exit-script
         """
-        for prefix in ['init-', 'env-', 'err-', 'pre-', '', 'post-', 'exit-']:
-            value = job_conf[prefix + 'script']
+        handle.write(cls._render_script(tuple(
+            job_conf[prefix + 'script'] for prefix in cls.SCRIPT_PREFIXES
+        )))
+
+    @classmethod
+    @lru_cache(maxsize=1024)
+    def _render_script(cls, scripts):
+        """Return the (*-)script functions of a job script.
+
+        This is the same for all jobs of a task (unless broadcasts change it),
+        so results are cached.
+
+        Args:
+            scripts (tuple): The scripts in the order of cls.SCRIPT_PREFIXES.
+
+        """
+        lines = []
+        for prefix, value in zip(cls.SCRIPT_PREFIXES, scripts):
             if cls._check_script_value(value):
-                handle.write("\n\ncylc__job__inst__%sscript() {" % (
+                lines.append("\n\ncylc__job__inst__%sscript() {" % (
                     prefix.replace("-", "_")))
-                handle.write("\n# %sSCRIPT:\n%s" % (
+                lines.append("\n# %sSCRIPT:\n%s" % (
                     prefix.upper(), value))
-                handle.write("\n}")
+                lines.append("\n}")
+        return ''.join(lines)
 
     @staticmethod
     def _write_epilogue(handle, job_conf):
@@ -34,6 +34,7 @@ import traceback
 from shutil import rmtree
 from signal import SIGKILL
 from subprocess import DEVNULL  # nosec
+from tempfile import TemporaryFile
 
 from cylc.flow.task_message import (
     CYLC_JOB_PID, CYLC_JOB_INIT_TIME, CYLC_JOB_EXIT_TIME, CYLC_JOB_EXIT,
@@ -437,95 +438,110 @@ class JobRunnerManager():
             with open(
                 os.path.join(job_log_root, ctx.job_log_dir, JOB_LOG_STATUS)
             ) as handle:
-                for line in handle:
-                    if "=" not in line:
-                        continue
-                    key, value = line.strip().split("=", 1)
-                    if key == self.CYLC_JOB_RUNNER_NAME:
-                        ctx.job_runner_name = value
-                    elif key == self.CYLC_JOB_ID:
-                        ctx.job_id = value
-                    elif key == self.CYLC_JOB_RUNNER_EXIT_POLLED:
-                        ctx.job_runner_exit_polled = 1
-                    elif key == CYLC_JOB_PID:
-                        ctx.pid = value
-                    elif key == self.CYLC_JOB_RUNNER_SUBMIT_TIME:
-                        ctx.time_submit_exit = value
-                    elif key == CYLC_JOB_INIT_TIME:
-                        ctx.time_run = value
-                    elif key == CYLC_JOB_EXIT_TIME:
-                        ctx.time_run_exit = value
-                    elif key == CYLC_JOB_EXIT:
-                        if value == TASK_OUTPUT_SUCCEEDED.upper():
-                            ctx.run_status = 0
-                        else:
-                            ctx.run_status = 1
-                            ctx.run_signal = value
-                    elif key == CYLC_MESSAGE:
-                        ctx.messages.append(value)
+                self._jobs_poll_status_read(ctx, handle)
         except IOError as exc:
             sys.stderr.write(f"{exc}\n")
             return
 
         return ctx
 
+    def _jobs_poll_status_read(self, ctx, handle):
+        """Load the contents of a job.status file into a poll context."""
+        for line in handle:
+            if "=" not in line:
+                continue
+            key, value = line.strip().split("=", 1)
+            if key == self.CYLC_JOB_RUNNER_NAME:
+                ctx.job_runner_name = value
+            elif key == self.CYLC_JOB_ID:
+                ctx.job_id = value
+            elif key == self.CYLC_JOB_RUNNER_EXIT_POLLED:
+                ctx.job_runner_exit_polled = 1
+            elif key == CYLC_JOB_PID:
+                ctx.pid = value
+            elif key == self.CYLC_JOB_RUNNER_SUBMIT_TIME:
+                ctx.time_submit_exit = value
+            elif key == CYLC_JOB_INIT_TIME:
+                ctx.time_run = value
+            elif key == CYLC_JOB_EXIT_TIME:
+                ctx.time_run_exit = value
+            elif key == CYLC_JOB_EXIT:
+                if value == TASK_OUTPUT_SUCCEEDED.upper():
+                    ctx.run_status = 0
+                else:
+                    ctx.run_status = 1
+                    ctx.run_signal = value
+            elif key == CYLC_MESSAGE:
+                ctx.messages.append(value)
+
     def _jobs_poll_runner(self, job_log_root, job_runner_name, my_ctx_list):
         """Helper 2 for self.jobs_poll(job_log_root, job_log_dirs)."""
-        exp_job_ids = [ctx.job_id for ctx in my_ctx_list]
-        bad_job_ids = list(exp_job_ids)
-        exp_pids = []
-        bad_pids = []
+        exp_job_ids = {ctx.job_id for ctx in my_ctx_list}
+        bad_job_ids = set(exp_job_ids)
+        exp_pids = set()
+        bad_pids = set()
         items = [[self._get_sys(job_runner_name), exp_job_ids, bad_job_ids]]
         if getattr(items[0][0], "SHOULD_POLL_PROC_GROUP", False):
-            exp_pids = [ctx.pid for ctx in my_ctx_list if ctx.pid is not None]
-            bad_pids.extend(exp_pids)
+            exp_pids = {ctx.pid for ctx in my_ctx_list if ctx.pid is not None}
+            bad_pids.update(exp_pids)
             items.append([self._get_sys("background"), exp_pids, bad_pids])
         debug_messages = []
         for job_runner, exp_ids, bad_ids in items:
+            if not exp_ids:
+                continue
             if hasattr(job_runner, "get_poll_many_cmd"):
                 # Some poll commands may not be as simple
-                cmd = job_runner.get_poll_many_cmd(exp_ids)
+                cmd = job_runner.get_poll_many_cmd(sorted(exp_ids))
             else:  # if hasattr(job_runner, "POLL_CMD"):
                 # Simple poll command that takes a list of job IDs
-                cmd = [job_runner.POLL_CMD, *exp_ids]
-            try:
-                proc = procopen(cmd, stdindevnull=True,
-                                stderrpipe=True, stdoutpipe=True)
-            except OSError as exc:
-                # subprocess.Popen has a bad habit of not setting the
-                # filename of the executable when it raises an OSError.
-                if not exc.filename:
-                    exc.filename = cmd[0]
-                sys.stderr.write(f"{exc}\n")
-                return
-            ret_code = proc.wait()
-            out, err = (f.decode() for f in proc.communicate())
-            debug_messages.append('{0} - {1}'.format(
-                job_runner, len(out.split('\n')))
-            )
+                cmd = [job_runner.POLL_CMD, *sorted(exp_ids)]
+            # Send stderr to a temporary file so that stdout can be read as it
+            # is produced without the risk of the process blocking on a full
+            # stderr pipe.
+            with TemporaryFile() as err_file:
+                try:
+                    # (buffer stdout, it is read line by line)
+                    proc = procopen(cmd, bufsize=-1, stdindevnull=True,
+                                    stderr=err_file, stdoutpipe=True)
+                except OSError as exc:
+                    # subprocess.Popen has a bad habit of not setting the
+                    # filename of the executable when it raises an OSError.
+                    if not exc.filename:
+                        exc.filename = cmd[0]
+                    sys.stderr.write(f"{exc}\n")
+                    return
+                if hasattr(job_runner, "filter_poll_many_output"):
+                    # Allow custom filter (requires the whole output)
+                    out = proc.stdout.read().decode()
+                    n_lines = out.count('\n') + 1
+                    found_ids = job_runner.filter_poll_many_output(out)
+                else:
+                    # Just about all poll commands return a table, with column
+                    # 1 being the job ID. The logic here should be sufficient
+                    # to ensure that any table header is ignored.
+                    n_lines = 1
+                    found_ids = set()
+                    for line in proc.stdout:
+                        n_lines += 1
+                        try:
+                            head = line.split(None, 1)[0].decode()
+                        except IndexError:
+                            continue
+                        if head in exp_ids:
+                            found_ids.add(head)
+                proc.stdout.close()
+                ret_code = proc.wait()
+                err_file.seek(0)
+                err = err_file.read().decode()
+            debug_messages.append('{0} - {1}'.format(job_runner, n_lines))
             sys.stderr.write(err)
             if (ret_code and hasattr(job_runner, "POLL_CANT_CONNECT_ERR") and
                     job_runner.POLL_CANT_CONNECT_ERR in err):
                 # Poll command failed because it cannot connect to job runner
                 # Assume jobs are still healthy until the job runner is back.
-                bad_ids[:] = []
-            elif hasattr(job_runner, "filter_poll_many_output"):
-                # Allow custom filter
-                for id_ in job_runner.filter_poll_many_output(out):
-                    with suppress(ValueError):
-                        bad_ids.remove(id_)
+                bad_ids.clear()
             else:
-                # Just about all poll commands return a table, with column 1
-                # being the job ID. The logic here should be sufficient to
-                # ensure that any table header is ignored.
-                for line in out.splitlines():
-                    try:
-                        head = line.split(None, 1)[0]
-                    except IndexError:
-                        continue
-                    if head in exp_ids:
-                        with suppress(ValueError):
-                            bad_ids.remove(head)
+                bad_ids.difference_update(found_ids)
 
         debug_flag = False
         for ctx in my_ctx_list:
@@ -540,23 +556,25 @@ class JobRunnerManager():
                     debug_flag = True
             # Add information to "job.status"
             if ctx.job_runner_exit_polled:
+                # Record the poll result and re-read the status file in one go
+                # in case the job started and exited between the file and
+                # batch system checks, which would be interpreted as
+                # submit-failed (job exited without starting).
+                # Possible if polling many jobs and/or system heavily loaded.
+                file_ctx = JobPollContext(ctx.job_log_dir)
                 try:
                     with open(os.path.join(
-                        job_log_root, ctx.job_log_dir, JOB_LOG_STATUS), "a"
+                        job_log_root, ctx.job_log_dir, JOB_LOG_STATUS), "a+"
                     ) as handle:
                         handle.write("{0}={1}\n".format(
                             self.CYLC_JOB_RUNNER_EXIT_POLLED,
                             get_current_time_string())
                         )
+                        handle.seek(0)
+                        self._jobs_poll_status_read(file_ctx, handle)
                 except IOError as exc:
                     sys.stderr.write(f"{exc}\n")
-
-                # Re-read the status file in case the job started and exited
-                # between the file and batch system checks, which would be
-                # interpreted as submit-failed (job exited without starting).
-                # Possible if polling many jobs and/or system heavily loaded.
-                file_ctx = self._jobs_poll_status_files(
-                    job_log_root, ctx.job_log_dir)
+                    continue
                 ctx.update(file_ctx)
 
         if debug_flag:
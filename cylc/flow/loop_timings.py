@@ -0,0 +1,126 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Timing of the phases of the scheduler main loop."""
+
+from bisect import bisect_left
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Any, Dict, Iterator, List
+
+
+class PhaseHistogram:
+    """Running statistics and a histogram of the durations of a phase.
+
+    Examples:
+        >>> hist = PhaseHistogram()
+        >>> for duration in (0.0005, 0.002, 0.003, 20):
+        ...     hist.add(duration)
+        >>> hist.count, hist.max, hist.last
+        (4, 20, 20)
+        >>> hist.buckets
+        [1, 2, 0, 0, 0, 1]
+
+    """
+
+    # Upper bounds of the histogram buckets (seconds), the final bucket
+    # counts anything longer than the last bound.
+    BOUNDS = (0.001, 0.01, 0.1, 1.0, 10.0)
+
+    __slots__ = ('count', 'total', 'max', 'last', 'buckets')
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+        self.buckets: List[int] = [0] * (len(self.BOUNDS) + 1)
+
+    def add(self, duration: float) -> None:
+        """Record a duration (seconds)."""
+        self.count += 1
+        self.total += duration
+        self.last = duration
+        if duration > self.max:
+            self.max = duration
+        self.buckets[bisect_left(self.BOUNDS, duration)] += 1
+
+    def summary(self) -> Dict[str, Any]:
+        """Return the statistics in a serialisable form.
+
+        Examples:
+            >>> hist = PhaseHistogram()
+            >>> hist.add(0.5)
+            >>> summary = hist.summary()
+            >>> summary['count'], summary['mean']
+            (1, 0.5)
+            >>> summary['histogram']
+            {'<=0.001': 0, '<=0.01': 0, '<=0.1': 0, '<=1.0': 1, '<=10.0': 0,
+             '>10.0': 0}
+
+        """
+        labels = [f'<={bound}' for bound in self.BOUNDS]
+        labels.append(f'>{self.BOUNDS[-1]}')
+        return {
+            'count': self.count,
+            'total': self.total,
+            'mean': self.total / self.count if self.count else 0.0,
+            'max': self.max,
+            'last': self.last,
+            'histogram': dict(zip(labels, self.buckets)),
+        }
+
+
+class LoopPhaseTimings:
+    """Record the time spent in each phase of the main loop.
+
+    Examples:
+        >>> timings = LoopPhaseTimings()
+        >>> with timings.time('commands'):
+        ...     pass
+        >>> with timings.time('commands'):
+        ...     pass
+        >>> timings.summary()['commands']['count']
+        2
+
+    """
+
+    def __init__(self) -> None:
+        self.phases: Dict[str, PhaseHistogram] = {}
+
+    @contextmanager
+    def time(self, phase: str) -> Iterator[None]:
+        """Time the enclosed block as part of the named phase."""
+        tinit = perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, perf_counter() - tinit)
+
+    def record(self, phase: str, duration: float) -> None:
+        """Record the duration (seconds) of one pass of a phase."""
+        try:
+            hist = self.phases[phase]
+        except KeyError:
+            hist = self.phases[phase] = PhaseHistogram()
+        hist.add(duration)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Return the statistics of each phase in a serialisable form."""
+        # (copy the items, this may be called from the server thread)
+        return {
+            phase: hist.summary()
+            for phase, hist in list(self.phases.items())
+        }
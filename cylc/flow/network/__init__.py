@@ -42,7 +42,10 @@ from cylc.flow.workflow_files import (
     get_workflow_srv_dir
 )
 
-API = 5  # cylc API version
+# cylc API version
+# 6: delta checksums are the sum of the CRC32 of each stamp (was the adler32
+#    of the sorted stamps)
+API = 6
 MSG_TIMEOUT = "TIMEOUT"
 
 
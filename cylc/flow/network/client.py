@@ -17,6 +17,8 @@
 
 from abc import ABCMeta, abstractmethod
 import asyncio
+from contextlib import suppress
+from itertools import count
 import os
 from shutil import which
 import socket
@@ -162,7 +164,12 @@ class WorkflowRuntimeClient(  # type: ignore[misc]
     # incompatible with definition in base class "WorkflowRuntimeClientBase"')
     """Initiate a client to the scheduler API.
 
-    Initiates the REQ part of a ZMQ REQ-REP pair.
+    Initiates the DEALER part of a ZMQ DEALER-ROUTER pair.
+
+    Each request is sent with a request ID which the server returns with the
+    response, so concurrent calls to ``async_request`` can share a single
+    connection, the requests are pipelined and the responses are passed back
+    to the calls which made them in whatever order they arrive.
 
     This class contains the logic for the ZMQ message interface and client -
     server communication.
@@ -184,8 +191,11 @@ class WorkflowRuntimeClient(  # type: ignore[misc]
 
             If both host and port are provided it is not necessary to load
             the contact file.
+        context:
+            The ZMQ context to create the socket in, defaults to the shared
+            (process wide) context.
         port:
-            The port on which the REQ-REP TCP server is listening.
+            The port on which the TCP server is listening.
 
             If both host and port are provided it is not necessary to load
             the contact file.
@@ -237,11 +247,18 @@ class WorkflowRuntimeClient(  # type: ignore[misc]
         context: Optional[zmq.asyncio.Context] = None,
         srv_public_key_loc: Optional[str] = None
     ):
-        ZMQSocketBase.__init__(self, zmq.REQ, workflow, context=context)
+        if context is None:
+            # share one context (and its IO thread) between all clients
+            context = zmq.asyncio.Context.instance()
+        ZMQSocketBase.__init__(self, zmq.DEALER, workflow, context=context)
         WorkflowRuntimeClientBase.__init__(self, workflow, host, port, timeout)
         # convert to milliseconds:
         self.timeout *= 1000
-        self.poller: Any = None
+        # requests awaiting a response {request_id: future}
+        self._pending: Dict[bytes, asyncio.Future] = {}
+        self._request_ids = count()
+        # the task which reads responses whilst requests are pending
+        self._reader: Optional[asyncio.Future] = None
         # Connect the ZMQ socket on instantiation
         self.start(self.host, self.port, srv_public_key_loc)
         # gather header info post start
@@ -256,10 +273,6 @@ class WorkflowRuntimeClient(  # type: ignore[misc]
         # if there is no server don't keep the client hanging around
         self.socket.setsockopt(zmq.LINGER, int(self.DEFAULT_TIMEOUT))
 
-        # create a poller to handle timeouts
-        self.poller = zmq.Poller()
-        self.poller.register(self.socket, zmq.POLLIN)
-
     async def async_request(
         self,
         command: str,
@@ -289,12 +302,27 @@ class WorkflowRuntimeClient(  # type: ignore[misc]
             msg['meta'].update(req_meta)
         LOG.debug('zmq:send %s', msg)
         message = encode_(msg)
-        self.socket.send_string(message)
-
-        # receive response
-        if self.poller.poll(timeout):
-            res = await self.socket.recv()
-        else:
+        req_id = str(next(self._request_ids)).encode()
+        future = asyncio.get_running_loop().create_future()
+        self._pending[req_id] = future
+        try:
+            await self.socket.send_multipart(
+                [req_id, b'', message.encode()]
+            )
+            if self._reader is None or self._reader.done():
+                self._reader = asyncio.ensure_future(self._read_responses())
+
+            # receive response
+            try:
+                res = await asyncio.wait_for(future, timeout / 1000)
+            except asyncio.TimeoutError:
+                res = None
+        finally:
+            # (a late response to an abandoned request will be discarded)
+            self._pending.pop(req_id, None)
+            if not self._pending:
+                await self._stop_reader()
+        if res is None:
             self.timeout_handler()
             raise ClientTimeout(
                 'Timeout waiting for server response.'
@@ -322,6 +350,31 @@ class WorkflowRuntimeClient(  # type: ignore[misc]
                 error.get('traceback'),  # type: ignore
             )
 
+    async def _read_responses(self) -> None:
+        """Pass responses to the requests awaiting them.
+
+        Runs for as long as there are requests awaiting a response.
+
+        """
+        try:
+            while self._pending:
+                *envelope, res = await self.socket.recv_multipart()
+                future = self._pending.get(envelope[0] if envelope else b'')
+                if future is not None and not future.done():
+                    future.set_result(res)
+        except zmq.ZMQError as exc:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ClientError(str(exc)))
+
+    async def _stop_reader(self) -> None:
+        """Stop reading responses (e.g. once all requests have timed out)."""
+        reader, self._reader = self._reader, None
+        if reader is not None and not reader.done():
+            reader.cancel()
+            with suppress(asyncio.CancelledError):
+                await reader
+
     def get_header(self) -> dict:
         """Return "header" data to attach to each request for traceability.
 
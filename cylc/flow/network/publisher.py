@@ -80,8 +80,11 @@ class WorkflowPublisher(ZMQSocketBase):
         """
         if self.socket:
             self.topics.add(topic)
+            # (the frames are immutable bytes, so large ones can be passed to
+            # zmq without copying)
             self.socket.send_multipart(
-                [topic, serialize_data(data, serializer)]
+                [topic, serialize_data(data, serializer)],
+                copy=False,
             )
         # else we are in the process of shutting down - don't send anything
 
@@ -89,7 +92,7 @@ class WorkflowPublisher(ZMQSocketBase):
         """Publish topics.
 
         Args:
-            items (iterable): [(topic, data, serializer)]
+            items (iterable): [(topic, data[, serializer])]
 
         """
         try:
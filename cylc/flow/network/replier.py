@@ -15,8 +15,15 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """Server for workflow runtime API."""
 
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import suppress
+from functools import partial
+import os
 from queue import Queue
-from typing import TYPE_CHECKING, Optional
+from threading import Lock
+import traceback
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
 import zmq
 
@@ -27,20 +34,32 @@ if TYPE_CHECKING:
     from cylc.flow.network.server import WorkflowRuntimeServer
 
 
+def _init_worker() -> None:
+    """Give each worker thread an event loop (for the GraphQL executor)."""
+    asyncio.set_event_loop(asyncio.new_event_loop())
+
+
 class WorkflowReplier(ZMQSocketBase):
-    """Initiate the REP part of a ZMQ REQ-REP pattern.
+    """Initiate the ROUTER part of a ZMQ REQ-ROUTER pattern.
 
-    This class contains the logic for the ZMQ message replier. The REQ/REP
-    pattern is serial, in that it cannot REQ or REP twice in a row. After
-    receiving you must send a response.
+    This class contains the logic for the ZMQ message replier. Unlike a REP
+    socket, the ROUTER socket can receive further requests before responding
+    to earlier ones, so many requests can be in flight at once. Responses are
+    routed back to the client using the envelope (identity frames) of the
+    request.
 
     Usage:
         * Start the replier.
-        * Call the listener to process incoming REQ and send the REP.
+        * Call the listener to process incoming requests and send responses.
+        * Call wait to wait for further requests (or responses).
 
     Message Processing:
         * Calls the server's receiver to process the command and
             obtain a response.
+        * Read-only requests (see WorkflowRuntimeServer.is_read_only) are
+            served concurrently by a pool of worker threads, anything else
+            (e.g. mutations) is served in the order received by the calling
+            thread.
 
     Message interface:
         * Expects requests of the format: {"command": CMD, "args": {...}}
@@ -49,16 +68,45 @@ class WorkflowReplier(ZMQSocketBase):
 
     """
 
+    # Max number of read-only requests served at once.
+    MAX_WORKERS = 4
+
     def __init__(
         self,
         server: 'WorkflowRuntimeServer',
         context: Optional[zmq.Context] = None
     ):
         super().__init__(
-            zmq.REP, server.schd.workflow, bind=True, context=context
+            zmq.ROUTER, server.schd.workflow, bind=True, context=context
         )
         self.server = server
         self.queue: 'Queue[str]' = Queue()
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.MAX_WORKERS,
+            thread_name_prefix='replier',
+            initializer=_init_worker,
+        )
+        # Responses from the worker pool awaiting sending, the socket must
+        # only be used from the listener's thread.
+        self.responses: 'Queue[Tuple[List[bytes], bytes]]' = Queue()
+        # Pipe used by the worker pool to wake the listener's thread.
+        self._wake_read, self._wake_write = os.pipe()
+        os.set_blocking(self._wake_write, False)
+        # Guards the pipe so it is not written to once closed (the fd numbers
+        # may be reused by then).
+        self._wake_lock = Lock()
+        self._stopped = False
+        self.poller = zmq.Poller()
+
+    def _bespoke_start(self) -> None:
+        """Poll for requests and responses.
+
+        Overwrites Base method.
+
+        """
+        super()._bespoke_start()
+        self.poller.register(self.socket, zmq.POLLIN)
+        self.poller.register(self._wake_read, zmq.POLLIN)
 
     def _bespoke_stop(self) -> None:
         """Stop the listener and Authenticator.
@@ -68,6 +116,25 @@ class WorkflowReplier(ZMQSocketBase):
         """
         LOG.debug('stopping zmq replier...')
         self.queue.put('STOP')
+        self.executor.shutdown(wait=False)
+        with self._wake_lock:
+            if self._stopped:
+                return
+            self._stopped = True
+            for fd in (self._wake_read, self._wake_write):
+                with suppress(OSError):
+                    os.close(fd)
+
+    def wait(self, timeout: float) -> None:
+        """Wait for requests (or responses from the workers) to send.
+
+        Args:
+            timeout: Max time to wait (seconds).
+
+        """
+        events = dict(self.poller.poll(int(timeout * 1000)))
+        if self._wake_read in events:
+            os.read(self._wake_read, 4096)
 
     def listener(self):
         """The server main loop, listen for and serve requests.
@@ -88,9 +155,11 @@ class WorkflowReplier(ZMQSocketBase):
                     break
                 raise ValueError('Unknown command "%s"' % command)
 
+            self.send_responses()
+
             try:
                 # Check for messages
-                msg = self.socket.recv_string(zmq.NOBLOCK)
+                *envelope, msg = self.socket.recv_multipart(zmq.NOBLOCK)
             except zmq.error.Again:
                 # No messages, break to parent loop/caller.
                 break
@@ -100,26 +169,65 @@ class WorkflowReplier(ZMQSocketBase):
             # attempt to decode the message, authenticating the user in the
             # process
             try:
-                message = decode_(msg)
+                message = decode_(msg.decode())
             except Exception as exc:  # purposefully catch generic exception
                 # failed to decode message, possibly resulting from failed
                 # authentication
                 LOG.exception('failed to decode message: "%s"', exc)
-                import traceback
                 response = encode_(
                     {
                         'error': {
-                            'message': 'failed to decode message: "%s"' % msg,
+                            'message': (
+                                'failed to decode message: "%s"'
+                                % msg.decode(errors='replace')
+                            ),
                             'traceback': traceback.format_exc(),
                         }
                     }
                 ).encode()
             else:
+                if self.server.is_read_only(message):
+                    # serve concurrently, respond when done
+                    self.executor.submit(
+                        self._serve, message
+                    ).add_done_callback(
+                        partial(self._put_response, envelope)
+                    )
+                    continue
                 # success case - serve the request
-                res = self.server.receiver(message)
-                # send back the string to bytes response
-                if isinstance(res.get('data'), bytes):
-                    response = res['data']
-                else:
-                    response = encode_(res).encode()
-            self.socket.send(response)
+                response = self._serve(message)
+            self.socket.send_multipart([*envelope, response])
+
+    def _serve(self, message: dict) -> bytes:
+        """Serve a request, return the response."""
+        res = self.server.receiver(message)
+        # send back the string to bytes response
+        if isinstance(res.get('data'), bytes):
+            return res['data']
+        return encode_(res).encode()
+
+    def _put_response(self, envelope: List[bytes], future: Future) -> None:
+        """Queue the response of a worker for sending."""
+        try:
+            response = future.result()
+        except Exception as exc:
+            LOG.exception(exc)
+            response = encode_({
+                'error': {
+                    'message': str(exc),
+                    'traceback': traceback.format_exc(),
+                }
+            }).encode()
+        self.responses.put((envelope, response))
+        with self._wake_lock:
+            if self._stopped:
+                return
+            # (if the pipe is full the listener is already due to wake)
+            with suppress(OSError):
+                os.write(self._wake_write, b'.')
+
+    def send_responses(self) -> None:
+        """Send the responses of the worker pool."""
+        while self.socket and self.responses.qsize():
+            envelope, response = self.responses.get()
+            self.socket.send_multipart([*envelope, response])
@@ -22,9 +22,11 @@ from contextlib import suppress
 from fnmatch import fnmatchcase
 import logging
 import queue
+from threading import Lock
 from time import time
 from typing import (
     Any,
+    Collection,
     Dict,
     Iterable,
     List,
@@ -41,7 +43,7 @@ from graphene.utils.str_converters import to_snake_case
 from cylc.flow import LOG
 from cylc.flow.data_store_mgr import (
     EDGES, FAMILY_PROXIES, TASK_PROXIES, WORKFLOW,
-    DELTA_ADDED, create_delta_store
+    DELTA_ADDED, NodeIndex, create_delta_store, merge_delta_stores
 )
 from cylc.flow.id import Tokens
 from cylc.flow.network.schema import (
@@ -50,6 +52,7 @@ from cylc.flow.network.schema import (
     NodesEdges,
     PROXY_NODES,
     SUB_RESOLVERS,
+    paginate,
     sort_elements,
 )
 
@@ -71,9 +74,11 @@ class TaskMsg(NamedTuple):
 
 logger = logging.getLogger(__name__)
 
+# Interval for checking for new workflows, for subscriptions to workflows
+# which are not (yet) in the data store.
 DELTA_SLEEP_INTERVAL = 0.5
 # Delay before carrying on with the next delta,
-# roughly DELTA_PROC_WAIT*DELTA_SLEEP_INTERVAL seconds (if queue is empty).
+# roughly DELTA_PROC_WAIT*DELTA_SLEEP_INTERVAL seconds.
 DELTA_PROC_WAIT = 10
 
 
@@ -215,7 +220,7 @@ def node_ids_filter(tokens, state, items) -> bool:
     )
 
 
-def node_filter(node, node_type, args, state):
+def node_filter(node, node_type, args, state, tokens=None):
     """Filter nodes based on attribute arguments.
 
     Args:
@@ -225,20 +230,21 @@ def node_filter(node, node_type, args, state):
         state: The state of the node that is being filtered.
             Note: can be None for non-tasks e.g. task definitions where
             state filtering does not apply.
+        tokens: The parsed node ID, if already known.
 
     """
-    tokens: Tokens
-    if node_type in DEF_TYPES:
-        # namespace nodes don't fit into the universal ID scheme so must
-        # be tokenised manually
-        tokens = Tokens(
-            cycle=None,
-            task=node.name,
-            job=None,
-        )
-    else:
-        # live objects can be represented by a universal ID
-        tokens = Tokens(node.id)
+    if tokens is None:
+        if node_type in DEF_TYPES:
+            # namespace nodes don't fit into the universal ID scheme so must
+            # be tokenised manually
+            tokens = Tokens(
+                cycle=None,
+                task=node.name,
+                job=None,
+            )
+        else:
+            # live objects can be represented by a universal ID
+            tokens = Tokens(node.id)
     return (
         (
             (
@@ -279,6 +285,65 @@ def node_filter(node, node_type, args, state):
     )
 
 
+def _is_literal(pattern: Optional[str]) -> bool:
+    """Return True if the ID component matches only itself (not a glob).
+
+    Examples:
+        >>> _is_literal('foo'), _is_literal('f*'), _is_literal(None)
+        (True, False, False)
+
+    """
+    if not pattern:
+        return False
+    return not any(char in pattern for char in '*?[')
+
+
+def get_index_candidates(
+    node_index: NodeIndex,
+    args: Dict[str, Any]
+) -> Optional[Collection[str]]:
+    """Return the IDs of the indexed nodes which may match the args.
+
+    The candidates still need filtering (see node_filter), this just narrows
+    down the search.
+
+    Returns:
+        The candidate node IDs (unordered), or None if the index cannot
+        narrow down the search.
+
+    """
+    selections: List[Collection[str]] = []
+    if args.get('states'):
+        selections.append({
+            node_id
+            for state in args['states']
+            for node_id in node_index.get('state', state)
+        })
+    for attr in ('is_held', 'is_queued'):
+        if args.get(attr) is not None:
+            selections.append(node_index.get(attr, args[attr]))
+    if args.get('ids'):
+        items = [item for item in uniq(args['ids']) if not item.is_null]
+        if not items:
+            # null IDs don't match anything
+            return []
+        for component, attr in (('cycle', 'cycle_point'), ('task', 'name')):
+            if all(_is_literal(item[component]) for item in items):
+                selections.append({
+                    node_id
+                    for item in items
+                    for node_id in node_index.get(attr, item[component])
+                })
+    if not selections:
+        return None
+    smallest, *others = sorted(selections, key=len)
+    return {
+        node_id
+        for node_id in smallest
+        if all(node_id in selection for selection in others)
+    }
+
+
 def get_flow_data_from_ids(data_store, native_ids):
     """Return workflow data by id."""
     w_ids = []
@@ -303,6 +368,106 @@ def get_data_elements(flow, nat_ids, element_type):
     ]
 
 
+class DeltaQueue:
+    """Queue of deltas awaiting a GraphQL subscription.
+
+    Deltas can be put from any thread, the subscription awaits them (in the
+    event loop the queue was created in) rather than polling.
+
+    Pending deltas of the same workflow are coalesced into one (see
+    merge_delta_stores), so a slow subscriber holds at most one pending delta
+    per workflow, rather than falling ever further behind.
+
+    """
+
+    def __init__(self) -> None:
+        self.loop = asyncio.get_running_loop()
+        self.event = asyncio.Event()
+        self.lock = Lock()
+        # {w_id: (topic, delta_store)} in the order they were put
+        self.pending: Dict[str, Tuple[str, dict]] = {}
+
+    def put(self, item: Tuple[str, str, dict]) -> None:
+        """Add a delta to the queue.
+
+        Args:
+            item: (workflow ID, topic, delta store)
+
+        """
+        w_id, topic, delta_store = item
+        with self.lock:
+            if w_id in self.pending:
+                pending_topic, pending_store = self.pending[w_id]
+                if pending_topic == 'shutdown':
+                    # nothing follows a shutdown
+                    return
+                if topic != 'shutdown':
+                    delta_store = merge_delta_stores(
+                        pending_store, delta_store
+                    )
+            self.pending[w_id] = (topic, delta_store)
+        self.notify()
+
+    def requeue(self, item: Tuple[str, str, dict]) -> None:
+        """Return a delta taken from the queue, ahead of any that followed.
+
+        Args:
+            item: (workflow ID, topic, delta store)
+
+        """
+        w_id, topic, delta_store = item
+        with self.lock:
+            if w_id in self.pending:
+                newer_topic, newer_store = self.pending[w_id]
+                if newer_topic != 'shutdown':
+                    self.pending[w_id] = (
+                        newer_topic,
+                        merge_delta_stores(delta_store, newer_store)
+                    )
+            else:
+                self.pending[w_id] = (topic, delta_store)
+        self.notify()
+
+    def notify(self) -> None:
+        """Wake up the subscription."""
+        try:
+            running_loop: Optional[asyncio.AbstractEventLoop] = (
+                asyncio.get_running_loop()
+            )
+        except RuntimeError:
+            running_loop = None
+        if running_loop is self.loop:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(self.event.set)
+
+    def get_nowait(
+        self,
+        exclude: Iterable[str] = ()
+    ) -> Optional[Tuple[str, str, dict]]:
+        """Remove and return the oldest pending delta, if any.
+
+        Args:
+            exclude: Workflow IDs whose deltas should remain pending.
+
+        Returns:
+            (workflow ID, topic, delta store) or None
+
+        """
+        with self.lock:
+            for w_id in self.pending:
+                if w_id not in exclude:
+                    topic, delta_store = self.pending.pop(w_id)
+                    return w_id, topic, delta_store
+            self.event.clear()
+        return None
+
+    async def wait(self, timeout: Optional[float] = None) -> None:
+        """Wait until notified (or the timeout expires)."""
+        with suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(self.event.wait(), timeout)
+
+
 class BaseResolvers(metaclass=ABCMeta):  # noqa: SIM119
     """Data access methods for resolving GraphQL queries."""
 
@@ -314,6 +479,8 @@ class BaseResolvers(metaclass=ABCMeta):  # noqa: SIM119
         # Used to serialised deltas from a single workflow, needed for
         # the management of a common data object.
         self.delta_processing_flows: Dict['UUID', set] = {}
+        # The queue of deltas of each subscription, [sub_id] = queue
+        self.delta_subscriptions: Dict['UUID', DeltaQueue] = {}
 
     # Query resolvers
     async def get_workflow_by_id(self, args):
@@ -326,6 +493,14 @@ class BaseResolvers(metaclass=ABCMeta):  # noqa: SIM119
         except KeyError:
             return None
 
+    async def get_loop_phase_timings(self, w_id: str) -> Optional[dict]:
+        """Return the main loop phase timings of a workflow.
+
+        Not available from the data store.
+
+        """
+        return None
+
     async def get_workflows_data(self, args: Dict[str, Any]):
         """Return list of data from workflows."""
         # Both cases just as common so 'if' not 'try'
@@ -366,20 +541,58 @@ class BaseResolvers(metaclass=ABCMeta):  # noqa: SIM119
                 ][node_type][node.id].state
             )
 
+    def get_node_index(self, flow, args) -> Optional[Dict[str, NodeIndex]]:
+        """Return the node indexes of a workflow, if available.
+
+        Indexes are only available for the data-store (not delta-stores).
+
+        """
+        if 'sub_id' in args and args['delta_store']:
+            return None
+        with suppress(AttributeError, KeyError):
+            return self.data_store_mgr.node_indexes[flow[WORKFLOW].id]
+        return None
+
+    def iter_flow_nodes(self, flow, node_type, args):
+        """Yield the (node, tokens) of a workflow which may match the args.
+
+        Uses the data-store indexes (where available) to narrow the search
+        and to avoid parsing node IDs.
+
+        """
+        nodes = flow.get(node_type)
+        node_index = (self.get_node_index(flow, args) or {}).get(node_type)
+        if node_index is None:
+            for node in nodes.values():
+                yield node, None
+            return
+        candidates = get_index_candidates(node_index, args)
+        if not candidates:
+            if candidates is not None:
+                return
+            candidates = nodes
+        # (iterate the store so nodes are returned in store order)
+        for node_id, node in nodes.items():
+            if node_id in candidates:
+                yield node, node_index.tokens.get(node_id)
+
     async def get_nodes_all(self, node_type, args):
         """Return nodes from all workflows, filter by args."""
-        return sort_elements(
-            [
+        return paginate(
+            (
                 node
                 for flow in await self.get_workflows_data(args)
-                for node in flow.get(node_type).values()
+                for node, tokens in self.iter_flow_nodes(
+                    flow, node_type, args
+                )
                 if node_filter(
                     node,
                     node_type,
                     args,
-                    self.get_node_state(node, node_type)
+                    self.get_node_state(node, node_type),
+                    tokens,
                 )
-            ],
+            ),
             args,
         )
 
@@ -401,8 +614,8 @@ class BaseResolvers(metaclass=ABCMeta):  # noqa: SIM119
             node_types = [TASK_PROXIES, FAMILY_PROXIES]
         else:
             node_types = [node_type]
-        return sort_elements(
-            [
+        return paginate(
+            (
                 node
                 for flow in flow_data
                 for node_type in node_types
@@ -413,7 +626,7 @@ class BaseResolvers(metaclass=ABCMeta):  # noqa: SIM119
                     args,
                     self.get_node_state(node, node_type)
                 )
-            ],
+            ),
             args,
         )
 
@@ -538,14 +751,15 @@ class BaseResolvers(metaclass=ABCMeta):  # noqa: SIM119
         delta_processing_flows = self.delta_processing_flows[sub_id]
 
         delta_queues = self.data_store_mgr.delta_queues
-        deltas_queue = queue.Queue()
+        deltas_queue = DeltaQueue()
+        self.delta_subscriptions[sub_id] = deltas_queue
 
-        counters = {}
-        delta_yield_queue = queue.Queue()
-        flow_delta_queues = {}
+        # the time each workflow started processing a delta
+        processing_times: Dict[str, float] = {}
+        proc_wait = DELTA_PROC_WAIT * DELTA_SLEEP_INTERVAL
+        w_ids = workflow_ids
         try:
             # Iterate over the queue yielding deltas
-            w_ids = workflow_ids
             sub_resolver = SUB_RESOLVERS.get(to_snake_case(info.field_name))
             interval = args['ignore_interval']
             old_time = 0.0
@@ -558,6 +772,8 @@ class BaseResolvers(metaclass=ABCMeta):  # noqa: SIM119
                     for remove_id in old_ids.difference(w_ids):
                         if remove_id in self.delta_store[sub_id]:
                             del self.delta_store[sub_id][remove_id]
+                # Are there workflows which may yet appear?
+                discover = not workflow_ids
                 for w_id in w_ids:
                     if w_id in self.data_store_mgr.data:
                         if sub_id not in delta_queues[w_id]:
@@ -570,56 +786,57 @@ class BaseResolvers(metaclass=ABCMeta):  # noqa: SIM119
                                     self.data_store_mgr.data[w_id])
                                 deltas_queue.put(
                                     (w_id, 'initial_burst', delta_store))
-                    elif w_id in self.delta_store[sub_id]:
-                        del self.delta_store[sub_id][w_id]
-                try:
-                    with suppress(queue.Empty):
-                        w_id, topic, delta_store = deltas_queue.get(False)
-
-                        if w_id not in flow_delta_queues:
-                            counters[w_id] = 0
-                            flow_delta_queues[w_id] = queue.Queue()
-                        flow_delta_queues[w_id].put((topic, delta_store))
-
-                    # Only yield deltas from the same workflow if previous
-                    # delta has finished processing.
-                    for flow_id, flow_queue in flow_delta_queues.items():
-                        if flow_queue.empty():
-                            continue
-                        elif flow_id in delta_processing_flows:
-                            if counters[flow_id] < DELTA_PROC_WAIT:
-                                continue
-                            delta_processing_flows.remove(flow_id)
-                        counters[flow_id] = 0
-                        topic, delta_store = flow_queue.get()
-                        delta_yield_queue.put((flow_id, topic, delta_store))
-
-                    w_id, topic, delta_store = delta_yield_queue.get(False)
-
-                    # Handle shutdown delta, don't ignore.
-                    if topic == 'shutdown':
-                        delta_store['shutdown'] = True
-                    else:
-                        # ignore deltas that are more frequent than interval.
-                        new_time = time()
-                        elapsed = new_time - old_time
-                        if elapsed <= interval:
-                            continue
-                        old_time = new_time
-
-                    delta_processing_flows.add(w_id)
-                    op_queue.put((sub_id, w_id))
-                    self.delta_store[sub_id][w_id] = delta_store
-                    if sub_resolver is None:
-                        yield delta_store
                     else:
-                        result = await sub_resolver(root, info, **args)
-                        if result:
-                            yield result
-                except queue.Empty:
-                    await asyncio.sleep(DELTA_SLEEP_INTERVAL)
-                    for flow_id in delta_processing_flows:
-                        counters[flow_id] += 1
+                        discover = True
+                        if w_id in self.delta_store[sub_id]:
+                            del self.delta_store[sub_id][w_id]
+
+                # Only yield deltas from the same workflow if previous
+                # delta has finished processing (or we've waited long enough).
+                now = time()
+                for flow_id in list(delta_processing_flows):
+                    if now - processing_times.get(flow_id, now) >= proc_wait:
+                        delta_processing_flows.discard(flow_id)
+
+                item = deltas_queue.get_nowait(exclude=delta_processing_flows)
+                if item is None:
+                    # Wait for new deltas (or to stop waiting for a workflow
+                    # to finish processing, or to check for new workflows).
+                    timeouts = [
+                        processing_times[flow_id] + proc_wait - now
+                        for flow_id in delta_processing_flows
+                        if flow_id in processing_times
+                    ]
+                    if discover:
+                        timeouts.append(DELTA_SLEEP_INTERVAL)
+                    await deltas_queue.wait(min(timeouts, default=None))
+                    continue
+                w_id, topic, delta_store = item
+
+                # Handle shutdown delta, don't ignore.
+                if topic == 'shutdown':
+                    delta_store['shutdown'] = True
+                else:
+                    # Deltas more frequent than the interval are held back
+                    # (and coalesced with any that follow).
+                    new_time = time()
+                    elapsed = new_time - old_time
+                    if elapsed <= interval:
+                        deltas_queue.requeue((w_id, topic, delta_store))
+                        await asyncio.sleep(interval - elapsed)
+                        continue
+                    old_time = new_time
+
+                delta_processing_flows.add(w_id)
+                processing_times[w_id] = time()
+                op_queue.put((sub_id, w_id))
+                self.delta_store[sub_id][w_id] = delta_store
+                if sub_resolver is None:
+                    yield delta_store
+                else:
+                    result = await sub_resolver(root, info, **args)
+                    if result:
+                        yield result
         except (GeneratorExit, asyncio.CancelledError):
             raise
         except Exception:
@@ -631,6 +848,7 @@ class BaseResolvers(metaclass=ABCMeta):  # noqa: SIM119
                     del delta_queues[w_id][sub_id]
             if sub_id in self.delta_store:
                 del self.delta_store[sub_id]
+            self.delta_subscriptions.pop(sub_id, None)
             yield None
 
     async def flow_delta_processed(self, context, op_id):
@@ -638,6 +856,8 @@ class BaseResolvers(metaclass=ABCMeta):  # noqa: SIM119
             with suppress(queue.Empty, KeyError):
                 sub_id, w_id = context['ops_queue'][op_id].get(False)
                 self.delta_processing_flows[sub_id].remove(w_id)
+                # wake the subscription to yield any pending deltas
+                self.delta_subscriptions[sub_id].notify()
 
     @abstractmethod
     async def mutator(
@@ -660,6 +880,12 @@ class Resolvers(BaseResolvers):
         super().__init__(data)
         self.schd = schd
 
+    async def get_loop_phase_timings(self, w_id: str) -> Optional[dict]:
+        """Return the main loop phase timings of the scheduler."""
+        if w_id != self.schd.id:
+            return None
+        return self.schd.loop_timings.summary()
+
     # Mutations
     async def mutator(
         self,
@@ -511,6 +511,9 @@ async def graphql_query(flow, fields, filters=None):
                     return False
 
         return flow
+    finally:
+        # release the socket, scans may cover a great many workflows
+        client.stop(stop_loop=False)
 
 
 @pipe
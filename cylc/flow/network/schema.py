@@ -18,6 +18,7 @@
 
 from copy import deepcopy
 from functools import partial
+from heapq import nsmallest
 import json
 from operator import attrgetter
 from textwrap import dedent
@@ -105,6 +106,61 @@ def sort_elements(elements, args):
     return elements
 
 
+def paginate(elements, args):
+    """Sort elements (see sort_elements) and return the requested page.
+
+    Pages are requested with the "first" (page size) and "after" (cursor)
+    arguments. The cursor is the ID of the last element of the previous page.
+
+    Without a "sort" argument, elements are ordered by ID, so a cursor stays
+    valid even if its element has since left the store, and the page is
+    selected without sorting every element.
+
+    Raises:
+        ValueError: If a "sort" is given and the cursor is not the ID of one
+            of the elements (e.g. it has since left the store).
+
+    Examples:
+        >>> from types import SimpleNamespace
+        >>> elements = [SimpleNamespace(id=id_) for id_ in 'dbeac']
+        >>> [e.id for e in paginate(elements, {'first': 2})]
+        ['a', 'b']
+        >>> [e.id for e in paginate(elements, {'first': 2, 'after': 'b'})]
+        ['c', 'd']
+        >>> [e.id for e in paginate(iter(elements), {})]
+        ['d', 'b', 'e', 'a', 'c']
+        >>> [e.id for e in paginate(elements, {'first': 2, 'after': 'bb'})]
+        ['c', 'd']
+        >>> sort = SimpleNamespace(keys=['id'], reverse=False)
+        >>> paginate(elements, {'first': 2, 'after': 'bb', 'sort': sort})
+        Traceback (most recent call last):
+        ValueError: Cursor not found: bb
+
+    """
+    first = args.get('first')
+    # (an empty cursor means the first page)
+    after = args.get('after') or None
+    if not first and after is None:
+        return sort_elements(list(elements), args)
+    if not args.get('sort'):
+        if after is not None:
+            elements = (element for element in elements if element.id > after)
+        if first:
+            return nsmallest(first, elements, key=attrgetter('id'))
+        return sorted(elements, key=attrgetter('id'))
+    elements = sort_elements(list(elements), args)
+    if after is not None:
+        for index, element in enumerate(elements):
+            if element.id == after:
+                elements = elements[index + 1:]
+                break
+        else:
+            raise ValueError(f'Cursor not found: {after}')
+    if first:
+        elements = elements[:first]
+    return elements
+
+
 PROXY_NODES = 'proxy_nodes'
 
 
@@ -163,6 +219,8 @@ JOB_ARGS = {
     'states': graphene.List(String, default_value=[]),
     'exstates': graphene.List(String, default_value=[]),
     'sort': SortArgs(default_value=None),
+    'first': Int(),
+    'after': ID(),
 }
 
 ALL_JOB_ARGS = {
@@ -173,6 +231,8 @@ ALL_JOB_ARGS = {
     'states': graphene.List(String, default_value=[]),
     'exstates': graphene.List(String, default_value=[]),
     'sort': SortArgs(default_value=None),
+    'first': Int(),
+    'after': ID(),
 }
 
 DEF_ARGS = {
@@ -181,6 +241,8 @@ DEF_ARGS = {
     'mindepth': Int(default_value=-1),
     'maxdepth': Int(default_value=-1),
     'sort': SortArgs(default_value=None),
+    'first': Int(),
+    'after': ID(),
 }
 
 ALL_DEF_ARGS = {
@@ -191,6 +253,8 @@ ALL_DEF_ARGS = {
     'mindepth': Int(default_value=-1),
     'maxdepth': Int(default_value=-1),
     'sort': SortArgs(default_value=None),
+    'first': Int(),
+    'after': ID(),
 }
 
 PROXY_ARGS = {
@@ -204,6 +268,8 @@ PROXY_ARGS = {
     'mindepth': Int(default_value=-1),
     'maxdepth': Int(default_value=-1),
     'sort': SortArgs(default_value=None),
+    'first': Int(),
+    'after': ID(),
 }
 
 ALL_PROXY_ARGS = {
@@ -219,6 +285,8 @@ ALL_PROXY_ARGS = {
     'mindepth': Int(default_value=-1),
     'maxdepth': Int(default_value=-1),
     'sort': SortArgs(default_value=None),
+    'first': Int(),
+    'after': ID(),
 }
 
 EDGE_ARGS = {
@@ -556,6 +624,11 @@ async def resolve_broadcasts(root, info, **args):
     return result
 
 
+async def resolve_loop_phase_timings(root, info, **args):
+    resolvers = info.context.get('resolvers')
+    return await resolvers.get_loop_phase_timings(root.id)
+
+
 def resolve_json_dump(root, info, **args):
     field = getattr(root, to_snake_case(info.field_name), '{}') or '{}'
     return json.loads(field)
@@ -701,6 +774,14 @@ class Workflow(ObjectType):
             default_value=[]),
         resolver=resolve_broadcasts)
     pruned = Boolean()
+    loop_phase_timings = GenericScalar(
+        description=sstrip('''
+            Time spent in each phase of the scheduler main loop (seconds),
+            with a histogram of the durations.
+
+            Only available from the scheduler.
+        '''),
+        resolver=resolve_loop_phase_timings)
 
 
 class RuntimeSetting(ObjectType):
@@ -23,6 +23,8 @@ from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Union
 
 from graphql.execution import ExecutionResult
 from graphql.execution.executors.asyncio import AsyncioExecutor
+from graphql.language import ast
+from graphql.language.base import parse
 import zmq
 from zmq.auth.thread import ThreadAuthenticator
 
@@ -49,6 +51,9 @@ PB_METHOD_MAP = {
     'pb_data_elements': DELTAS_MAP
 }
 
+# server methods which only read data (so can be served concurrently)
+READ_ONLY_METHODS = {'pb_entire_workflow', 'pb_data_elements'}
+
 
 def expose(func=None):
     """Expose a method on the sever."""
@@ -258,8 +263,9 @@ class WorkflowRuntimeServer:
             # Publish all requested/queued.
             self.loop.run_until_complete(self.publish_queued_items())
 
-            # Yield control to other threads
-            sleep(self.OPERATE_SLEEP_INTERVAL)
+            # Wait for further requests (or for responses to requests being
+            # served concurrently), yielding control to other threads
+            self.replier.wait(self.OPERATE_SLEEP_INTERVAL)
 
     async def publish_queued_items(self) -> None:
         """Publish all queued items."""
@@ -306,6 +312,33 @@ class WorkflowRuntimeServer:
 
         return {'data': response}
 
+    def is_read_only(self, message: dict) -> bool:
+        """Return True if the request only reads data.
+
+        Read-only requests (GraphQL queries and data-store requests) may be
+        served concurrently with other requests. Anything else (e.g. GraphQL
+        mutations) is served in the order received.
+
+        Args:
+            message: The decoded request.
+
+        """
+        command = message.get('command')
+        if command in READ_ONLY_METHODS:
+            return True
+        if command != 'graphql':
+            return False
+        try:
+            document = parse(message['args']['request_string'])
+        except Exception:
+            # leave the reporting of bad requests to the receiver
+            return False
+        return all(
+            definition.operation == 'query'
+            for definition in document.definitions
+            if isinstance(definition, ast.OperationDefinition)
+        )
+
     def register_endpoints(self):
         """Register all exposed methods."""
         self.endpoints = {name: obj
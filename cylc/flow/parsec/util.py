@@ -20,7 +20,7 @@ The copy and override functions below assume values are either dicts
 """
 
 from copy import copy
-from collections import deque
+from collections import OrderedDict, deque
 import re
 import sys
 
@@ -224,6 +224,79 @@ def pdeepcopy(source):
     return target
 
 
+def pshallowcopy(source):
+    """Make a shallow copy of a pdict source.
+
+    Unlike pdeepcopy, sub-dicts (and the defaults) are shared with the
+    source rather than copied.
+
+    Examples:
+        >>> source = OrderedDictWithDefaults({'a': 1, 'b': {'c': 2}})
+        >>> target = pshallowcopy(source)
+        >>> target['a'] = 3
+        >>> source['a'], target['a']
+        (1, 3)
+        >>> target['b'] is source['b']
+        True
+
+    """
+    target = OrderedDictWithDefaults()
+    if hasattr(source, 'defaults_'):
+        target.defaults_ = source.defaults_
+    for key in OrderedDict.keys(source):
+        target[key] = OrderedDict.__getitem__(source, key)
+    return target
+
+
+def poverlay(base, sparse, prepend=False):
+    """Return a pdict with the items in sparse overriding those in base.
+
+    The result is the same as poverride applied to a pdeepcopy of base.
+    However, base is not modified or copied. Only the sub-dicts which sparse
+    overrides are copied, any others are shared with base. So the result
+    should be treated as read-only.
+
+    If sparse is empty, base is returned.
+
+    Examples:
+        >>> base = OrderedDictWithDefaults({
+        ...     'script': 'echo $FOO',
+        ...     'environment': OrderedDictWithDefaults({'FOO': 'foo'}),
+        ...     'directives': OrderedDictWithDefaults(),
+        ... })
+        >>> result = poverlay(
+        ...     base,
+        ...     {'environment': {'BAR': 'bar', 'FOO': 'baz'}},
+        ...     prepend=True
+        ... )
+        >>> dict(result['environment'])
+        {'BAR': 'bar', 'FOO': 'baz'}
+        >>> dict(base['environment'])
+        {'FOO': 'foo'}
+        >>> result['directives'] is base['directives']
+        True
+
+    """
+    if not sparse:
+        return base
+    target = pshallowcopy(base)
+    for key, val in sparse.items():
+        if isinstance(val, dict):
+            target[key] = poverlay(base[key], val, prepend)
+        else:
+            if prepend and (key not in target):
+                # Prepend new items in the target ordered dict.
+                setitem = target.prepend
+            else:
+                # Override in-place in the target ordered dict.
+                setitem = target.__setitem__
+            if isinstance(val, list):
+                setitem(key, val[:])
+            else:
+                setitem(key, val)
+    return target
+
+
 def poverride(target, sparse, prepend=False):
     """Override or add items in a target pdict.
 
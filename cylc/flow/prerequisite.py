@@ -17,7 +17,7 @@
 """Functionality for expressing and evaluating logical triggers."""
 
 import math
-import re
+from typing import Callable, Iterable, Optional, Sequence, Union
 
 from cylc.flow.cycling.loader import get_point
 from cylc.flow.exceptions import TriggerExpressionError
@@ -28,6 +28,69 @@ from cylc.flow.data_messages_pb2 import (  # type: ignore
 from cylc.flow.id import Tokens
 
 
+class ConditionalExpression:
+    """A conditional trigger expression compiled for evaluation.
+
+    The expression is written in terms of positional slots which refer to the
+    messages of a prerequisite (in order). This allows a single instance to be
+    shared by all of the prerequisites generated from the same dependency
+    (see cylc.flow.task_trigger.Dependency).
+
+    Args:
+        template:
+            The expression as a list of slot numbers and the operators and
+            parentheses between them.
+
+    Examples:
+        >>> expr = ConditionalExpression([0, '|', '(', 1, '&', 2, ')'])
+        >>> expr([False, True, False])
+        False
+        >>> expr(['satisfied naturally', True, 'force satisfied'])
+        True
+        >>> expr.format(['1/a succeeded', '1/b succeeded', '1/c succeeded'])
+        '1/a succeeded|(1/b succeeded&1/c succeeded)'
+
+        >>> ConditionalExpression([0, '|', '(', 1])
+        Traceback (most recent call last):
+        cylc.flow.exceptions.TriggerExpressionError: "c0|(c1":...
+
+    """
+
+    __slots__ = ['template', '_evaluate']
+
+    def __init__(self, template: Iterable[Union[int, str]]):
+        self.template = tuple(template)
+        expr = ''.join(
+            f'bool(s[{item}])' if isinstance(item, int) else item
+            for item in self.template
+        )
+        try:
+            self._evaluate: Callable[[Sequence[object]], bool] = eval(
+                f'lambda s: {expr}'
+            )  # nosec
+            # * the expression is constructed internally
+            # * https://github.com/cylc/cylc-flow/issues/4403
+        except SyntaxError as exc:
+            err_msg = str(exc)
+            if "never closed" in err_msg or "unexpected EOF" in err_msg:
+                err_msg += (
+                    " (could be unmatched parentheses in the graph string?)")
+            aliases = [f'c{ind}' for ind in range(len(self.template))]
+            raise TriggerExpressionError(
+                '"%s":\n%s' % (self.format(aliases), err_msg))
+
+    def __call__(self, states: Sequence[object]) -> bool:
+        """Evaluate the expression against the states of the messages."""
+        return self._evaluate(states)
+
+    def format(self, messages: Sequence[str]) -> str:
+        """Return the expression in terms of the given messages."""
+        return ''.join(
+            messages[item] if isinstance(item, int) else item
+            for item in self.template
+        )
+
+
 class Prerequisite:
     """The concrete result of an abstract logical trigger expression.
 
@@ -45,8 +108,6 @@ class Prerequisite:
                  "target_point_strings", "start_point",
                  "conditional_expression", "point"]
 
-    # Extracts T from "foo.T succeeded" etc.
-    SATISFIED_TEMPLATE = 'bool(self.satisfied[("%s", "%s", "%s")])'
     MESSAGE_TEMPLATE = r'%s/%s %s'
 
     DEP_STATE_SATISFIED = 'satisfied naturally'
@@ -69,9 +130,10 @@ class Prerequisite:
         # {('point string', 'task name', 'output'): DEP_STATE_X, ...}
         self.satisfied = {}
 
-        # Expression present only when conditions are used.
-        # '1/foo failed & 1/bar succeeded'
-        self.conditional_expression = None
+        # Expression present only when conditions are used, in terms of the
+        # positions of the messages in self.satisfied.
+        # (shared between prerequisites generated from the same dependency)
+        self.conditional_expression: Optional[ConditionalExpression] = None
 
         # The cached state of this prerequisite:
         # * `None` (no cached state)
@@ -108,47 +170,40 @@ class Prerequisite:
         Returns None if this prerequisite is not a conditional one.
 
         """
-        expr = self.conditional_expression
-        if not expr:
+        if not self.conditional_expression:
             return None
-        for message in self.satisfied:
-            expr = expr.replace(self.SATISFIED_TEMPLATE % message,
-                                self.MESSAGE_TEMPLATE % message)
-        return expr
+        return self.conditional_expression.format([
+            self.MESSAGE_TEMPLATE % message for message in self.satisfied
+        ])
 
-    def set_condition(self, expr):
+    def set_condition(self, expr: Optional[ConditionalExpression]) -> None:
         """Set the conditional expression for this prerequisite.
         Resets the cached state (self._all_satisfied).
 
+        Args:
+            expr:
+                The expression in terms of the positions of the messages in
+                self.satisfied, or None if all of the messages are required.
+
         Examples:
             # GH #3644 construct conditional expression when one task name
             # is a substring of another: foo | xfoo => bar.
-            # Add 'foo' to the 'satisfied' dict before 'xfoo'.
             >>> preq = Prerequisite(1)
-            >>> preq.satisfied = {
-            ...    ('1', 'foo', 'succeeded'): False,
-            ...    ('1', 'xfoo', 'succeeded'): False
-            ... }
-            >>> preq.set_condition("1/foo succeeded|1/xfoo succeeded")
-            >>> expr = preq.conditional_expression
-            >>> expr.split('|')  # doctest: +NORMALIZE_WHITESPACE
-            ['bool(self.satisfied[("1", "foo", "succeeded")])',
-            'bool(self.satisfied[("1", "xfoo", "succeeded")])']
+            >>> preq.add('foo', 1, 'succeeded')
+            >>> preq.add('xfoo', 1, 'succeeded')
+            >>> preq.set_condition(ConditionalExpression([0, '|', 1]))
+            >>> preq.get_raw_conditional_expression()
+            '1/foo succeeded|1/xfoo succeeded'
+            >>> preq.is_satisfied()
+            False
+            >>> sorted(preq.satisfy_me({('1', 'xfoo', 'succeeded')}))
+            [('1', 'xfoo', 'succeeded')]
+            >>> preq.is_satisfied()
+            True
 
         """
         self._all_satisfied = None
-        if '|' in expr:
-            # Make a Python expression so we can eval() the logic.
-            for message in self.satisfied:
-                # Use '\b' in case one task name is a substring of another
-                # and escape special chars ('.', timezone '+') in task IDs.
-                expr = re.sub(
-                    fr"\b{re.escape(self.MESSAGE_TEMPLATE % message)}\b",
-                    self.SATISFIED_TEMPLATE % message,
-                    expr
-                )
-
-            self.conditional_expression = expr
+        self.conditional_expression = expr
 
     def is_satisfied(self):
         """Return True if prerequisite is satisfied.
@@ -176,18 +231,7 @@ class Prerequisite:
         Does not cache the result.
 
         """
-        try:
-            res = eval(self.conditional_expression)  # nosec
-            # * the expression is constructed internally
-            # * https://github.com/cylc/cylc-flow/issues/4403
-        except (SyntaxError, ValueError) as exc:
-            err_msg = str(exc)
-            if str(exc).find("unexpected EOF") != -1:
-                err_msg += (
-                    " (could be unmatched parentheses in the graph string?)")
-            raise TriggerExpressionError(
-                '"%s":\n%s' % (self.get_raw_conditional_expression(), err_msg))
-        return res
+        return self.conditional_expression(list(self.satisfied.values()))
 
     def satisfy_me(self, all_task_outputs):
         """Evaluate pre-requisite against known outputs.
@@ -208,20 +252,14 @@ class Prerequisite:
         """Return list of populated Protobuf data objects."""
         if not self.satisfied:
             return None
-        if self.conditional_expression:
-            temp = self.get_raw_conditional_expression()
-            temp = temp.replace('|', ' | ')
-            temp = temp.replace('&', ' & ')
-        else:
-            for s_msg in self.satisfied:
-                temp = self.MESSAGE_TEMPLATE % s_msg
         conds = []
+        chars = {}
         num_length = math.ceil(len(self.satisfied) / 10)
         for ind, message_tuple in enumerate(sorted(self.satisfied)):
             point, name = message_tuple[0:2]
             t_id = Tokens(cycle=str(point), task=name).relative_id
             char = 'c%.{0}d'.format(num_length) % ind
-            c_msg = self.MESSAGE_TEMPLATE % message_tuple
+            chars[message_tuple] = char
             c_val = self.satisfied[message_tuple]
             c_bool = bool(c_val)
             if c_bool is False:
@@ -234,7 +272,14 @@ class Prerequisite:
                 message=c_val,
             )
             conds.append(cond)
-            temp = temp.replace(c_msg, char)
+        if self.conditional_expression:
+            temp = self.conditional_expression.format(
+                [chars[message] for message in self.satisfied]
+            )
+            temp = temp.replace('|', ' | ')
+            temp = temp.replace('&', ' & ')
+        else:
+            temp = chars[list(self.satisfied)[-1]]
         prereq_buf = PbPrerequisite(
             expression=temp,
             satisfied=self.is_satisfied(),
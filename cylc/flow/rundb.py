@@ -17,11 +17,12 @@
 
 from contextlib import suppress
 from dataclasses import dataclass
+import os
 from os.path import expandvars
 from pprint import pformat
 import sqlite3
 import traceback
-from typing import TYPE_CHECKING, List, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
 
 from cylc.flow import LOG
 from cylc.flow.util import deserialise
@@ -173,6 +174,14 @@ class CylcWorkflowDAO:
     CONN_TIMEOUT = 0.2
     DB_FILE_BASE_NAME = "db"
     MAX_TRIES = 100
+    # Settings for persistent connections (see CylcWorkflowDAO.connect).
+    # Note: in WAL mode "synchronous=NORMAL" cannot corrupt the DB, but
+    # the most recent transactions may be lost on power failure.
+    PERSISTENT_PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+    )
     RESTART_INCOMPAT_VERSION = "8.0rc2"  # Can't restart if <= this version
     TABLE_BROADCAST_EVENTS = "broadcast_events"
     TABLE_BROADCAST_STATES = "broadcast_states"
@@ -193,7 +202,7 @@ class CylcWorkflowDAO:
     TABLE_XTRIGGERS = "xtriggers"
     TABLE_ABS_OUTPUTS = "absolute_outputs"
 
-    TABLES_ATTRS = {
+    TABLES_ATTRS: Dict[str, List[List[Any]]] = {
         TABLE_BROADCAST_EVENTS: [
             ["time"],
             ["change"],
@@ -321,11 +330,24 @@ class CylcWorkflowDAO:
         ],
     }
 
+    # Secondary indexes {index_name: (table_name, [column_name, ...])}.
+    # (SQLite indexes the primary key of each table itself)
+    INDEXES = {
+        # task lookups by cycle point, e.g. the datastore history loads and
+        # workflow state queries (covers the default "name, cycle, status")
+        'task_states_cycle_name_status': (
+            TABLE_TASK_STATES, ['cycle', 'name', 'status']
+        ),
+        # output lookups by task name, e.g. workflow state queries
+        'task_outputs_name_cycle': (TABLE_TASK_OUTPUTS, ['name', 'cycle']),
+    }
+
     def __init__(
         self,
         db_file_name: Union['Path', str],
         is_public: bool = False,
-        create_tables: bool = False
+        create_tables: bool = False,
+        persistent: bool = False,
     ):
         """Initialise database access object.
 
@@ -337,11 +359,19 @@ class CylcWorkflowDAO:
             is_public: If True, allow retries.
             create_tables: If True, create the tables if they
                 don't already exist.
+            persistent: If True, keep the connection open between calls
+                to execute_queued_items and use write-ahead logging (WAL).
+                The connection will be re-opened if the DB file is removed
+                or replaced.
 
         """
         self.db_file_name = expandvars(db_file_name)
         self.is_public = is_public
+        self.persistent = persistent
         self.conn: Optional[sqlite3.Connection] = None
+        # (st_dev, st_ino) of the DB file a persistent connection was opened
+        # on, see check_db_file
+        self.db_file_id: Optional[Tuple[int, int]] = None
         self.n_tries = 0
 
         self.tables = {
@@ -355,6 +385,21 @@ class CylcWorkflowDAO:
     def __enter__(self):
         return self
 
+    @classmethod
+    def get_primary_keys(cls, table_name: str) -> List[str]:
+        """Return the names of the primary key columns of a table.
+
+        Examples:
+            >>> CylcWorkflowDAO.get_primary_keys('task_pool')
+            ['cycle', 'name', 'flow_nums']
+
+        """
+        return [
+            column[0]
+            for column in cls.TABLES_ATTRS[table_name]
+            if len(column) > 1 and column[1].get('is_primary_key')
+        ]
+
     def __exit__(self, exc_type, exc_value, traceback):
         """Close DB connection when leaving context manager."""
         self.close()
@@ -399,13 +444,46 @@ class CylcWorkflowDAO:
             except sqlite3.Error as exc:
                 LOG.debug(f"Error closing connection to DB: {exc}")
             self.conn = None
+            self.db_file_id = None
 
     def connect(self) -> sqlite3.Connection:
         """Connect to the database."""
         if self.conn is None:
             self.conn = sqlite3.connect(self.db_file_name, self.CONN_TIMEOUT)
+            if self.persistent:
+                for pragma in self.PERSISTENT_PRAGMAS:
+                    self.conn.execute(pragma)
+                stat = os.stat(self.db_file_name)
+                self.db_file_id = (stat.st_dev, stat.st_ino)
         return self.conn
 
+    def check_db_file(self) -> None:
+        """Close a persistent connection if the DB file has gone.
+
+        If the DB file has been removed (e.g. the workflow run directory has
+        been deleted) or replaced, the connection is closed so that the next
+        statement forces a reconnection, which will fail if the file cannot
+        be re-opened.
+        """
+        if self.conn is None or self.db_file_id is None:
+            return
+        try:
+            stat = os.stat(self.db_file_name)
+        except OSError:
+            self.close()
+            return
+        if (stat.st_dev, stat.st_ino) != self.db_file_id:
+            self.close()
+
+    def checkpoint(self) -> None:
+        """Write any changes in the WAL file back to the DB file.
+
+        Call this before copying the DB file. Does nothing for
+        non-persistent connections.
+        """
+        if self.persistent and self.conn is not None:
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
     def create_tables(self):
         """Create tables."""
         names = []
@@ -417,12 +495,48 @@ class CylcWorkflowDAO:
         for name, table in self.tables.items():
             if name not in names:
                 cur = self.conn.execute(table.get_create_stmt())
+                for stmt in self.get_create_index_stmts(name):
+                    cur = self.conn.execute(stmt)
         if cur is not None:
             self.conn.commit()
 
-    def execute_queued_items(self):
-        """Execute queued items for each table."""
-        # determine the sql statements to execute
+    @classmethod
+    def get_create_index_stmts(
+        cls, table_name: Optional[str] = None
+    ) -> List[str]:
+        """Return SQL statements to create the secondary indexes.
+
+        Args:
+            table_name: Only return statements for the indexes of this table.
+
+        Examples:
+            >>> for stmt in CylcWorkflowDAO.get_create_index_stmts(
+            ...     'task_outputs'
+            ... ):
+            ...     print(stmt)
+            CREATE INDEX IF NOT EXISTS task_outputs_name_cycle
+            ON task_outputs(name, cycle)
+
+        """
+        return [
+            f'CREATE INDEX IF NOT EXISTS {index_name}'
+            f'\nON {table}({", ".join(columns)})'
+            for index_name, (table, columns) in cls.INDEXES.items()
+            if table_name in {None, table}
+        ]
+
+    def create_indexes(self) -> None:
+        """Create any missing secondary indexes.
+
+        This may take a while for large databases.
+        """
+        conn = self.connect()
+        for stmt in self.get_create_index_stmts():
+            conn.execute(stmt)
+        conn.commit()
+
+    def _get_queued_items(self) -> List[Tuple[str, list]]:
+        """Return the queued items as a list of (statement, args_list)."""
         sql_queue = []  # (sql_statement, values)
         for table in self.tables.values():
             # DELETE statements may have varying number of WHERE args so we
@@ -443,6 +557,52 @@ class CylcWorkflowDAO:
             # statement.
             for stmt, stmt_args_list in table.update_queues.items():
                 sql_queue.append((stmt, stmt_args_list))
+        return sql_queue
+
+    def pop_queued_items(self) -> List[Tuple[str, list]]:
+        """Return the queued items and clear the queues.
+
+        The items can be executed later by execute_sql_queue (e.g. on a
+        different thread).
+
+        Returns:
+            List of (statement, args_list) in the order they should be
+            executed.
+
+        """
+        sql_queue = self._get_queued_items()
+        for table in self.tables.values():
+            # (the old containers are referenced by sql_queue)
+            table.delete_queues = {}
+            table.insert_queue = []
+            table.update_queues = {}
+        return sql_queue
+
+    def execute_queued_items(self):
+        """Execute queued items for each table."""
+        if self.execute_sql_queue(self._get_queued_items()):
+            # Clear the queues
+            for table in self.tables.values():
+                table.delete_queues.clear()
+                table.insert_queue.clear()
+                table.update_queues.clear()
+
+    def execute_sql_queue(self, sql_queue: List[Tuple[str, list]]) -> bool:
+        """Execute statements and commit them as a single transaction.
+
+        Args:
+            sql_queue: List of (statement, args_list).
+
+        Returns:
+            True if the transaction completed, False if it did not and
+            should be retried (public database only).
+
+        Raises:
+            sqlite3.Error: If the transaction failed (private database).
+
+        """
+        if sql_queue:
+            self.check_db_file()
 
         # execute the statements and commit the transaction
         try:
@@ -450,7 +610,7 @@ class CylcWorkflowDAO:
                 self._execute_stmt(stmt, stmt_args)
             # Connection should only be opened if we have executed something.
             if self.conn is None:
-                return
+                return True
             self.conn.commit()
 
         # something went wrong
@@ -472,29 +632,27 @@ class CylcWorkflowDAO:
             if self.conn is not None:
                 with suppress(sqlite3.Error):
                     self.conn.rollback()
-            return
+            return False
 
         else:
-            # Clear the queues
-            for table in self.tables.values():
-                table.delete_queues.clear()
-                table.insert_queue.clear()
-                table.update_queues.clear()
             # Report public database retry recovery if necessary
             if self.n_tries:
                 LOG.warning(
                     "%(file)s: recovered after (%(attempt)d) attempt(s)\n" % {
                         "file": self.db_file_name, "attempt": self.n_tries})
             self.n_tries = 0
+            return True
 
         finally:
             # Note: This is not strictly necessary. But if the workflow run
             # directory is removed, a forced reconnection to the private
             # database will ensure that the workflow dies.
-            self.close()
+            # (Persistent connections use check_db_file for this instead.)
+            if not self.persistent:
+                self.close()
 
     def _execute_stmt(self, stmt, stmt_args_list):
-        """Helper for "self.execute_queued_items".
+        """Helper for "self.execute_sql_queue".
 
         Execute a statement. If this is the public database, return True on
         success and False on failure. If this is the private database, return
@@ -949,6 +1107,29 @@ class CylcWorkflowDAO:
         )
         return columns, list(self.connect().execute(stmt))
 
+    @staticmethod
+    def _format_values(ids, maxsplit):
+        """Return IDs as the rows of a VALUES clause to match columns with.
+
+        The rows are compared with the columns (rather than their
+        concatenation) so that the primary key / indexes can be used.
+        (Select from the VALUES, SQLite will not search an index for a bare
+        VALUES list.)
+
+        Examples:
+            >>> CylcWorkflowDAO._format_values(['1/a/[1]'], 3)
+            "('1', 'a', '[1]')"
+            >>> CylcWorkflowDAO._format_values(['1/a'], 2)
+            "('1', 'a')"
+
+        """
+        return ', '.join(
+            '(' + ', '.join(
+                f"'{val}'" for val in id_.split('/', maxsplit - 1)
+            ) + ')'
+            for id_ in ids
+        )
+
     def select_tasks_for_datastore(
         self, task_ids
     ):
@@ -970,8 +1151,8 @@ class CylcWorkflowDAO:
             ON  %(task_states)s.cycle == %(task_outputs)s.cycle AND
                 %(task_states)s.name == %(task_outputs)s.name
             WHERE
-                %(task_states)s.cycle || '/' || %(task_states)s.name IN (
-                    %(task_ids)s
+                (%(task_states)s.cycle, %(task_states)s.name) IN (
+                    SELECT * FROM (VALUES %(task_ids)s)
                 )
             GROUP BY
                 %(task_states)s.cycle, %(task_states)s.name
@@ -979,7 +1160,7 @@ class CylcWorkflowDAO:
         form_data = {
             "task_states": self.TABLE_TASK_STATES,
             "task_outputs": self.TABLE_TASK_OUTPUTS,
-            "task_ids": ', '.join(f"'{val}'" for val in task_ids),
+            "task_ids": self._format_values(task_ids, 2),
         }
         stmt = form_stmt % form_data
         return list(self.connect().execute(stmt))
@@ -1001,13 +1182,13 @@ class CylcWorkflowDAO:
             FROM
                 %(prerequisites)s
             WHERE
-                cycle || '/' || name || '/' || flow_nums IN (
-                    %(prereq_tasks_args)s
+                (cycle, name, flow_nums) IN (
+                    SELECT * FROM (VALUES %(prereq_tasks_args)s)
                 )
         """
         form_data = {
             "prerequisites": self.TABLE_TASK_PREREQUISITES,
-            "prereq_tasks_args": ', '.join(f"'{val}'" for val in prereq_ids),
+            "prereq_tasks_args": self._format_values(prereq_ids, 3),
         }
         stmt = form_stmt % form_data
         return list(self.connect().execute(stmt))
@@ -1038,8 +1219,8 @@ class CylcWorkflowDAO:
             ON  %(task_jobs)s.cycle == %(task_states)s.cycle AND
                 %(task_jobs)s.name == %(task_states)s.name
             WHERE
-                %(task_states)s.cycle || '/' || %(task_states)s.name IN (
-                    %(task_ids)s
+                (%(task_states)s.cycle, %(task_states)s.name) IN (
+                    SELECT * FROM (VALUES %(task_ids)s)
                 )
             ORDER BY
                 %(task_states)s.submit_num DESC
@@ -1047,7 +1228,7 @@ class CylcWorkflowDAO:
         form_data = {
             "task_states": self.TABLE_TASK_STATES,
             "task_jobs": self.TABLE_TASK_JOBS,
-            "task_ids": ', '.join(f"'{val}'" for val in task_ids),
+            "task_ids": self._format_values(task_ids, 2),
         }
         stmt = form_stmt % form_data
         return list(self.connect().execute(stmt))
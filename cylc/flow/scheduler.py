@@ -19,6 +19,7 @@ import asyncio
 from contextlib import suppress
 from collections import deque
 from dataclasses import dataclass
+from functools import partial
 from optparse import Values
 import os
 from pathlib import Path
@@ -28,7 +29,7 @@ from socket import gaierror
 from subprocess import Popen, PIPE, DEVNULL
 import sys
 from threading import Barrier, Thread
-from time import sleep, time
+from time import perf_counter, sleep, time
 import traceback
 from typing import (
     TYPE_CHECKING,
@@ -51,6 +52,7 @@ from metomi.isodatetime.parsers import TimePointParser
 from cylc.flow import (
     LOG, main_loop, __version__ as CYLC_VERSION
 )
+from cylc.flow.async_util import Wakeup, WakeupQueue
 from cylc.flow.broadcast_mgr import BroadcastMgr
 from cylc.flow.cfgspec.glbl_cfg import glbl_cfg
 from cylc.flow.config import WorkflowConfig
@@ -82,6 +84,7 @@ from cylc.flow.loggingutil import (
     get_sorted_logs_by_time,
     patch_log_level
 )
+from cylc.flow.loop_timings import LoopPhaseTimings
 from cylc.flow.timer import Timer
 from cylc.flow.network import API
 from cylc.flow.network.authentication import key_housekeeping
@@ -289,11 +292,17 @@ class Scheduler:
         self._profile_amounts = {}
         self._profile_update_times = {}
         self.bad_hosts: Set[str] = set()
+        self.loop_timings = LoopPhaseTimings()
 
         self.restored_stop_task_id = None
 
         self.timers: Dict[str, Timer] = {}
 
+        self.main_loop_event_driven: bool = glbl_cfg().get(
+            ['scheduler', 'event driven main loop'])
+        self.main_loop_max_sleep: float = glbl_cfg().get(
+            ['scheduler', 'main loop maximum sleep'])
+
         self.workflow_run_dir = get_workflow_run_dir(self.workflow)
         self.workflow_work_dir = get_workflow_run_work_dir(self.workflow)
         self.workflow_share_dir = get_workflow_run_share_dir(self.workflow)
@@ -303,7 +312,11 @@ class Scheduler:
 
         self.workflow_db_mgr = WorkflowDatabaseManager(
             pri_d=workflow_files.get_workflow_srv_dir(self.workflow),
-            pub_d=os.path.join(self.workflow_run_dir, 'log')
+            pub_d=os.path.join(self.workflow_run_dir, 'log'),
+            pri_persistent=glbl_cfg().get(
+                ['scheduler', 'persistent database connection']),
+            pub_thread=glbl_cfg().get(
+                ['scheduler', 'public database writer thread']),
         )
         self.is_restart = Path(self.workflow_db_mgr.pri_path).is_file()
         # Map used to track incomplete remote inits for restart
@@ -366,10 +379,16 @@ class Scheduler:
 
         self.server = WorkflowRuntimeServer(self)
 
-        self.proc_pool = SubProcPool()
-        self.command_queue = Queue()
-        self.message_queue = Queue()
-        self.ext_trigger_queue = Queue()
+        # queues wake up the main loop when items are put in them
+        # (see global.cylc[scheduler]event driven main loop)
+        self.main_loop_wakeup = Wakeup()
+        self.command_queue = WakeupQueue(self.main_loop_wakeup)
+        self.message_queue = WakeupQueue(self.main_loop_wakeup)
+        self.ext_trigger_queue = WakeupQueue(self.main_loop_wakeup)
+        self.proc_pool = SubProcPool(
+            use_asyncio=glbl_cfg().get(['scheduler', 'process pool asyncio']),
+            wakeup=self.main_loop_wakeup,
+        )
         self.workflow_event_handler = WorkflowEventHandler(self.proc_pool)
 
         self.xtrigger_mgr = XtriggerManager(
@@ -380,6 +399,10 @@ class Scheduler:
             proc_pool=self.proc_pool,
             workflow_run_dir=self.workflow_run_dir,
             workflow_share_dir=self.workflow_share_dir,
+            executor_size=glbl_cfg().get(
+                ['scheduler', 'xtrigger executor size']
+            ),
+            wakeup=self.main_loop_wakeup,
         )
 
         self.task_events_mgr = TaskEventsManager(
@@ -401,7 +424,11 @@ class Scheduler:
             self.workflow_db_mgr,
             self.task_events_mgr,
             self.data_store_mgr,
-            self.bad_hosts
+            self.bad_hosts,
+            batch_syntax_checks=glbl_cfg().get(
+                ['scheduler', 'batch job script syntax checks']),
+            cache_syntax_checks=glbl_cfg().get(
+                ['scheduler', 'cache job script syntax checks']),
         )
         self.task_job_mgr.task_remote_mgr.uuid_str = self.uuid_str
 
@@ -468,7 +495,11 @@ class Scheduler:
             self.workflow_db_mgr,
             self.task_events_mgr,
             self.data_store_mgr,
-            self.flow_mgr
+            self.flow_mgr,
+            wakeup=self.main_loop_wakeup,
+            discard_job_prep=partial(
+                self.task_job_mgr.discard_job_prep, self.workflow
+            ),
         )
 
         self.data_store_mgr.initiate_data_model()
@@ -975,6 +1006,8 @@ class Scheduler:
         self.proc_pool.set_stopping()
         self.stop_mode = stop_mode
         self.update_data_store()
+        # (may be called from outside of the main loop)
+        self.main_loop_wakeup.set()
 
     def command_release(self, task_globs: Iterable[str]) -> int:
         """Release held tasks."""
@@ -1422,7 +1455,8 @@ class Scheduler:
                     "Waiting for the command process pool to empty" +
                     " for shutdown")
                 while self.proc_pool.is_not_done():
-                    sleep(self.INTERVAL_STOP_PROCESS_POOL_EMPTY)
+                    # (allow any asyncio subprocesses to progress)
+                    await asyncio.sleep(self.INTERVAL_STOP_PROCESS_POOL_EMPTY)
                     if stop_process_pool_empty_msg:
                         LOG.info(stop_process_pool_empty_msg)
                         stop_process_pool_empty_msg = None
@@ -1545,10 +1579,82 @@ class Scheduler:
                 self.count, get_current_time_string()))
         self.count += 1
 
+    def get_next_due_time(self) -> Optional[float]:
+        """Return the time at which the next timed event is due.
+
+        Covers workflow timers, task event timers, job timeouts and polls,
+        xtriggers (including clock triggers and retries), the stop clock
+        and auto restart.
+
+        Returns None if nothing is scheduled.
+        """
+        due = [
+            timer.timeout
+            for timer in self.timers.values()
+            if timer.timeout is not None
+        ]
+        for due_time in (
+            self.task_events_mgr.get_next_due_time(
+                self.pool.get_tasks(), bool(self.stop_mode)
+            ),
+            self.xtrigger_mgr.t_next_due,
+            self.stop_clock_time,
+            self.auto_restart_time,
+            self.time_next_kill,
+        ):
+            if due_time is not None:
+                due.append(due_time)
+        return min(due, default=None)
+
+    async def main_loop_sleep(self, tinit: float) -> None:
+        """Sleep until the main loop needs to run again.
+
+        Args:
+            tinit: The time the current main loop iteration started.
+
+        """
+        elapsed = time() - tinit
+        quick_mode = self.proc_pool.is_not_done()
+        if self.main_loop_event_driven:
+            # Sleep until woken by an incoming message/command/trigger, or
+            # until the next timed event is due.
+            if self.proc_pool.is_polling():
+                # Subprocess completion is detected by polling.
+                duration: float = self.INTERVAL_MAIN_LOOP_QUICK
+            elif self.config.run_mode('simulation'):
+                # Simulated job run times are checked by polling.
+                duration = self.INTERVAL_MAIN_LOOP
+            else:
+                duration = self.main_loop_max_sleep
+            next_due = self.get_next_due_time()
+            if next_due is not None:
+                duration = min(duration, next_due - tinit)
+            # (if something is already due, don't wait)
+            await self.main_loop_wakeup.wait(max(duration - elapsed, 0))
+            return
+
+        # Sleep a bit for things to catch up.
+        # Quick sleep if there are items pending in process pool.
+        # (Should probably use quick sleep logic for other queues?)
+        if (elapsed >= self.INTERVAL_MAIN_LOOP or
+                quick_mode and elapsed >= self.INTERVAL_MAIN_LOOP_QUICK):
+            # Main loop has taken quite a bit to get through
+            # Still yield control to other threads by sleep(0.0)
+            duration = 0
+        elif quick_mode:
+            duration = self.INTERVAL_MAIN_LOOP_QUICK - elapsed
+        else:
+            duration = self.INTERVAL_MAIN_LOOP - elapsed
+        await asyncio.sleep(duration)
+
     async def main_loop(self) -> None:
         """The scheduler main loop."""
+        self.main_loop_wakeup.bind()
         while True:  # MAIN LOOP
             tinit = time()
+            # Anything arriving from now on will be handled by this iteration
+            # or will wake up the next.
+            self.main_loop_wakeup.clear()
 
             # Useful for debugging core scheduler issues:
             # self.pool.log_task_pool(logging.CRITICAL)
@@ -1570,8 +1676,14 @@ class Scheduler:
                 self.is_reloaded = True
                 self.is_updated = True
 
+            timings = self.loop_timings
+            # (the command queue is processed twice per iteration, the two
+            # are recorded as one sample)
+            tcommands = perf_counter()
             self.process_command_queue()
-            self.proc_pool.process()
+            tcommands = perf_counter() - tcommands
+            with timings.time('process pool'):
+                self.proc_pool.process()
 
             # Tasks in the main pool that are waiting but not queued must be
             # waiting on external dependencies, i.e. xtriggers or ext_triggers.
@@ -1580,45 +1692,12 @@ class Scheduler:
             # main pool at all until all other-task deps are satisfied, and are
             # queued immediately on release from runahead limiting if they are
             # not waiting on external deps).
-            housekeep_xtriggers = False
-            for itask in self.pool.get_tasks():
-                if (
-                    not itask.state(TASK_STATUS_WAITING)
-                    or itask.state.is_queued
-                    or itask.state.is_runahead
-                ):
-                    continue
-
-                if (
-                    itask.state.xtriggers
-                    and not itask.state.xtriggers_all_satisfied()
-                ):
-                    # Call unsatisfied xtriggers if not already in-process.
-                    # Results are returned asynchronously.
-                    self.xtrigger_mgr.call_xtriggers_async(itask)
-                    # Check for satisfied xtriggers, and queue if ready.
-                    if self.xtrigger_mgr.check_xtriggers(
-                            itask, self.workflow_db_mgr.put_xtriggers):
-                        housekeep_xtriggers = True
-                        if all(itask.is_ready_to_run()):
-                            self.pool.queue_task(itask)
-
-                # Check for satisfied ext_triggers, and queue if ready.
-                if (
-                    itask.state.external_triggers
-                    and not itask.state.external_triggers_all_satisfied()
-                    and self.broadcast_mgr.check_ext_triggers(
-                        itask, self.ext_trigger_queue)
-                    and all(itask.is_ready_to_run())
-                ):
-                    self.pool.queue_task(itask)
-
-            if housekeep_xtriggers:
-                # (Could do this periodically?)
-                self.xtrigger_mgr.housekeep(self.pool.get_tasks())
+            with timings.time('xtriggers'):
+                self.check_external_triggers()
 
             self.pool.set_expired_tasks()
-            self.release_queued_tasks()
+            with timings.time('release queued tasks'):
+                self.release_queued_tasks()
 
             if self.pool.sim_time_check(self.message_queue):
                 # A simulated task state change occurred.
@@ -1627,19 +1706,24 @@ class Scheduler:
             self.broadcast_mgr.expire_broadcast(self.pool.get_min_point())
             self.late_tasks_check()
 
-            self.process_queued_task_messages()
+            with timings.time('task messages'):
+                self.process_queued_task_messages()
+            tstart = perf_counter()
             self.process_command_queue()
+            timings.record('commands', tcommands + perf_counter() - tstart)
             self.task_events_mgr.process_events(self)
 
             # Update state summary, database, and uifeed
             self.workflow_db_mgr.put_task_event_timers(self.task_events_mgr)
-            has_updated = await self.update_data_structure()
+            with timings.time('data store'):
+                has_updated = await self.update_data_structure()
             if has_updated and not self.is_stalled:
                 # Stop the stalled timer.
                 with suppress(KeyError):
                     self.timers[self.EVENT_STALL_TIMEOUT].stop()
 
-            self.process_workflow_db_queue()
+            with timings.time('database'):
+                self.process_workflow_db_queue()
 
             # If public database is stuck, blast it away by copying the content
             # of the private database into it.
@@ -1655,41 +1739,68 @@ class Scheduler:
                 self.update_profiler_logs(tinit)
 
             # Run plugin functions
-            await asyncio.gather(
-                *main_loop.get_runners(
-                    self.main_loop_plugins,
-                    main_loop.CoroTypes.Periodic,
-                    self
+            with timings.time('plugins'):
+                await asyncio.gather(
+                    *main_loop.get_runners(
+                        self.main_loop_plugins,
+                        main_loop.CoroTypes.Periodic,
+                        self
+                    )
                 )
-            )
 
             if not has_updated and not self.stop_mode:
                 # Has the workflow stalled?
                 self.check_workflow_stalled()
 
-            # Sleep a bit for things to catch up.
-            # Quick sleep if there are items pending in process pool.
-            # (Should probably use quick sleep logic for other queues?)
-            elapsed = time() - tinit
-            quick_mode = self.proc_pool.is_not_done()
-            if (elapsed >= self.INTERVAL_MAIN_LOOP or
-                    quick_mode and elapsed >= self.INTERVAL_MAIN_LOOP_QUICK):
-                # Main loop has taken quite a bit to get through
-                # Still yield control to other threads by sleep(0.0)
-                duration: float = 0
-            elif quick_mode:
-                duration = self.INTERVAL_MAIN_LOOP_QUICK - elapsed
-            else:
-                duration = self.INTERVAL_MAIN_LOOP - elapsed
-            await asyncio.sleep(duration)
+            await self.main_loop_sleep(tinit)
             # Record latest main loop interval
             self.main_loop_intervals.append(time() - tinit)
             # END MAIN LOOP
 
+    def check_external_triggers(self) -> None:
+        """Call unsatisfied xtriggers and check for satisfied ext_triggers.
+
+        Queue waiting tasks whose external dependencies are now satisfied.
+
+        """
+        housekeep_xtriggers = False
+        self.xtrigger_mgr.t_next_due = None
+        for itask in self.pool.get_tasks_by_status(TASK_STATUS_WAITING):
+            if itask.state.is_queued or itask.state.is_runahead:
+                continue
+
+            if (
+                itask.state.xtriggers
+                and not itask.state.xtriggers_all_satisfied()
+            ):
+                # Call unsatisfied xtriggers if not already in-process.
+                # Results are returned asynchronously.
+                self.xtrigger_mgr.call_xtriggers_async(itask)
+                # Check for satisfied xtriggers, and queue if ready.
+                if self.xtrigger_mgr.check_xtriggers(
+                        itask, self.workflow_db_mgr.put_xtriggers):
+                    housekeep_xtriggers = True
+                    if all(itask.is_ready_to_run()):
+                        self.pool.queue_task(itask)
+
+            # Check for satisfied ext_triggers, and queue if ready.
+            if (
+                itask.state.external_triggers
+                and not itask.state.external_triggers_all_satisfied()
+                and self.broadcast_mgr.check_ext_triggers(
+                    itask, self.ext_trigger_queue)
+                and all(itask.is_ready_to_run())
+            ):
+                self.pool.queue_task(itask)
+
+        if housekeep_xtriggers:
+            # (Could do this periodically?)
+            self.xtrigger_mgr.housekeep(self.pool.get_tasks())
+
     async def update_data_structure(self) -> Union[bool, List['TaskProxy']]:
         """Update DB, UIS, Summary data elements"""
-        updated_tasks = [
-            t for t in self.pool.get_tasks() if t.state.is_updated]
+        # (resets the is_updated flag of the tasks)
+        updated_tasks = self.pool.get_updated_tasks()
         has_updated = self.is_updated or updated_tasks
         reloaded = self.is_reloaded
         # Add tasks that have moved moved from runahead to live pool.
@@ -1712,8 +1823,6 @@ class Scheduler:
             self.is_updated = False
             if not reloaded:  # (A reload cannot unstall workflow by itself)
                 self.is_stalled = False
-            for itask in updated_tasks:
-                itask.state.is_updated = False
             self.update_data_store()
         return has_updated
 
@@ -1779,9 +1888,13 @@ class Scheduler:
                     # e.g. KeyboardInterrupt
                     self.proc_pool.terminate()
                 self.proc_pool.process()
+                await self.proc_pool.async_wait()
             except Exception as exc:
                 LOG.exception(exc)
 
+        if hasattr(self, 'xtrigger_mgr'):
+            self.xtrigger_mgr.shutdown()
+
         if hasattr(self, 'pool'):
             try:
                 if not self.is_stalled:
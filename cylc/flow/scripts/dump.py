@@ -33,6 +33,9 @@ Examples:
 
   # Display the state of all tasks in a particular cycle point:
   $ cylc dump -t WORKFLOW_ID | grep 2010082406
+
+  # Display the time spent in each phase of the scheduler main loop:
+  $ cylc dump --loop-timings WORKFLOW_ID
 """
 
 from graphene.utils.str_converters import to_snake_case
@@ -147,6 +150,49 @@ fragment wFlow on Workflow {
 '''
 
 
+def format_loop_timings(timings):
+    """Format main loop phase timings as a table.
+
+    Examples:
+        >>> from cylc.flow.loop_timings import LoopPhaseTimings
+        >>> timings = LoopPhaseTimings()
+        >>> timings.record('commands', 0.002)
+        >>> timings.record('commands', 0.004)
+        >>> timings.record('process pool', 12)
+        >>> print('\\n'.join(format_loop_timings(timings.summary())))
+        phase         count  mean (s)  max (s)  last (s)  <=0.001  <=0.01  ...
+        commands          2     0.003    0.004     0.004        0       2  ...
+        process pool      1    12.000   12.000    12.000        0       0  ...
+
+    """
+    if not timings:
+        return []
+    buckets = list(next(iter(timings.values()))['histogram'])
+    headings = ['phase', 'count', 'mean (s)', 'max (s)', 'last (s)', *buckets]
+    rows = [
+        [
+            phase,
+            str(timing['count']),
+            f"{timing['mean']:.3f}",
+            f"{timing['max']:.3f}",
+            f"{timing['last']:.3f}",
+            *(str(timing['histogram'][bucket]) for bucket in buckets),
+        ]
+        for phase, timing in timings.items()
+    ]
+    widths = [
+        max(len(row[ind]) for row in [headings, *rows])
+        for ind in range(len(headings))
+    ]
+    return [
+        '  '.join(
+            cell.ljust(widths[0]) if ind == 0 else cell.rjust(widths[ind])
+            for ind, cell in enumerate(row)
+        )
+        for row in [headings, *rows]
+    ]
+
+
 def get_option_parser():
     parser = COP(
         __doc__,
@@ -159,6 +205,10 @@ def get_option_parser():
     parser.add_option(
         "-t", "--tasks", help="Task states only.",
         action="store_const", const="tasks", dest="disp_form")
+    parser.add_option(
+        "-l", "--loop-timings",
+        help="Scheduler main loop phase timings only.",
+        action="store_const", const="loop-timings", dest="disp_form")
     parser.add_option(
         "-f", "--flows", help="Print flow numbers with tasks.",
         action="store_true", default=False, dest="show_flows")
@@ -207,6 +257,13 @@ def main(_, options: 'Values', workflow_id: str) -> None:
                 }}
               }}
             }}'''
+    elif options.disp_form == "loop-timings":
+        query = '''
+            query ($wFlows: [ID]!) {
+              workflows (ids: $wFlows, stripNull: false) {
+                loopPhaseTimings
+              }
+            }'''
     elif options.disp_form != "tasks":
         query = f'''
             {WORKFLOW_SUMMARY_FRAGMENT}
@@ -240,6 +297,9 @@ def main(_, options: 'Values', workflow_id: str) -> None:
                     sys.stdout.write(json.dumps(summary, indent=4) + '\n')
                 else:
                     print(summary)
+            elif options.disp_form == "loop-timings":
+                for line in format_loop_timings(summary['loopPhaseTimings']):
+                    print(line)
             else:
                 if options.disp_form != "tasks":
                     node_urls = {
@@ -50,6 +50,12 @@ Examples:
   > WARNING:Hey!
   >__STDIN__
 
+  # Messages of several jobs on STDIN, one per line (e.g. from a relay):
+  $ cylc message --batch -- "${CYLC_WORKFLOW_ID}" <<'__STDIN__'
+  > 1/foo/01 Hello
+  > 1/bar/01 WARNING:Hey!
+  >__STDIN__
+
 Note "${CYLC_WORKFLOW_ID}" and "${CYLC_TASK_JOB}" are available in job
 environments - you do not need to write their actual values in task scripting.
 
@@ -64,6 +70,12 @@ Note:
     cylc__job_abort 'message...'
   (For technical reasons this is a shell function, not a cylc sub-command).
 
+With --batch, the messages of any number of jobs of the workflow are read
+from STDIN, one per line in the form 'JOB [SEVERITY:]MESSAGE', and are sent
+to the scheduler in batches rather than in one request per job. They are
+also written to the job status file of each job, but not to the job
+stdout/stderr.
+
 For backward compatibility, if number of arguments is less than or equal to 2,
 the command assumes the classic interface, where all arguments are messages.
 Otherwise, the first 2 arguments are assumed to be workflow name and job
@@ -74,14 +86,14 @@ identifier.
 from logging import getLevelName, INFO
 import os
 import sys
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Dict, List
 
 from cylc.flow.id_cli import parse_id
 from cylc.flow.option_parsers import (
     WORKFLOW_ID_ARG_DOC,
     CylcOptionParser as COP
 )
-from cylc.flow.task_message import record_messages
+from cylc.flow.task_message import record_messages, record_messages_batch
 from cylc.flow.terminal import cli_function
 from cylc.flow.exceptions import InputError
 from cylc.flow.unicode_rules import TaskMessageValidator
@@ -111,12 +123,58 @@ def get_option_parser() -> COP:
         help='Set severity levels for messages that do not have one',
         action='store', dest='severity')
 
+    parser.add_option(
+        '--batch',
+        help=(
+            'Read "JOB [SEVERITY:]MESSAGE" lines for any number of jobs'
+            ' from STDIN.'
+        ),
+        action='store_true', default=False, dest='batch')
+
     return parser
 
 
+def _parse_message(options: 'Values', message_str: str) -> List[str]:
+    """Separate "severity: message"."""
+    if ':' in message_str:
+        valid, err_msg = TaskMessageValidator.validate(message_str)
+        if not valid:
+            raise InputError(
+                f'Invalid task message "{message_str}" - {err_msg}')
+        return [item.strip() for item in message_str.split(':', 1)]
+    if options.severity:
+        return [options.severity, message_str.strip()]
+    return [getLevelName(INFO), message_str.strip()]
+
+
+def batch_main(options: 'Values', workflow_id: str) -> None:
+    """Record the messages of several jobs read from STDIN."""
+    workflow_id, *_ = parse_id(
+        workflow_id,
+        constraint='workflows',
+    )
+    # {job_id: [(severity, message_str), ...]}
+    job_messages: Dict[str, List[List[str]]] = {}
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            job_id, message_str = line.strip().split(None, 1)
+        except ValueError:
+            raise InputError(f'Invalid job message line "{line.strip()}"')
+        job_messages.setdefault(job_id, []).append(
+            _parse_message(options, message_str))
+    record_messages_batch(workflow_id, list(job_messages.items()))
+
+
 @cli_function(get_option_parser)
 def main(parser: COP, options: 'Values', *args: str) -> None:
     """CLI."""
+    if options.batch:
+        if len(args) != 1:
+            parser.error('--batch requires the workflow ID only')
+        batch_main(options, args[0])
+        return
     if not args:
         return parser.error('No message supplied')
     if len(args) <= 2:
@@ -160,19 +218,9 @@ def main(parser: COP, options: 'Values', *args: str) -> None:
                     message_strs.append(current_message_str)
                 break
     # Separate "severity: message"
-    messages = []  # [(severity, message_str), ...]
-    for message_str in message_strs:
-        if message_str == '-':
-            pass
-        elif ':' in message_str:
-            valid, err_msg = TaskMessageValidator.validate(message_str)
-            if not valid:
-                raise InputError(
-                    f'Invalid task message "{message_str}" - {err_msg}')
-            messages.append(
-                [item.strip() for item in message_str.split(':', 1)])
-        elif options.severity:
-            messages.append([options.severity, message_str.strip()])
-        else:
-            messages.append([getLevelName(INFO), message_str.strip()])
+    messages = [  # [(severity, message_str), ...]
+        _parse_message(options, message_str)
+        for message_str in message_strs
+        if message_str != '-'
+    ]
     record_messages(workflow_id, job_id, messages)
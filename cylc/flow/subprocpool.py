@@ -15,7 +15,11 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """Manage queueing and pooling of subprocesses for the scheduler."""
 
+import asyncio
+from codecs import getincrementaldecoder
 from collections import deque
+from contextlib import redirect_stderr, redirect_stdout
+from io import StringIO
 import json
 import os
 import select
@@ -25,8 +29,11 @@ import shlex
 from tempfile import SpooledTemporaryFile
 from threading import RLock
 from time import time
-from subprocess import DEVNULL, run  # nosec
-from typing import Any, Callable, List, Optional
+import traceback
+from subprocess import DEVNULL, PIPE, run  # nosec
+from typing import (
+    TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+)
 
 from cylc.flow import LOG
 from cylc.flow.cfgspec.glbl_cfg import glbl_cfg
@@ -39,6 +46,9 @@ from cylc.flow.platforms import (
 from cylc.flow.task_events_mgr import TaskJobLogsRetrieveContext
 from cylc.flow.wallclock import get_current_time_string
 
+if TYPE_CHECKING:
+    from cylc.flow.async_util import Wakeup
+
 _XTRIG_FUNCS: dict = {}
 
 
@@ -118,6 +128,32 @@ def run_function(func_name, json_args, json_kwargs, src_dir):
     sys.stdout.write(json.dumps(res))
 
 
+def run_function_in_executor(
+    func_name, json_args, json_kwargs, src_dir
+) -> Tuple[int, str, str]:
+    """Run a Python function in an executor worker process.
+
+    This is the equivalent of "cylc function-run" (see run_function) for
+    functions run by a concurrent.futures executor rather than a
+    subprocess. The worker process is reused, so the function module is
+    only imported once.
+
+    Returns:
+        (ret_code, out, err) as they would be for "cylc function-run".
+
+    """
+    out = StringIO()
+    err = StringIO()
+    ret_code = 0
+    with redirect_stdout(out), redirect_stderr(err):
+        try:
+            run_function(func_name, json_args, json_kwargs, src_dir)
+        except Exception:
+            traceback.print_exc()
+            ret_code = 1
+    return ret_code, out.getvalue(), err.getvalue()
+
+
 class SubProcPool:
     """Manage queueing and pooling of subprocesses.
 
@@ -142,6 +178,12 @@ class SubProcPool:
     only be written to the workflow log by the callback function when the
     command exits (and only if the callback function has the logic to do so).
 
+    If use_asyncio is set, commands queued from within a running event loop
+    are run as asyncio subprocesses. These start as soon as there is space
+    in the pool and their callbacks are called as soon as they exit, rather
+    than the next time SubProcPool.process is called. The wakeup (if
+    provided) is set when a command exits so the caller can act on it.
+
     """
 
     ERR_WORKFLOW_STOPPING = 'workflow stopping, command not run'
@@ -149,7 +191,11 @@ class SubProcPool:
     POLLREAD = select.POLLIN | select.POLLPRI
     RET_CODE_WORKFLOW_STOPPING = 999
 
-    def __init__(self):
+    def __init__(
+        self,
+        use_asyncio: bool = False,
+        wakeup: 'Optional[Wakeup]' = None,
+    ):
         self.size = glbl_cfg().get(['scheduler', 'process pool size'])
         self.proc_pool_timeout = glbl_cfg().get(
             ['scheduler', 'process pool timeout'])
@@ -157,8 +203,19 @@ class SubProcPool:
         self.stopping = False  # No more job submit if True
         # .stopping may be set by an API command in a different thread
         self.stopping_lock = RLock()
-        self.queuings = deque()
-        self.runnings = []
+        # Commands waiting to run: [[ctx, bad_hosts, callback, ...], ...]
+        self.queuings: 'deque[List[Any]]' = deque()
+        # Commands running: [[proc, ctx, bad_hosts, callback, ...], ...]
+        self.runnings: List[List[Any]] = []
+        self.use_asyncio = use_asyncio
+        self.wakeup = wakeup
+        # Commands running as asyncio subprocesses:
+        # {task: process (None whilst starting)}
+        self.async_runnings: 'Dict[asyncio.Task, Any]' = {}
+        # Exceptions raised by callbacks of asyncio subprocesses
+        # (re-raised by SubProcPool.process).
+        self.async_errors: 'deque[Exception]' = deque()
+        self.pipepoller: Optional[select.poll]
         try:
             self.pipepoller = select.poll()
         except AttributeError:  # select.poll not implemented for this OS
@@ -176,7 +233,19 @@ class SubProcPool:
 
     def is_not_done(self):
         """Return True if queuings or runnings not empty."""
-        return self.queuings or self.runnings
+        return self.queuings or self.runnings or self.async_runnings
+
+    def is_polling(self) -> bool:
+        """Return True if commands are waiting for SubProcPool.process.
+
+        I.e. there are commands which will only progress when
+        SubProcPool.process is next called (as opposed to asyncio
+        subprocesses which progress by themselves).
+        """
+        return bool(
+            self.runnings
+            or (self.queuings and not self.async_runnings)
+        )
 
     def _is_stopping(self):
         """Return whether .stopping is True or not.
@@ -211,6 +280,8 @@ class SubProcPool:
 
     def process(self):
         """Process done child processes and submit more."""
+        if self.async_errors:
+            raise self.async_errors.popleft()
         # Handle child processes that are done
         runnings = []
         for running in self.runnings:
@@ -253,8 +324,17 @@ class SubProcPool:
         # Update list of running items
         self.runnings[:] = runnings
         # Create more child processes, if items in queue and space in pool
+        self._run_queued()
+
+    def _run_queued(self):
+        """Create more child processes, if items in queue and space in pool.
+        """
         stopping = self._is_stopping()
-        while self.queuings and len(self.runnings) < self.size:
+        use_asyncio = self._use_asyncio()
+        while (
+            self.queuings
+            and len(self.runnings) + len(self.async_runnings) < self.size
+        ):
             (
                 ctx, bad_hosts, callback, callback_args,
                 callback_255, callback_255_args
@@ -263,6 +343,15 @@ class SubProcPool:
                 ctx.err = self.ERR_WORKFLOW_STOPPING
                 ctx.ret_code = self.RET_CODE_WORKFLOW_STOPPING
                 self._run_command_exit(ctx)
+            elif use_asyncio:
+                ctx.timeout = time() + self.proc_pool_timeout
+                task = asyncio.create_task(
+                    self._run_command_async(
+                        ctx, bad_hosts, callback, callback_args,
+                        callback_255, callback_255_args
+                    )
+                )
+                self.async_runnings[task] = None
             else:
                 proc = self._run_command_init(
                     ctx, bad_hosts, callback, callback_args,
@@ -307,6 +396,93 @@ class SubProcPool:
                     callback_255, callback_255_args
                 ]
             )
+            if self._use_asyncio():
+                # Start now rather than on the next call to process().
+                self._run_queued()
+
+    def _use_asyncio(self) -> bool:
+        """Return True if commands should be run as asyncio subprocesses."""
+        if not self.use_asyncio:
+            return False
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # Not called from a coroutine, run using Popen instead.
+            return False
+        return True
+
+    async def _run_command_async(
+        self, ctx, bad_hosts=None, callback=None, callback_args=None,
+        callback_255=None, callback_255_args=None
+    ):
+        """Run the command in ctx as an asyncio subprocess.
+
+        The callback is called when the command exits.
+        """
+        task = asyncio.current_task()
+        try:
+            proc = await self._run_command_init_async(
+                ctx, bad_hosts, callback, callback_args,
+                callback_255, callback_255_args
+            )
+            if proc is None:
+                return
+            self.async_runnings[task] = proc
+            readers = asyncio.gather(
+                self._read_stream(proc.stdout, ctx, 'out'),
+                self._read_stream(proc.stderr, ctx, 'err'),
+            )
+            err_xtra = ""
+            try:
+                await asyncio.wait_for(
+                    asyncio.shield(readers), ctx.timeout - time()
+                )
+            except asyncio.TimeoutError:
+                # Command timed out, kill it
+                if _killpg(proc, SIGKILL):
+                    err_xtra = (
+                        f"\nkilled on timeout ({self.proc_pool_timeout})"
+                    )
+                await readers
+            ctx.ret_code = await proc.wait()
+            if err_xtra:
+                if ctx.err is None:
+                    ctx.err = ''
+                ctx.err += err_xtra
+            self._run_command_exit(
+                ctx, bad_hosts=bad_hosts,
+                callback=callback, callback_args=callback_args,
+                callback_255=callback_255, callback_255_args=callback_255_args
+            )
+        except Exception as exc:
+            # Don't lose errors in callbacks, raise them in the main loop.
+            self.async_errors.append(exc)
+        finally:
+            self.async_runnings.pop(task, None)
+            if not self.closed:
+                self._run_queued()
+            if self.wakeup is not None:
+                self.wakeup.set()
+
+    @staticmethod
+    async def _read_stream(stream, ctx, attr):
+        """Append the output of a subprocess stream to ctx.out or ctx.err.
+        """
+        decoder = getincrementaldecoder('utf-8')(errors='replace')
+        while True:
+            data = await stream.read(65536)  # 64K
+            text = decoder.decode(data, final=not data)
+            if text:
+                if getattr(ctx, attr) is None:
+                    setattr(ctx, attr, '')
+                setattr(ctx, attr, getattr(ctx, attr) + text)
+            if not data:
+                return
+
+    async def async_wait(self):
+        """Wait for any asyncio subprocesses to exit."""
+        while self.async_runnings:
+            await asyncio.wait(list(self.async_runnings))
 
     @classmethod
     def run_command(cls, ctx):
@@ -341,6 +517,9 @@ class SubProcPool:
             proc = value[0]
             if proc:
                 _killpg(proc, SIGKILL)
+        for proc in self.async_runnings.values():
+            if proc:
+                _killpg(proc, SIGKILL)
         # Wait for child processes
         self.process()
 
@@ -396,6 +575,34 @@ class SubProcPool:
         self.pipepoller.unregister(proc.stdout.fileno())
         self.pipepoller.unregister(proc.stderr.fileno())
 
+    @classmethod
+    def _get_stdin(cls, ctx):
+        """Return the STDIN for the command in ctx."""
+        if ctx.cmd_kwargs.get('stdin_files'):
+            if len(ctx.cmd_kwargs['stdin_files']) > 1:
+                stdin_file = cls.get_temporary_file()
+                for file_ in ctx.cmd_kwargs['stdin_files']:
+                    if hasattr(file_, 'read'):
+                        stdin_file.write(file_.read())
+                    else:
+                        with open(file_, 'rb') as openfile:
+                            stdin_file.write(openfile.read())
+                stdin_file.seek(0)
+            elif hasattr(ctx.cmd_kwargs['stdin_files'][0], 'read'):
+                stdin_file = ctx.cmd_kwargs['stdin_files'][0]
+            else:
+                stdin_file = open(  # noqa: SIM115
+                    # (nasty use of file handles, should avoid in future)
+                    ctx.cmd_kwargs['stdin_files'][0], 'rb'
+                )
+        elif ctx.cmd_kwargs.get('stdin_str'):
+            stdin_file = cls.get_temporary_file()
+            stdin_file.write(ctx.cmd_kwargs.get('stdin_str').encode())
+            stdin_file.seek(0)
+        else:
+            stdin_file = DEVNULL
+        return stdin_file
+
     @classmethod
     def _run_command_init(
         cls, ctx, bad_hosts=None, callback=None, callback_args=None,
@@ -403,29 +610,7 @@ class SubProcPool:
     ):
         """Prepare and launch shell command in ctx."""
         try:
-            if ctx.cmd_kwargs.get('stdin_files'):
-                if len(ctx.cmd_kwargs['stdin_files']) > 1:
-                    stdin_file = cls.get_temporary_file()
-                    for file_ in ctx.cmd_kwargs['stdin_files']:
-                        if hasattr(file_, 'read'):
-                            stdin_file.write(file_.read())
-                        else:
-                            with open(file_, 'rb') as openfile:
-                                stdin_file.write(openfile.read())
-                    stdin_file.seek(0)
-                elif hasattr(ctx.cmd_kwargs['stdin_files'][0], 'read'):
-                    stdin_file = ctx.cmd_kwargs['stdin_files'][0]
-                else:
-                    stdin_file = open(  # noqa: SIM115
-                        # (nasty use of file handles, should avoid in future)
-                        ctx.cmd_kwargs['stdin_files'][0], 'rb'
-                    )
-            elif ctx.cmd_kwargs.get('stdin_str'):
-                stdin_file = cls.get_temporary_file()
-                stdin_file.write(ctx.cmd_kwargs.get('stdin_str').encode())
-                stdin_file.seek(0)
-            else:
-                stdin_file = DEVNULL
+            stdin_file = cls._get_stdin(ctx)
             proc = procopen(
                 ctx.cmd, stdin=stdin_file, stdoutpipe=True, stderrpipe=True,
                 # Execute command as a process group leader,
@@ -436,21 +621,67 @@ class SubProcPool:
             # calls to open a shell are aggregated in cylc_subproc.procopen()
             # with logging for what is calling it and the commands given
         except OSError as exc:
-            if exc.filename is None:
-                exc.filename = ctx.cmd[0]
-            LOG.exception(exc)
-            ctx.ret_code = 1
-            ctx.err = str(exc)
-            cls._run_command_exit(
-                ctx, bad_hosts=bad_hosts,
-                callback=callback, callback_args=callback_args,
-                callback_255=callback_255, callback_255_args=callback_255_args
+            cls._run_command_init_error(
+                exc, ctx, bad_hosts, callback, callback_args,
+                callback_255, callback_255_args
             )
             return None
         else:
             LOG.debug(ctx.cmd)
             return proc
 
+    @classmethod
+    async def _run_command_init_async(
+        cls, ctx, bad_hosts=None, callback=None, callback_args=None,
+        callback_255=None, callback_255_args=None
+    ):
+        """Prepare and launch shell command in ctx as an asyncio subprocess.
+        """
+        try:
+            stdin_file = cls._get_stdin(ctx)
+            kwargs = {
+                'stdin': stdin_file,
+                'stdout': PIPE,
+                'stderr': PIPE,
+                # Execute command as a process group leader,
+                # so we can use "os.killpg" to kill the whole group.
+                'preexec_fn': os.setpgrp,
+                'env': ctx.cmd_kwargs.get('env'),
+            }
+            cmd = ctx.cmd
+            if isinstance(cmd, str):
+                cmd = [cmd]
+            if ctx.cmd_kwargs.get('shell'):
+                # (as for Popen(shell=True))
+                cmd = ['/bin/sh', '-c', *cmd]
+            proc = await asyncio.create_subprocess_exec(*cmd, **kwargs)
+        except OSError as exc:
+            cls._run_command_init_error(
+                exc, ctx, bad_hosts, callback, callback_args,
+                callback_255, callback_255_args
+            )
+            return None
+        else:
+            LOG.debug(ctx.cmd)
+            return proc
+
+    @classmethod
+    def _run_command_init_error(
+        cls, exc, ctx, bad_hosts=None, callback=None, callback_args=None,
+        callback_255=None, callback_255_args=None
+    ):
+        """Handle failure to launch the command in ctx."""
+        if exc.filename is None:
+            exc.filename = ctx.cmd[0]
+        LOG.exception(exc)
+        ctx.ret_code = 1
+        ctx.err = str(exc)
+        cls._run_command_exit(
+            ctx, bad_hosts=bad_hosts,
+            callback=callback, callback_args=callback_args,
+            callback_255=callback_255, callback_255_args=callback_255_args
+        )
+
     @classmethod
     def _run_command_exit(
         cls, ctx, bad_hosts=None,
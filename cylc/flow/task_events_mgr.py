@@ -33,7 +33,7 @@ import os
 from shlex import quote
 import shlex
 from time import time
-from typing import TYPE_CHECKING, Optional, Union, cast
+from typing import TYPE_CHECKING, Iterable, Optional, Union, cast
 
 from cylc.flow import LOG, LOG_LEVELS
 from cylc.flow.cfgspec.glbl_cfg import glbl_cfg
@@ -521,6 +521,44 @@ class TaskEventsManager():
             elif ctx.ctx_type == self.HANDLER_JOB_LOGS_RETRIEVE:
                 self._process_job_logs_retrieval(schd, ctx, id_keys)
 
+    def get_next_due_time(
+        self, itasks: Iterable['TaskProxy'], stop_mode: bool = False
+    ) -> Optional[float]:
+        """Return the time at which the next task event is due.
+
+        Considers event handler timers, job submission/execution timeouts
+        and job poll timers.
+
+        Args:
+            itasks: The tasks to consider.
+            stop_mode: The workflow is stopping (mail is not held back).
+
+        Returns None if nothing is scheduled.
+        """
+        due = []
+        for timer in self._event_timers.values():
+            if timer.is_waiting or timer.timeout is None:
+                continue
+            if (
+                # mail notifications are held back until the next mail time
+                # (see process_events)
+                timer.ctx.ctx_type == self.HANDLER_MAIL
+                and not stop_mode
+                and self.next_mail_time is not None
+            ):
+                due.append(max(timer.timeout, self.next_mail_time))
+            else:
+                due.append(timer.timeout)
+        for itask in itasks:
+            if itask.timeout is not None:
+                due.append(itask.timeout)
+            if (
+                itask.poll_timer is not None
+                and itask.poll_timer.timeout is not None
+            ):
+                due.append(itask.poll_timer.timeout)
+        return min(due, default=None)
+
     def process_message(
         self,
         itask: 'TaskProxy',
@@ -53,8 +53,8 @@ from cylc.flow.hostuserutil import (
 )
 from cylc.flow.job_file import JobFileWriter
 from cylc.flow.parsec.util import (
-    pdeepcopy,
-    poverride
+    poverlay,
+    pshallowcopy,
 )
 from cylc.flow.pathutil import get_remote_workflow_run_job_dir
 from cylc.flow.platforms import (
@@ -146,13 +146,16 @@ class TaskJobManager:
     }
 
     def __init__(self, workflow, proc_pool, workflow_db_mgr,
-                 task_events_mgr, data_store_mgr, bad_hosts):
+                 task_events_mgr, data_store_mgr, bad_hosts,
+                 batch_syntax_checks=False, cache_syntax_checks=False):
         self.workflow = workflow
         self.proc_pool = proc_pool
         self.workflow_db_mgr = workflow_db_mgr
         self.task_events_mgr = task_events_mgr
         self.data_store_mgr = data_store_mgr
-        self.job_file_writer = JobFileWriter()
+        self.batch_syntax_checks = batch_syntax_checks
+        self.job_file_writer = JobFileWriter(
+            cache_syntax_checks=cache_syntax_checks)
         self.job_runner_mgr = self.job_file_writer.job_runner_mgr
         self.bad_hosts = bad_hosts
         self.bad_hosts_to_clear = set()
@@ -221,6 +224,21 @@ class TaskJobManager:
                 self._poll_task_jobs_callback_255
             )
 
+    def discard_job_prep(self, workflow, itask):
+        """Forget the job preparation of a task which has left the pool.
+
+        E.g. the pending syntax check of its job file.
+
+        """
+        self.job_file_writer.discard_syntax_check(
+            get_task_job_job_log(
+                workflow,
+                itask.point,
+                itask.tdef.name,
+                itask.submit_num,
+            )
+        )
+
     def prep_submit_task_jobs(self, workflow, itasks, check_syntax=True):
         """Prepare task jobs for submit.
 
@@ -245,6 +263,15 @@ class TaskJobManager:
                 prepared_tasks.append(itask)
             elif prep_task is False:
                 bad_tasks.append(itask)
+        # Check the syntax of the job files written above (if deferred)
+        syntax_check = self.job_file_writer.get_syntax_check_ctx()
+        if syntax_check:
+            ctx, job_files = syntax_check
+            self.proc_pool.put_command(
+                ctx,
+                callback=self.job_file_writer.syntax_check_callback,
+                callback_args=[job_files]
+            )
         return [prepared_tasks, bad_tasks]
 
     def submit_task_jobs(self, workflow, itasks, curve_auth,
@@ -1082,15 +1109,33 @@ class TaskJobManager:
         if itask.local_job_file_path:
             return itask
 
+        local_job_file_path = get_task_job_job_log(
+            workflow,
+            itask.point,
+            itask.tdef.name,
+            itask.submit_num,
+        )
+        if local_job_file_path in self.job_file_writer.syntax_checks:
+            # Job file written, syntax check launched
+            result = self.job_file_writer.syntax_checks[local_job_file_path]
+            if result is None:
+                return  # syntax check not yet complete
+            del self.job_file_writer.syntax_checks[local_job_file_path]
+            if isinstance(result, Exception):
+                itask.waiting_on_job_prep = False
+                self._prep_submit_task_job_error(
+                    workflow, itask, '(prepare job file)', result)
+                return False
+            itask.local_job_file_path = local_job_file_path
+            return itask
+
         # Handle broadcasts
         overrides = self.task_events_mgr.broadcast_mgr.get_broadcast(
             itask.tokens
         )
-        if overrides:
-            rtconfig = pdeepcopy(itask.tdef.rtconfig)
-            poverride(rtconfig, overrides, prepend=True)
-        else:
-            rtconfig = itask.tdef.rtconfig
+        # (copy-on-write, sections which are not overridden are shared with
+        # the task definition)
+        rtconfig = poverlay(itask.tdef.rtconfig, overrides, prepend=True)
 
         # BACK COMPAT: host logic
         # Determine task host or platform now, just before job submission,
@@ -1159,6 +1204,9 @@ class TaskJobManager:
                     f"[{itask}] host = "
                     f"{rtconfig['remote']['host']} evaluated as {host_n}"
                 )
+                if rtconfig is not itask.tdef.rtconfig:
+                    # don't write through to the shared task definition
+                    rtconfig['remote'] = pshallowcopy(rtconfig['remote'])
                 rtconfig['remote']['host'] = host_n
 
             try:
@@ -1188,17 +1236,18 @@ class TaskJobManager:
             }
             itask.jobs.append(job_conf)
 
-            local_job_file_path = get_task_job_job_log(
-                workflow,
-                itask.point,
-                itask.tdef.name,
-                itask.submit_num,
-            )
-            self.job_file_writer.write(
-                local_job_file_path,
-                job_conf,
-                check_syntax=check_syntax,
-            )
+            if check_syntax and self.batch_syntax_checks:
+                if not self.job_file_writer.write_deferred(
+                    local_job_file_path,
+                    job_conf,
+                ):
+                    return  # syntax check pending
+            else:
+                self.job_file_writer.write(
+                    local_job_file_path,
+                    job_conf,
+                    check_syntax=check_syntax,
+                )
         except Exception as exc:
             # Could be a bad command template, IOError, etc
             itask.waiting_on_job_prep = False
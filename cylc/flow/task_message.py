@@ -24,9 +24,9 @@ Send messages to:
 from logging import getLevelName, WARNING, ERROR, CRITICAL
 import os
 import sys
-from typing import List
+from typing import List, Tuple
 
-from cylc.flow.exceptions import WorkflowStopped
+from cylc.flow.exceptions import ClientError, ClientTimeout, WorkflowStopped
 import cylc.flow.flags
 from cylc.flow.pathutil import get_workflow_run_job_dir
 from cylc.flow.network.client_factory import (
@@ -68,6 +68,61 @@ mutation (
 }
 '''
 
+# Maximum number of jobs whose messages are sent in a single request.
+MAX_BATCH_SIZE = 100
+
+
+def batch_mutation(size: int) -> str:
+    """Return a mutation which records the messages of several jobs.
+
+    The mutation contains one (aliased) "message" field per job so the
+    messages of all of the jobs are processed in a single request.
+
+    Examples:
+        >>> print(batch_mutation(2))
+        mutation (
+          $wFlows: [WorkflowID]!,
+          $taskJob0: String!, $eventTime0: String, $messages0: [[String]],
+          $taskJob1: String!, $eventTime1: String, $messages1: [[String]]
+        ) {
+          m0: message (
+            workflows: $wFlows,
+            taskJob: $taskJob0,
+            eventTime: $eventTime0,
+            messages: $messages0
+          ) {
+            result
+          }
+          m1: message (
+            workflows: $wFlows,
+            taskJob: $taskJob1,
+            eventTime: $eventTime1,
+            messages: $messages1
+          ) {
+            result
+          }
+        }
+
+    """
+    args = ',\n'.join(
+        f'  $taskJob{ind}: String!, $eventTime{ind}: String,'
+        f' $messages{ind}: [[String]]'
+        for ind in range(size)
+    )
+    fields = ''.join(
+        f'''  m{ind}: message (
+    workflows: $wFlows,
+    taskJob: $taskJob{ind},
+    eventTime: $eventTime{ind},
+    messages: $messages{ind}
+  ) {{
+    result
+  }}
+'''
+        for ind in range(size)
+    )
+    return f'mutation (\n  $wFlows: [WorkflowID]!,\n{args}\n) {{\n{fields}}}'
+
 
 def record_messages(workflow: str, job_id: str, messages: List[list]) -> None:
     """Record task job messages.
@@ -89,6 +144,33 @@ def record_messages(workflow: str, job_id: str, messages: List[list]) -> None:
         send_messages(workflow, job_id, messages, event_time)
 
 
+def record_messages_batch(
+    workflow: str, job_messages: List[Tuple[str, List[list]]]
+) -> None:
+    """Record the messages of several jobs, e.g. relayed by one process.
+
+    Write the messages in the job status file of each job.
+    Send the messages to the workflow in batches, if possible.
+
+    Arguments:
+        workflow: Workflow name.
+        job_messages: List in the form "[(job_id, messages), ...]".
+    """
+    event_time = get_current_time_string(
+        override_use_utc=(os.getenv('CYLC_UTC') == 'True'))
+    for job_id, messages in job_messages:
+        _append_job_status_file(
+            workflow, job_id, event_time, messages, relayed=True)
+    if get_comms_method() != CommsMeth.POLL:
+        send_messages_batch(
+            workflow,
+            [
+                (job_id, event_time, messages)
+                for job_id, messages in job_messages
+            ],
+        )
+
+
 def write_messages(workflow, job_id, messages, event_time):
     # Print to stdout/stderr
     for severity, message in messages:
@@ -103,6 +185,23 @@ def write_messages(workflow, job_id, messages, event_time):
 
 
 def send_messages(workflow, job_id, messages, event_time):
+    send_messages_batch(workflow, [(job_id, event_time, messages)])
+
+
+def send_messages_batch(
+    workflow: str,
+    batch: List[Tuple[str, str, List[list]]],
+) -> None:
+    """Send the messages of several jobs to the workflow.
+
+    The messages are sent over a single connection in requests of up to
+    MAX_BATCH_SIZE jobs each. If a request fails the remaining requests are
+    still sent, then the first error is raised.
+
+    Arguments:
+        workflow: Workflow name.
+        batch: List in the form "[(job_id, event_time, messages), ...]".
+    """
     workflow = os.path.normpath(workflow)
     try:
         pclient = get_client(workflow)
@@ -118,21 +217,50 @@ def send_messages(workflow, job_id, messages, event_time):
             import traceback
             traceback.print_exc()
     else:
-        mutation_kwargs = {
-            'request_string': MUTATION,
-            'variables': {
-                'wFlows': [workflow],
-                'taskJob': job_id,
-                'eventTime': event_time,
-                'messages': messages,
-            }
-        }
-        pclient('graphql', mutation_kwargs)
+        errors: List[Exception] = []
+        for start in range(0, len(batch), MAX_BATCH_SIZE):
+            chunk = batch[start:start + MAX_BATCH_SIZE]
+            if len(chunk) == 1:
+                ((job_id, event_time, messages),) = chunk
+                mutation_kwargs = {
+                    'request_string': MUTATION,
+                    'variables': {
+                        'wFlows': [workflow],
+                        'taskJob': job_id,
+                        'eventTime': event_time,
+                        'messages': messages,
+                    }
+                }
+            else:
+                variables: dict = {'wFlows': [workflow]}
+                for ind, (job_id, event_time, messages) in enumerate(chunk):
+                    variables[f'taskJob{ind}'] = job_id
+                    variables[f'eventTime{ind}'] = event_time
+                    variables[f'messages{ind}'] = messages
+                mutation_kwargs = {
+                    'request_string': batch_mutation(len(chunk)),
+                    'variables': variables,
+                }
+            try:
+                pclient('graphql', mutation_kwargs)
+            except WorkflowStopped as exc:
+                # no point trying the rest
+                errors.append(exc)
+                break
+            except (ClientError, ClientTimeout) as exc:
+                errors.append(exc)
+        if errors:
+            raise errors[0]
+
 
+def _append_job_status_file(
+    workflow, job_id, event_time, messages, relayed=False
+):
+    """Write messages to job status file.
 
-def _append_job_status_file(workflow, job_id, event_time, messages):
-    """Write messages to job status file."""
-    job_log_name = os.getenv('CYLC_TASK_LOG_ROOT')
+    If relayed, the messages are not being recorded by the job itself.
+    """
+    job_log_name = None if relayed else os.getenv('CYLC_TASK_LOG_ROOT')
     if not job_log_name:
         job_log_name = get_workflow_run_job_dir(workflow, job_id, 'job')
     try:
@@ -146,7 +274,7 @@ def _append_job_status_file(workflow, job_id, event_time, messages):
     for severity, message in messages:
         if message == TASK_OUTPUT_STARTED:
             job_id = os.getppid()
-            if job_id > 1:
+            if job_id > 1 and not relayed:
                 # If os.getppid() returns 1, the original job process
                 # is likely killed already
                 job_status_file.write('%s=%s\n' % (CYLC_JOB_PID, job_id))
@@ -21,7 +21,7 @@ from collections import Counter
 import json
 from time import time
 from typing import (
-    Dict, Iterable, List, Optional,
+    Callable, Dict, Iterable, List, Optional,
     Set, TYPE_CHECKING, Tuple
 )
 import logging
@@ -67,6 +67,7 @@ from cylc.flow.flow_mgr import FLOW_ALL, FLOW_NONE, FLOW_NEW
 
 if TYPE_CHECKING:
     from queue import Queue
+    from cylc.flow.async_util import Wakeup
     from cylc.flow.config import WorkflowConfig
     from cylc.flow.cycling import IntervalBase, PointBase
     from cylc.flow.data_store_mgr import DataStoreMgr
@@ -76,6 +77,65 @@ if TYPE_CHECKING:
     from cylc.flow.flow_mgr import FlowMgr, FlowNums
 
 Pool = Dict['PointBase', Dict[str, TaskProxy]]
+# Index of task proxies in both pools by name then cycle point.
+NameIndex = Dict[str, Dict['PointBase', TaskProxy]]
+
+
+class StatusIndex:
+    """Index of the task proxies in the main pool by status.
+
+    The tasks update the index when their state changes (see
+    TaskProxy.state_reset) so tasks can be looked up by status, or by the
+    "waiting_on_job_prep" and "is_updated" flags, without scanning the pool.
+
+    The index is insertion ordered (dicts are used as ordered sets).
+
+    """
+
+    def __init__(self) -> None:
+        self.by_status: Dict[str, Dict[TaskProxy, None]] = {}
+        self.waiting_on_job_prep: Dict[TaskProxy, None] = {}
+        self.updated: Dict[TaskProxy, None] = {}
+        # The status each task is currently indexed under.
+        self._statuses: Dict[TaskProxy, str] = {}
+
+    def add(self, itask: TaskProxy) -> None:
+        """Add a task to the index."""
+        itask.status_index = self
+        self.update(itask)
+
+    def remove(self, itask: TaskProxy) -> None:
+        """Remove a task from the index."""
+        if itask.status_index is self:
+            itask.status_index = None
+        status = self._statuses.pop(itask, None)
+        if status is not None:
+            self.by_status[status].pop(itask, None)
+        self.waiting_on_job_prep.pop(itask, None)
+        self.updated.pop(itask, None)
+
+    def update(self, itask: TaskProxy) -> None:
+        """Re-index a task after a change of state."""
+        status = itask.state.status
+        old_status = self._statuses.get(itask)
+        if status != old_status:
+            if old_status is not None:
+                self.by_status[old_status].pop(itask, None)
+            self.by_status.setdefault(status, {})[itask] = None
+            self._statuses[itask] = status
+        if itask.waiting_on_job_prep:
+            self.waiting_on_job_prep[itask] = None
+        else:
+            self.waiting_on_job_prep.pop(itask, None)
+        if itask.state.is_updated:
+            self.updated[itask] = None
+
+    def get_tasks(self, *statuses: str) -> List[TaskProxy]:
+        """Return the tasks in any of the given statuses."""
+        itasks: List[TaskProxy] = []
+        for status in statuses:
+            itasks.extend(self.by_status.get(status, ()))
+        return itasks
 
 
 class TaskPool:
@@ -92,7 +152,9 @@ class TaskPool:
         workflow_db_mgr: 'WorkflowDatabaseManager',
         task_events_mgr: 'TaskEventsManager',
         data_store_mgr: 'DataStoreMgr',
-        flow_mgr: 'FlowMgr'
+        flow_mgr: 'FlowMgr',
+        wakeup: 'Optional[Wakeup]' = None,
+        discard_job_prep: 'Optional[Callable[[TaskProxy], None]]' = None,
     ) -> None:
         self.tokens = tokens
         self.config: 'WorkflowConfig' = config
@@ -103,6 +165,11 @@ class TaskPool:
         self.task_events_mgr.spawn_func = self.spawn_on_output
         self.data_store_mgr: 'DataStoreMgr' = data_store_mgr
         self.flow_mgr: 'FlowMgr' = flow_mgr
+        # set when tasks are queued or released from runahead limiting (to
+        # wake the main loop)
+        self.wakeup = wakeup
+        # called for tasks which leave the pool whilst waiting on job prep
+        self.discard_job_prep = discard_job_prep
 
         self.do_reload = False
         self.max_future_offset: Optional['IntervalBase'] = None
@@ -116,6 +183,8 @@ class TaskPool:
         self._hidden_pool_list: List[TaskProxy] = []
         self.main_pool_changed = False
         self.hidden_pool_changed = False
+        self.tasks_by_name: NameIndex = {}
+        self.tasks_by_status = StatusIndex()
 
         self.hold_point: Optional['PointBase'] = None
         self.abs_outputs_done: Set[Tuple[str, str, str]] = set()
@@ -164,8 +233,15 @@ class TaskPool:
             self.hidden_pool[itask.point][itask.identity] = itask
             self.hidden_pool_changed = True
         elif itask.identity in self.main_pool.get(itask.point, set()):
+            self.tasks_by_status.remove(
+                self.main_pool[itask.point][itask.identity]
+            )
             self.main_pool[itask.point][itask.identity] = itask
             self.main_pool_changed = True
+            self.tasks_by_status.add(itask)
+        else:
+            return
+        self.tasks_by_name[itask.tdef.name][itask.point] = itask
 
     def load_from_point(self):
         """Load the task pool for the workflow start point.
@@ -207,6 +283,7 @@ class TaskPool:
         If the task already exists in the hidden pool and is satisfied, move it
         to the main pool.
         """
+        self.tasks_by_name.setdefault(itask.tdef.name, {})[itask.point] = itask
         if itask.is_task_prereqs_not_done() and not itask.is_manual_submit:
             # Add to hidden pool if not satisfied.
             self.hidden_pool.setdefault(itask.point, {})
@@ -227,6 +304,7 @@ class TaskPool:
             self.main_pool.setdefault(itask.point, {})
             self.main_pool[itask.point][itask.identity] = itask
             self.main_pool_changed = True
+            self.tasks_by_status.add(itask)
             LOG.debug(f"[{itask}] added to main task pool")
 
             self.create_data_store_elements(itask)
@@ -283,6 +361,8 @@ class TaskPool:
             )
             released = True
 
+        if released and self.wakeup is not None:
+            self.wakeup.set()
         return released
 
     def compute_runahead(self, force=False) -> bool:
@@ -633,11 +713,7 @@ class TaskPool:
         self, point: 'PointBase', name: str, flow_nums: 'FlowNums'
     ) -> Optional[TaskProxy]:
         """Return new or existing task point/name with merged flow_nums"""
-        taskid = Tokens(cycle=str(point), task=name).relative_id
-        ntask = (
-            self._get_hidden_task_by_id(taskid)
-            or self._get_main_task_by_id(taskid)
-        )
+        ntask = self.get_task(point, name)
         if ntask is None:
             # ntask does not exist: spawn it in the flow.
             ntask = self.spawn_task(name, point, flow_nums)
@@ -687,6 +763,7 @@ class TaskPool:
             self.hidden_pool_changed = True
             if not self.hidden_pool[itask.point]:
                 del self.hidden_pool[itask.point]
+            self._remove_from_name_index(itask)
             LOG.debug(f"[{itask}] {msg}")
             return
 
@@ -696,6 +773,10 @@ class TaskPool:
             pass
         else:
             self.main_pool_changed = True
+            self._remove_from_name_index(itask)
+            self.tasks_by_status.remove(itask)
+            if itask.waiting_on_job_prep and self.discard_job_prep:
+                self.discard_job_prep(itask)
             if not self.main_pool[itask.point]:
                 del self.main_pool[itask.point]
                 self.task_queue_mgr.remove_task(itask)
@@ -711,6 +792,15 @@ class TaskPool:
             LOG.debug(f"[{itask}] {msg}")
             del itask
 
+    def _remove_from_name_index(self, itask: TaskProxy) -> None:
+        """Remove a task from the by-name index."""
+        points = self.tasks_by_name.get(itask.tdef.name)
+        if points is None:
+            return
+        points.pop(itask.point, None)
+        if not points:
+            del self.tasks_by_name[itask.tdef.name]
+
     def get_all_tasks(self) -> List[TaskProxy]:
         """Return a list of all task proxies."""
         return self.get_hidden_tasks() + self.get_tasks()
@@ -726,6 +816,28 @@ class TaskPool:
                     self._main_pool_list.append(itask)
         return self._main_pool_list
 
+    def get_tasks_by_status(self, *statuses: str) -> List[TaskProxy]:
+        """Return the task proxies in the main pool with the given statuses.
+
+        Uses the status index, so this takes time proportional to the number
+        of tasks returned rather than the size of the pool.
+        """
+        return self.tasks_by_status.get_tasks(*statuses)
+
+    def get_updated_tasks(self) -> List[TaskProxy]:
+        """Return main pool task proxies updated since the last call.
+
+        Resets the "is_updated" flag of the returned tasks.
+        """
+        itasks = [
+            itask for itask in self.tasks_by_status.updated
+            if itask.state.is_updated
+        ]
+        for itask in itasks:
+            itask.state.is_updated = False
+        self.tasks_by_status.updated.clear()
+        return itasks
+
     def get_hidden_tasks(self) -> List[TaskProxy]:
         """Return a list of task proxies in the hidden pool."""
         # Cached list only for use internally in this method.
@@ -749,26 +861,24 @@ class TaskPool:
 
         return point_itasks
 
-    def get_task(self, point, name):
-        """Retrieve a task from the pool."""
-        rel_id = f'{point}/{name}'
-        for pool in (self.main_pool, self.hidden_pool):
-            tasks = pool.get(point)
-            if tasks and rel_id in tasks:
-                return tasks[rel_id]
-
-    def _get_hidden_task_by_id(self, id_: str) -> Optional[TaskProxy]:
-        """Return runahead pool task by ID if it exists, or None."""
-        for itask_ids in list(self.hidden_pool.values()):
-            with suppress(KeyError):
-                return itask_ids[id_]
+    def get_task(self, point, name) -> Optional[TaskProxy]:
+        """Retrieve a task from the pool (main or hidden)."""
+        with suppress(KeyError):
+            return self.tasks_by_name[name][point]
         return None
 
+    def get_tasks_by_name(self, name: str) -> List[TaskProxy]:
+        """Return all instances of a task in the pool (main or hidden)."""
+        return list(self.tasks_by_name.get(name, {}).values())
+
     def _get_main_task_by_id(self, id_: str) -> Optional[TaskProxy]:
         """Return main pool task by ID if it exists, or None."""
-        for itask_ids in list(self.main_pool.values()):
-            with suppress(KeyError):
-                return itask_ids[id_]
+        name = id_.rsplit('/', 1)[-1]
+        for itask in self.tasks_by_name.get(name, {}).values():
+            if itask.identity == id_:
+                if id_ in self.main_pool.get(itask.point, {}):
+                    return itask
+                break
         return None
 
     def queue_task(self, itask: TaskProxy) -> None:
@@ -776,6 +886,8 @@ class TaskPool:
         if itask.state_reset(is_queued=True):
             self.data_store_mgr.delta_task_queued(itask)
             self.task_queue_mgr.push_task(itask)
+            if self.wakeup is not None:
+                self.wakeup.set()
 
     def release_queued_tasks(self):
         """Return list of queue-released tasks awaiting job prep.
@@ -793,24 +905,20 @@ class TaskPool:
 
         # tasks which have entered the submission pipeline but have not yet
         # entered the PREPARING state
-        pre_prep_tasks = []
-
-        for itask in self.get_tasks():
-            # populate active_task_counter and pre_prep_tasks together to
-            # avoid iterating the task pool twice
-            if itask.waiting_on_job_prep:
-                # a task which has entered the submission pipeline
-                # for the purposes of queue limiting this should be treated
-                # the same as an active task
-                active_task_counter.update([itask.tdef.name])
-                pre_prep_tasks.append(itask)
-            elif itask.state(
-                TASK_STATUS_PREPARING,
-                TASK_STATUS_SUBMITTED,
-                TASK_STATUS_RUNNING,
-            ):
+        # (for the purposes of queue limiting these should be treated the
+        # same as active tasks)
+        pre_prep_tasks = list(self.tasks_by_status.waiting_on_job_prep)
+        active_task_counter.update(itask.tdef.name for itask in pre_prep_tasks)
+
+        # (use the status index to avoid iterating the task pool)
+        for itask in self.get_tasks_by_status(
+            TASK_STATUS_PREPARING,
+            TASK_STATUS_SUBMITTED,
+            TASK_STATUS_RUNNING,
+        ):
+            if not itask.waiting_on_job_prep:
                 # an active task
-                active_task_counter.update([itask.tdef.name])
+                active_task_counter[itask.tdef.name] += 1
 
         # release queued tasks
         released = self.task_queue_mgr.release_tasks(active_task_counter)
@@ -1224,14 +1332,7 @@ class TaskPool:
                     str(itask.point), itask.tdef.name, output)
                 self.workflow_db_mgr.process_queued_ops()
 
-            c_taskid = Tokens(
-                cycle=str(c_point),
-                task=c_name,
-            ).relative_id
-            c_task = (
-                self._get_hidden_task_by_id(c_taskid)
-                or self._get_main_task_by_id(c_taskid)
-            )
+            c_task = self.get_task(c_point, c_name)
             if c_task is not None and c_task != itask:
                 # (Avoid self-suicide: A => !A)
                 self.merge_flows(c_task, itask.flow_nums)
@@ -1248,10 +1349,8 @@ class TaskPool:
             if c_task is not None:
                 # Have child task, update its prerequisites.
                 if is_abs:
-                    tasks, *_ = self.filter_task_proxies(
-                        [f'*/{c_name}'],
-                        warn=False,
-                    )
+                    # All instances of the child in the pool.
+                    tasks = self.get_tasks_by_name(c_name)
                     if c_task not in tasks:
                         tasks.append(c_task)
                 else:
@@ -1355,14 +1454,7 @@ class TaskPool:
                 continue
 
             for c_name, c_point, _ in children:
-                c_taskid = Tokens(
-                    cycle=str(c_point),
-                    task=c_name,
-                ).relative_id
-                c_task = (
-                    self._get_hidden_task_by_id(c_taskid)
-                    or self._get_main_task_by_id(c_taskid)
-                )
+                c_task = self.get_task(c_point, c_name)
                 if c_task is not None:
                     # already spawned
                     continue
@@ -1802,6 +1894,7 @@ class TaskPool:
             [self.main_pool, self.hidden_pool],
             ids,
             warn=warn,
+            tasks_by_name=self.tasks_by_name,
         )
         future_matched: 'Set[Tuple[str, PointBase]]' = set()
         if future and unmatched:
@@ -41,6 +41,7 @@ from cylc.flow.cycling.iso8601 import (
 if TYPE_CHECKING:
     from cylc.flow.cycling import PointBase
     from cylc.flow.task_action_timer import TaskActionTimer
+    from cylc.flow.task_pool import StatusIndex
     from cylc.flow.taskdef import TaskDef
 
 
@@ -139,6 +140,9 @@ class TaskProxy:
         .waiting_on_job_prep:
             True whilst task is awaiting job prep, reset to False once the
             preparation has completed.
+        .status_index:
+            The task pool status index this task belongs to (if any), updated
+            when the task changes state.
 
     Args:
         tdef: The definition object of this task.
@@ -179,7 +183,8 @@ class TaskProxy:
         'timeout',
         'tokens',
         'try_timers',
-        'waiting_on_job_prep',
+        'status_index',
+        '_waiting_on_job_prep',
     ]
 
     def __init__(
@@ -251,7 +256,8 @@ class TaskProxy:
         self.expire_time: Optional[float] = None
         self.late_time: Optional[float] = None
         self.is_late = is_late
-        self.waiting_on_job_prep = False
+        self.status_index: Optional['StatusIndex'] = None
+        self._waiting_on_job_prep = False
 
         self.state = TaskState(tdef, self.point, status, is_held)
 
@@ -261,6 +267,17 @@ class TaskProxy:
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__} '{self.tokens}'>"
 
+    @property
+    def waiting_on_job_prep(self) -> bool:
+        """Has this task been released but not yet entered job prep?"""
+        return self._waiting_on_job_prep
+
+    @waiting_on_job_prep.setter
+    def waiting_on_job_prep(self, value: bool) -> None:
+        self._waiting_on_job_prep = value
+        if self.status_index is not None:
+            self.status_index.update(self)
+
     def __str__(self) -> str:
         """Stringify with tokens, state, submit_num, and flow_nums."""
         return (
@@ -442,6 +459,8 @@ class TaskProxy:
         """Set new state and log the change. Return whether it changed."""
         before = str(self)
         if self.state.reset(status, is_held, is_queued, is_runahead):
+            if self.status_index is not None:
+                self.status_index.update(self)
             if not silent:
                 LOG.info(f"[{before}] => {self.state}")
             return True
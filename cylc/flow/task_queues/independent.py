@@ -16,9 +16,9 @@
 
 """Implement independent limited task queues."""
 
-from collections import deque
+from collections import OrderedDict
 from contextlib import suppress
-from typing import List, Set, Dict, Counter, Any
+from typing import List, Optional, Set, Dict, Counter, Any
 
 from cylc.flow.task_proxy import TaskProxy
 from cylc.flow.task_queues import TaskQueueManagerBase
@@ -31,42 +31,52 @@ class LimitedTaskQueue:
         """Initialize limiter for active tasks."""
         self.limit = limit  # max active tasks
         self.members = members  # member task names
-        self.deque: deque = deque()
+        # Queued tasks in the order they were pushed (the values are unused).
+        # Unlike a deque, a task can be removed from anywhere in constant time.
+        self.tasks: 'OrderedDict[TaskProxy, None]' = OrderedDict()
 
     def push_task(self, itask: TaskProxy) -> None:
         """Queue task if in my membership list."""
         if itask.tdef.name in self.members:
-            self.deque.appendleft(itask)
+            self.tasks[itask] = None
 
-    def release(self, active: Counter[str]) -> List[TaskProxy]:
-        """Release tasks if below the active limit."""
-        # The "active" argument counts active tasks by name.
+    def release(
+        self,
+        active: Counter[str],
+        n_active: Optional[int] = None
+    ) -> List[TaskProxy]:
+        """Release tasks if below the active limit.
+
+        Args:
+            active:
+                Counts active tasks by name, updated with released tasks.
+            n_active:
+                The number of active tasks in my membership list, if known.
+
+        """
         released: List[TaskProxy] = []
-        held: List[TaskProxy] = []
-        n_active: int = 0
-        for mem in self.members:
-            n_active += active[mem]
-        while not self.limit or n_active < self.limit:
-            try:
-                itask = self.deque.pop()
-            except IndexError:
-                # deque empty
+        if not self.tasks:
+            return released
+        if n_active is None:
+            n_active = sum(active[mem] for mem in self.members)
+        for itask in self.tasks:
+            if self.limit and n_active >= self.limit:
                 break
             if itask.state.is_held:
-                held.append(itask)
-            else:
-                released.append(itask)
-                n_active += 1
-                active.update({itask.tdef.name: 1})
-        for itask in held:
-            self.deque.appendleft(itask)
+                # held tasks keep their place in the queue
+                continue
+            released.append(itask)
+            n_active += 1
+            active[itask.tdef.name] += 1
+        for itask in released:
+            del self.tasks[itask]
         return released
 
     def remove(self, itask: TaskProxy) -> bool:
         """Remove a single task from queue, return True if removed."""
         try:
-            self.deque.remove(itask)
-        except ValueError:
+            del self.tasks[itask]
+        except KeyError:
             # not a member
             return False
         return True
@@ -106,23 +116,36 @@ class IndepQueueManager(TaskQueueManagerBase):
 
         # Make the queues independent.
         queues = self._make_indep(queues)
+
+        # Map of queues by member task name.
+        self.task_queues: Dict[str, LimitedTaskQueue] = {}
+
         for name, config in queues.items():
-            self.queues[name] = LimitedTaskQueue(
-                config["limit"], config["members"]
-            )
+            queue = LimitedTaskQueue(config["limit"], config["members"])
+            self.queues[name] = queue
+            for member in queue.members:
+                self.task_queues[member] = queue
 
         self.force_released: Set[TaskProxy] = set()
 
     def push_task(self, itask: TaskProxy) -> None:
         """Push a task to the appropriate queue."""
-        for queue in self.queues.values():
-            queue.push_task(itask)
+        with suppress(KeyError):
+            self.task_queues[itask.tdef.name].push_task(itask)
 
     def release_tasks(self, active: Counter[str]) -> List[TaskProxy]:
         """Release tasks up to the queue limits."""
         released: List[TaskProxy] = []
+        # count active tasks by queue (iterating the active task names rather
+        # than the queue memberships)
+        n_active: Dict[LimitedTaskQueue, int] = dict.fromkeys(
+            self.queues.values(), 0)
+        for name, count in active.items():
+            with suppress(KeyError):
+                n_active[self.task_queues[name]] += count
         for queue in self.queues.values():
-            released += queue.release(active)
+            if queue.tasks:
+                released += queue.release(active, n_active[queue])
         if self.force_released:
             released += list(self.force_released)
             self.force_released = set()
@@ -130,9 +153,8 @@ class IndepQueueManager(TaskQueueManagerBase):
 
     def remove_task(self, itask: TaskProxy) -> None:
         """Remove a task from whichever queue it belongs to."""
-        for queue in self.queues.values():
-            if queue.remove(itask):
-                break
+        with suppress(KeyError):
+            self.task_queues[itask.tdef.name].remove(itask)
 
     def force_release_task(self, itask: TaskProxy) -> None:
         """Remove a task from whichever queue it belongs to.
@@ -144,7 +166,10 @@ class IndepQueueManager(TaskQueueManagerBase):
 
     def adopt_tasks(self, orphans: List[str]) -> None:
         """Adopt orphaned tasks to the default group."""
-        self.queues[self.Q_DEFAULT].adopt(orphans)
+        queue = self.queues[self.Q_DEFAULT]
+        queue.adopt(orphans)
+        for orphan in orphans:
+            self.task_queues[orphan] = queue
 
     def _make_indep(self, in_queues: dict) -> dict:
         """Make queues independent: each task can belong to one queue only.
@@ -491,7 +491,6 @@ class TaskState:
                 cpre = Prerequisite(point, tdef.start_point)
                 cpre.add(tdef.name, p_prev, TASK_STATUS_SUCCEEDED,
                          p_prev < tdef.start_point)
-                cpre.set_condition(tdef.name)
                 self.prerequisites.append(cpre)
 
     def add_xtrigger(self, label, satisfied=False):
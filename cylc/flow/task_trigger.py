@@ -16,7 +16,7 @@
 
 from cylc.flow.cycling.loader import (
     get_point, get_point_relative, get_interval)
-from cylc.flow.prerequisite import Prerequisite
+from cylc.flow.prerequisite import ConditionalExpression, Prerequisite
 from cylc.flow.task_outputs import (
     TASK_OUTPUT_EXPIRED, TASK_OUTPUT_SUBMITTED, TASK_OUTPUT_SUBMIT_FAILED,
     TASK_OUTPUT_STARTED, TASK_OUTPUT_SUCCEEDED, TASK_OUTPUT_FAILED,
@@ -179,12 +179,15 @@ class Dependency:
 
     """
 
-    __slots__ = ['_exp', 'task_triggers', 'suicide']
+    __slots__ = ['_exp', 'task_triggers', 'suicide', '_conditions']
 
     def __init__(self, exp, task_triggers, suicide):
         self._exp = exp
         self.task_triggers = tuple(task_triggers)  # More memory efficient.
         self.suicide = suicide
+        # Compiled conditional expressions, by the positions of the task
+        # triggers' messages in the prerequisite (see get_condition).
+        self._conditions = {}
 
     def get_prerequisite(self, point, tdef):
         """Generate a Prerequisite object from this dependency.
@@ -203,7 +206,12 @@ class Dependency:
         cpre = Prerequisite(point, tdef.start_point)
 
         # Loop over TaskTrigger instances.
+        messages = []
         for task_trigger in self.task_triggers:
+            trigger_point = task_trigger.get_point(point)
+            messages.append((
+                str(trigger_point), task_trigger.task_name, task_trigger.output
+            ))
             if task_trigger.cycle_point_offset is not None:
                 # Compute trigger cycle point from offset.
                 if task_trigger.offset_is_from_icp:
@@ -222,7 +230,7 @@ class Dependency:
                             prereq_offset)
                 cpre.add(
                     task_trigger.task_name,
-                    task_trigger.get_point(point),
+                    trigger_point,
                     task_trigger.output,
                     (
                         (prereq_offset_point < tdef.start_point) &
@@ -233,11 +241,51 @@ class Dependency:
                 # Trigger is within the same cycle point.
                 # Register task message with Prerequisite object.
                 cpre.add(task_trigger.task_name,
-                         task_trigger.get_point(point),
+                         trigger_point,
                          task_trigger.output)
-        cpre.set_condition(self.get_expression(point))
+        # (Two triggers may resolve to the same message at some points.)
+        positions = {
+            message: ind for ind, message in enumerate(cpre.satisfied)
+        }
+        cpre.set_condition(
+            self.get_condition(
+                tuple(positions[message] for message in messages)
+            )
+        )
         return cpre
 
+    def get_condition(self, slots):
+        """Return the compiled conditional expression for this dependency.
+
+        The expression is compiled once for each arrangement of messages and
+        shared between all prerequisites generated from this dependency.
+
+        Args:
+            slots (tuple): The position of the message of each task trigger
+                (in the order of self.task_triggers) in the prerequisite.
+
+        Returns:
+            cylc.flow.prerequisite.ConditionalExpression: or None if this is
+            not a conditional dependency (i.e. all triggers are required).
+
+        """
+        try:
+            return self._conditions[slots]
+        except KeyError:
+            pass
+        template = self._get_template(
+            self._exp,
+            {
+                id(task_trigger): slot
+                for task_trigger, slot in zip(self.task_triggers, slots)
+            }
+        )
+        condition = None
+        if any(isinstance(item, str) and '|' in item for item in template):
+            condition = ConditionalExpression(template)
+        self._conditions[slots] = condition
+        return condition
+
     def get_expression(self, point):
         """Return the expression as a string.
 
@@ -263,6 +311,20 @@ class Dependency:
                 ret.append('( %s )' % str(item))
         return ' '.join(ret)
 
+    @classmethod
+    def _get_template(cls, nested_expr, slots):
+        """Return a nested list of TaskTrigger objects as a flat list of
+        message positions, operators and parentheses."""
+        ret = []
+        for item in nested_expr:
+            if isinstance(item, TaskTrigger):
+                ret.append(slots[id(item)])
+            elif isinstance(item, list):
+                ret.extend(['('] + cls._get_template(item, slots) + [')'])
+            else:
+                ret.append(item)
+        return ret
+
     @classmethod
     def _stringify_list(cls, nested_expr, point):
         """Stringify a nested list of TaskTrigger objects."""
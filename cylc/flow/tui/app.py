@@ -22,8 +22,10 @@ import urwid
 from urwid import html_fragment
 from urwid.wimp import SelectableIcon
 from pathlib import Path
+import zmq
 
 from cylc.flow.network.client_factory import get_client
+from cylc.flow.network.subscriber import WorkflowSubscriber
 from cylc.flow.exceptions import (
     ClientError,
     ClientTimeout,
@@ -37,7 +39,7 @@ from cylc.flow.task_state import (
     TASK_STATUS_FAILED,
 )
 from cylc.flow.tui.data import (
-    QUERY
+    TuiStore
 )
 import cylc.flow.tui.overlay as overlay
 from cylc.flow.tui import (
@@ -49,7 +51,10 @@ from cylc.flow.tui import (
 )
 from cylc.flow.tui.tree import (
     find_closest_focus,
-    translate_collapsing
+    get_attached_node,
+    rerender_running_tasks,
+    translate_collapsing,
+    update_tree,
 )
 from cylc.flow.tui.util import (
     compute_tree,
@@ -230,6 +235,10 @@ class TuiApp:
     def __init__(self, reg, screen=None):
         self.reg = reg
         self.client = None
+        self.subscriber = None
+        self.store = TuiStore()
+        # the task state filters the tree was last rendered with
+        self.rendered_filter = None
         self.loop = None
         self.screen = None
         self.stack = 0
@@ -288,33 +297,36 @@ class TuiApp:
     def get_snapshot(self):
         """Contact the workflow, return a tree structure
 
+        The first call loads the entire workflow into a local store,
+        subsequent calls update it with the deltas published by the
+        workflow.
+
         In the event of error contacting the workflow the
         message is written to this Widget's header.
 
         Returns:
-            dict if successful, else False
+            dict if successful, None if there have been no changes since
+            the last call, else False
 
         """
         try:
             if not self.client:
                 self.client = get_client(self.reg, timeout=self.CLIENT_TIMEOUT)
-            data = self.client(
-                'graphql',
-                {
-                    'request_string': QUERY,
-                    'variables': {
-                        # list of task states we want to see
-                        'taskStates': [
-                            state
-                            for state, is_on in self.filter_states.items()
-                            if is_on
-                        ]
-                    }
-                }
-            )
+                # subscribe before taking the snapshot so no deltas are missed
+                self.subscriber = WorkflowSubscriber(
+                    self.reg,
+                    context=zmq.Context.instance(),
+                    topics=[b'all', b'shutdown'],
+                )
+                self.store.sync(self.client('pb_entire_workflow'))
+            elif (
+                not self.receive_deltas()
+                and self.rendered_filter == self.filter_states
+            ):
+                return None
         except WorkflowStopped:
             # Distinguish stopped flow from non-existent flow.
-            self.client = None
+            self.disconnect()
             full_path = Path(get_workflow_run_dir(self.reg))
             if (
                 (full_path / WorkflowFiles.SUITE_RC).is_file()
@@ -335,23 +347,53 @@ class TuiApp:
             })
         except (ClientError, ClientTimeout) as exc:
             # catch network / client errors
+            self.disconnect()
             self.set_header([('workflow_error', str(exc))])
             return False
 
-        if isinstance(data, list):
-            # catch GraphQL errors
-            try:
-                message = data[0]['error']['message']
-            except (IndexError, KeyError):
-                message = str(data)
-            self.set_header([('workflow_error', message)])
-            return False
+        self.rendered_filter = dict(self.filter_states)
+        return compute_tree(
+            self.store.get_flow(
+                # list of task states we want to see
+                state
+                for state, is_on in self.filter_states.items()
+                if is_on
+            )
+        )
+
+    def receive_deltas(self):
+        """Apply any deltas published by the workflow to the local store.
+
+        Returns:
+            True if the store has changed.
 
-        if len(data['workflows']) != 1:
-            # multiple workflows in returned data - shouldn't happen
-            raise ValueError()
+        Raises:
+            WorkflowStopped:
+                If the workflow has shut down.
 
-        return compute_tree(data['workflows'][0])
+        """
+        updated = False
+        while True:
+            try:
+                topic, msg = self.subscriber.socket.recv_multipart(
+                    flags=zmq.NOBLOCK
+                )
+            except zmq.Again:
+                # no more messages
+                return updated
+            if topic == b'shutdown':
+                raise WorkflowStopped(self.reg)
+            if not self.store.apply_deltas(msg):
+                # e.g. the workflow has reloaded, take a new snapshot
+                self.store.sync(self.client('pb_entire_workflow'))
+            updated = True
+
+    def disconnect(self):
+        """Close the connection to the workflow."""
+        self.client = None
+        if self.subscriber:
+            self.subscriber.stop(stop_loop=False)
+            self.subscriber = None
 
     @staticmethod
     def get_node_id(node):
@@ -378,16 +420,6 @@ class TuiApp:
         # put in a one line gap
         message.append('\n')
 
-        # TODO: remove once Tui is delta-driven
-        # https://github.com/cylc/cylc-flow/issues/3527
-        message.extend([
-            (
-                'workflow_error',
-                'TUI is experimental and may break with large flows'
-            ),
-            '\n'
-        ])
-
         self.view.header = urwid.Text(message)
 
     def _update(self, *_):
@@ -403,12 +435,30 @@ class TuiApp:
 
         """
         # update the data store
-        # TODO: this can be done incrementally using deltas
-        #       once this interface is available
         snapshot = self.get_snapshot()
         if snapshot is False:
             return False
 
+        if snapshot is not None:
+            self.update_tree(snapshot)
+        elif self.tree_walker and self.store.has_running_tasks():
+            # the data hasn't changed but the progress of running tasks has
+            _, node = self.listbox._body.get_focus()
+            rerender_running_tasks(node.get_root())
+            self.tree_walker._modified()
+
+        # schedule the next run of this update method
+        if self.loop:
+            self.loop.set_alarm_in(self.UPDATE_INTERVAL, self._update)
+
+        return True
+
+    def update_tree(self, snapshot):
+        """Redraw the tree with new data.
+
+        Preserves the current focus and collapse/expand state.
+
+        """
         # update the workflow status message
         header = [get_workflow_status_str(snapshot['data'])]
         status_summary = get_task_status_summary(snapshot['data'])
@@ -418,17 +468,28 @@ class TuiApp:
             header.extend([' ', '*filtered* "R" to reset', ' '])
         self.set_header(header)
 
-        # global update - the nuclear option - slow but simple
-        # TODO: this can be done incrementally by adding and
-        #       removing nodes from the existing tree
+        _, old_node = self.listbox._body.get_focus()
+        topnode = old_node.get_root()
+
+        if self.tree_walker and self.get_node_id(topnode) == snapshot['id_']:
+            # patch the existing tree, only nodes which have been loaded
+            # are updated
+            update_tree(topnode, snapshot)
+
+            # if the focused node has been removed, walk to the nearest
+            # parent
+            focus = get_attached_node(old_node)
+            if focus is not old_node:
+                self.listbox._body.set_focus(focus)
+            self.tree_walker._modified()
+            return
+
+        # global update - used when the workflow changes
         topnode = TuiParentNode(snapshot)
 
-        # NOTE: because we are nuking the tree we need to manually
+        # NOTE: because we are replacing the tree we need to manually
         # preserve the focus and collapse status of tree nodes
 
-        # record the old focus
-        _, old_node = self.listbox._body.get_focus()
-
         # nuke the tree
         self.tree_walker = urwid.TreeWalker(topnode)
         self.listbox._set_body(self.tree_walker)
@@ -443,12 +504,6 @@ class TuiApp:
         #  preserve the collapse/expand status of all nodes
         translate_collapsing(self, old_node, new_node)
 
-        # schedule the next run of this update method
-        if self.loop:
-            self.loop.set_alarm_in(self.UPDATE_INTERVAL, self._update)
-
-        return True
-
     def filter_by_task_state(self, filtered_state=None):
         """Filter tasks.
 
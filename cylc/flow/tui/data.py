@@ -18,7 +18,24 @@ from functools import partial
 from subprocess import Popen, PIPE
 import sys
 
+from cylc.flow.data_messages_pb2 import (  # type: ignore
+    AllDeltas,
+    PbEntireWorkflow,
+    PbWorkflow,
+)
+from cylc.flow.data_store_mgr import (
+    FAMILIES,
+    FAMILY_PROXIES,
+    JOBS,
+    TASKS,
+    TASK_PROXIES,
+    WORKFLOW,
+    apply_delta,
+    element_checksum,
+    generate_checksum,
+)
 from cylc.flow.exceptions import ClientError
+from cylc.flow.task_state import TASK_STATUS_RUNNING
 from cylc.flow.tui.util import (
     extract_context
 )
@@ -82,6 +99,232 @@ QUERY = '''
   }
 '''
 
+# The element types Tui needs from the data store.
+STORE_KEYS = (WORKFLOW, TASKS, TASK_PROXIES, JOBS, FAMILIES, FAMILY_PROXIES)
+
+
+def _get_field(msg, field):
+    """Return a Protobuf message field, or None if not set."""
+    if msg.HasField(field):
+        return getattr(msg, field)
+    return None
+
+
+class TuiStore:
+    """A local copy of the data store of a workflow.
+
+    This is populated from a snapshot of the entire workflow, then kept up to
+    date by applying the deltas the scheduler publishes. The data is then
+    presented in the same form as the response to the GraphQL "QUERY" (above).
+
+    The checksum of each element type is maintained as deltas are applied and
+    compared with the checksum published with the delta, a mismatch (e.g.
+    because a delta was missed) means the store must be re-synced.
+
+    Examples:
+        >>> store = TuiStore()
+        >>> store.sync(PbEntireWorkflow().SerializeToString())
+        >>> store.apply_deltas(AllDeltas().SerializeToString())
+        True
+
+    """
+
+    def __init__(self):
+        self.data = {}
+        # The time of the most recently applied delta for each element type.
+        self.delta_times = {}
+        # The checksum of each element type (see generate_checksum).
+        self.checksums = {}
+
+    def sync(self, pb_data: bytes) -> None:
+        """Load a snapshot of the entire workflow.
+
+        Args:
+            pb_data:
+                A serialised PbEntireWorkflow message
+                (see WorkflowRuntimeServer.pb_entire_workflow).
+
+        """
+        entire_workflow = PbEntireWorkflow()
+        entire_workflow.ParseFromString(pb_data)
+        self.data = {
+            key: {
+                element.id: element
+                for element in getattr(entire_workflow, key)
+            }
+            for key in STORE_KEYS
+            if key != WORKFLOW
+        }
+        self.data[WORKFLOW] = PbWorkflow()
+        self.data[WORKFLOW].CopyFrom(entire_workflow.workflow)
+        self.delta_times = dict.fromkeys(
+            STORE_KEYS,
+            entire_workflow.workflow.last_updated
+        )
+        self.checksums = {
+            key: generate_checksum(
+                element.stamp for element in self.data[key].values()
+            )
+            for key in STORE_KEYS
+            if key != WORKFLOW
+        }
+
+    def apply_deltas(self, pb_data: bytes) -> bool:
+        """Apply a published set of deltas to the store.
+
+        Deltas older than the data in the store are ignored.
+
+        Args:
+            pb_data:
+                A serialised AllDeltas message (the "all" topic).
+
+        Returns:
+            False if the store needs to be re-synced with the workflow (e.g.
+            after a reload or if the checksums don't match), else True.
+
+        """
+        all_deltas = AllDeltas()
+        all_deltas.ParseFromString(pb_data)
+        for field, delta in all_deltas.ListFields():
+            key = field.name
+            if key not in self.delta_times:
+                continue
+            if delta.reloaded:
+                return False
+            if delta.time < self.delta_times[key]:
+                continue
+            if key == WORKFLOW:
+                apply_delta(key, delta, self.data)
+            else:
+                ids = {element.id for element in delta.added}
+                ids.update(element.id for element in delta.updated)
+                ids.update(delta.pruned)
+                self._update_checksum(key, ids)
+                try:
+                    apply_delta(key, delta, self.data)
+                except (KeyError, ValueError):
+                    # the store has fallen out of step with the workflow
+                    return False
+                self._update_checksum(key, ids, applied=True)
+                if (
+                    delta.HasField('checksum')
+                    and delta.checksum != self.checksums[key]
+                ):
+                    # e.g. a delta has been missed
+                    return False
+            self.delta_times[key] = delta.time
+        return True
+
+    def _update_checksum(self, key, ids, applied=False):
+        """Maintain the checksum of an element type through a delta.
+
+        Call before (applied=False) and after (applied=True) applying the
+        delta (see DataStoreMgr.update_checksums).
+
+        """
+        elements = self.data[key]
+        sign = 1 if applied else -1
+        checksum = self.checksums[key]
+        for id_ in ids:
+            element = elements.get(id_)
+            if element is not None:
+                checksum += sign * element_checksum(element.stamp)
+        self.checksums[key] = checksum & 0xffffffff
+
+    def has_running_tasks(self) -> bool:
+        """Return True if any tasks are running."""
+        return bool(
+            self.data
+            and self.data[WORKFLOW].state_totals.get(TASK_STATUS_RUNNING)
+        )
+
+    def get_flow(self, task_states) -> dict:
+        """Return the workflow in the form of the GraphQL "QUERY" response.
+
+        Args:
+            task_states:
+                Collection of the task states to include.
+
+        """
+        workflow = self.data[WORKFLOW]
+        family_proxies = self.data[FAMILY_PROXIES]
+        task_states = set(task_states)
+        flow = {
+            'id': workflow.id,
+            'name': workflow.name,
+            'status': workflow.status,
+            'stateTotals': dict(workflow.state_totals),
+            'taskProxies': [],
+            'familyProxies': [],
+            'cyclePoints': [],
+        }
+        for tproxy in self.data[TASK_PROXIES].values():
+            if tproxy.state not in task_states:
+                continue
+            task = self.data[TASKS].get(tproxy.task)
+            jobs = [
+                self.data[JOBS][job_id]
+                for job_id in tproxy.jobs
+                if job_id in self.data[JOBS]
+            ]
+            jobs.sort(key=lambda job: job.submit_num, reverse=True)
+            flow['taskProxies'].append({
+                **self._get_proxy_fields(tproxy, family_proxies),
+                'name': tproxy.name,
+                'jobs': [
+                    {
+                        'id': job.id,
+                        'submitNum': job.submit_num,
+                        'state': job.state,
+                        'platform': _get_field(job, 'platform'),
+                        'jobRunnerName': _get_field(job, 'job_runner_name'),
+                        'jobId': _get_field(job, 'job_id'),
+                        'startedTime': _get_field(job, 'started_time'),
+                        'finishedTime': _get_field(job, 'finished_time'),
+                    }
+                    for job in jobs
+                ],
+                'task': {
+                    'meanElapsedTime': (
+                        _get_field(task, 'mean_elapsed_time')
+                        if task is not None else None
+                    ),
+                },
+            })
+        for fproxy in family_proxies.values():
+            if fproxy.state not in task_states:
+                continue
+            if fproxy.name == 'root':
+                flow['cyclePoints'].append(
+                    self._get_proxy_fields(fproxy)
+                )
+            else:
+                flow['familyProxies'].append({
+                    **self._get_proxy_fields(fproxy, family_proxies),
+                    'name': fproxy.name,
+                })
+        return flow
+
+    @staticmethod
+    def _get_proxy_fields(proxy, family_proxies=None) -> dict:
+        """Return the fields common to task and family proxies."""
+        fields = {
+            'id': proxy.id,
+            'cyclePoint': proxy.cycle_point,
+            'state': proxy.state,
+            'isHeld': proxy.is_held,
+            'isQueued': proxy.is_queued,
+            'isRunahead': proxy.is_runahead,
+        }
+        if family_proxies is not None:
+            first_parent = family_proxies.get(proxy.first_parent)
+            fields['firstParent'] = (
+                {'id': first_parent.id, 'name': first_parent.name}
+                if first_parent is not None else None
+            )
+        return fields
+
+
 MUTATIONS = {
     'workflow': [
         'pause',
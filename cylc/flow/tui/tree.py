@@ -16,6 +16,10 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """Tree utilities for Tui."""
 
+from contextlib import suppress
+
+from cylc.flow.task_state import TASK_STATUS_RUNNING
+
 
 def find_closest_focus(app, old_node, new_node):
     """Return the position of the old node in the new tree.
@@ -107,3 +111,121 @@ def walk_tree(node):
             node.get_child_node(index)
             for index in node.get_child_keys()
         ])
+
+
+def update_tree(node, value):
+    """Patch a tree with new data in place.
+
+    Only the nodes which have already been loaded (i.e. which the user has
+    seen) are visited, their widgets are re-rendered if their data has
+    changed. The widgets of nodes which are retained keep their
+    collapse/expand state.
+
+    Arguments:
+        node (urwid.ParentNode):
+            The node to patch.
+        value (dict):
+            The new value of the node (as returned by compute_tree).
+
+    """
+    old_value = node.get_value()
+    node._value = value
+
+    # patch the loaded children (child keys are indices into the
+    # children list so must be re-mapped)
+    old_children = {
+        child['id_']: index
+        for index, child in enumerate(old_value['children'])
+    }
+    loaded_children = node._children
+    node._children = {}
+    for index, child in enumerate(value['children']):
+        with suppress(KeyError):
+            child_node = loaded_children[old_children[child['id_']]]
+            child_node.set_key(index)
+            update_tree(child_node, child)
+            node._children[index] = child_node
+    node._child_keys = None
+
+    # re-render the widget if it has been loaded
+    widget = node._widget
+    if widget is not None and (
+        _render_changed(old_value, value)
+        or [child['id_'] for child in old_value['children']]
+        != [child['id_'] for child in value['children']]
+    ):
+        widget.is_leaf = not value['children']
+        widget._innerwidget = None
+        widget._w = widget.get_indented_widget()
+
+
+def rerender_running_tasks(node):
+    """Re-render the widgets of running tasks without changing the tree.
+
+    The icon of a running task shows its progress, so changes with time even
+    if its data doesn't. Only nodes which have already been loaded are
+    visited.
+
+    Arguments:
+        node (urwid.TreeNode):
+            Re-render running tasks at or beneath this node.
+
+    """
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        value = node.get_value()
+        widget = node._widget
+        if (
+            widget is not None
+            and value['type_'] == 'task'
+            and value['data'].get('state') == TASK_STATUS_RUNNING
+        ):
+            widget._innerwidget = None
+            widget._w = widget.get_indented_widget()
+        # (leaf nodes have no children)
+        stack.extend(getattr(node, '_children', {}).values())
+
+
+def _render_changed(old_value, new_value):
+    """Return True if a node may render differently with its new value.
+
+    Running tasks are always re-rendered as their icon shows their progress.
+
+    """
+    if old_value['data'] != new_value['data']:
+        return True
+    if new_value['type_'] == 'task':
+        if new_value['data'].get('state') == TASK_STATUS_RUNNING:
+            return True
+        # tasks display the state of their most recent job
+        old_job = old_value['children'][:1]
+        new_job = new_value['children'][:1]
+        return (
+            [job['data'] for job in old_job]
+            != [job['data'] for job in new_job]
+        )
+    return False
+
+
+def get_attached_node(node):
+    """Return the node, or its closest ancestor which is still in the tree.
+
+    Arguments:
+        node (urwid.TreeNode):
+            A node which may have been removed from the tree by update_tree.
+
+    Returns:
+        urwid.TreeNode
+
+    """
+    ancestors = []
+    while node is not None:
+        ancestors.append(node)
+        node = node.get_parent()
+    attached = ancestors.pop()  # the root node
+    for node in reversed(ancestors):
+        if attached._children.get(node.get_key()) is not node:
+            break
+        attached = node
+    return attached
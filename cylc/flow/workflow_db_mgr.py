@@ -23,14 +23,18 @@ This module provides the logic to:
 * Manage existing run database files on restart.
 """
 
+from contextlib import closing, suppress
 import json
 import os
 from pkg_resources import parse_version
+from queue import Empty, Queue
 from shutil import copy, rmtree
+import sqlite3
 from sqlite3 import OperationalError
 from tempfile import mkstemp
+from threading import Thread
 from typing import (
-    Any, AnyStr, Dict, List, Set, TYPE_CHECKING, Tuple, Union
+    Any, AnyStr, Dict, List, Optional, Set, TYPE_CHECKING, Tuple, Union
 )
 
 from cylc.flow import LOG
@@ -60,6 +64,139 @@ PERM_PRIVATE = 0o600  # -rw-------
 INCOMPAT_MSG = f"Workflow database is incompatible with Cylc {CYLC_VERSION}"
 
 
+SqlQueue = List[Tuple[str, list]]
+
+
+class PublicDatabaseWriter:
+    """Write to the public database in a background thread.
+
+    Batches of statements, which have already been committed to the private
+    database, are applied to the public database in the order they are
+    received (see CylcWorkflowDAO.pop_queued_items).
+
+    If the public database is stuck (e.g. locked by another process) the
+    statements are retried, and after CylcWorkflowDAO.MAX_TRIES attempts
+    the public database is recovered from a snapshot of the private
+    database made using the SQLite online backup API.
+
+    Args:
+        pub_path: Path to the public database.
+        pri_path: Path to the private database.
+
+    """
+
+    # Interval between retries of failed writes.
+    RETRY_INTERVAL = 0.5
+    # Max time to wait for a read lock on the private database when
+    # recovering from it.
+    BACKUP_TIMEOUT = 10
+
+    def __init__(self, pub_path: str, pri_path: str) -> None:
+        self.pub_path = pub_path
+        self.pri_path = pri_path
+        self.queue: 'Queue[Optional[SqlQueue]]' = Queue()
+        self.thread = Thread(
+            target=self._run, name='public-database-writer', daemon=True
+        )
+
+    def start(self) -> None:
+        """Start the writer thread."""
+        self.thread.start()
+
+    def put(self, sql_queue: SqlQueue) -> None:
+        """Queue statements to be written to the public database."""
+        if sql_queue:
+            self.queue.put(sql_queue)
+
+    def stop(self) -> None:
+        """Write out any queued statements and stop the writer thread."""
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+
+    def _run(self) -> None:
+        """The writer thread."""
+        pub_dao = CylcWorkflowDAO(self.pub_path, is_public=True)
+        pending: SqlQueue = []
+        stopping = False
+        while True:
+            try:
+                # Retry failed statements periodically, else wait for more.
+                item = self.queue.get(
+                    timeout=self.RETRY_INTERVAL if pending else None
+                )
+                while True:
+                    if item is None:
+                        stopping = True
+                    else:
+                        pending.extend(item)
+                    item = self.queue.get_nowait()
+            except Empty:
+                pass
+            if pending and (
+                pub_dao.execute_sql_queue(pending)
+                or (
+                    pub_dao.n_tries >= pub_dao.MAX_TRIES
+                    and self._recover_from_pri()
+                )
+            ):
+                pending = []
+                pub_dao.n_tries = 0
+            if stopping:
+                # (Don't keep retrying on shutdown.)
+                return
+
+    def _recover_from_pri(self) -> bool:
+        """Replace the public database with a copy of the private database.
+
+        Returns:
+            True if the public database was recovered.
+
+        """
+        # Everything queued so far has already been committed to the private
+        # database so will be included in the copy.
+        # Note: Statements committed whilst the copy is being made may be
+        # applied twice, this is only a problem for tables without primary
+        # keys (e.g. task_events) and only happens on recovery.
+        with suppress(Empty):
+            while True:
+                if self.queue.get_nowait() is None:
+                    # put the stop request back for this (the writer) thread
+                    # to act on once recovery is done (see _run)
+                    self.queue.put(None)
+                    break
+        temp_fd, temp_name = mkstemp(
+            prefix=CylcWorkflowDAO.DB_FILE_BASE_NAME,
+            dir=os.path.dirname(self.pub_path)
+        )
+        os.close(temp_fd)
+        try:
+            with closing(
+                sqlite3.connect(self.pri_path, self.BACKUP_TIMEOUT)
+            ) as pri_conn, closing(sqlite3.connect(temp_name)) as temp_conn:
+                # Copy all pages in one step from one read transaction: a
+                # backup made in steps is restarted whenever the private
+                # database is written to, so might never finish. (The private
+                # database is in WAL mode so this does not hold up writes to
+                # it.)
+                pri_conn.execute('BEGIN')
+                pri_conn.execute('SELECT COUNT(*) FROM sqlite_master')
+                pri_conn.backup(temp_conn, pages=-1)
+                pri_conn.rollback()
+                # (in case the private database uses WAL mode)
+                temp_conn.execute("PRAGMA journal_mode=DELETE")
+            st_mode = os.stat(self.pub_path).st_mode
+            os.rename(temp_name, self.pub_path)
+            os.chmod(self.pub_path, st_mode)
+        except (OSError, sqlite3.Error) as exc:
+            LOG.warning(f"{self.pub_path}: recovery failed: {exc}")
+            with suppress(OSError):
+                os.remove(temp_name)
+            return False
+        LOG.warning(f"{self.pub_path}: recovered from {self.pri_path}")
+        return True
+
+
 class WorkflowDatabaseManager:
     """Manage the workflow runtime private and public databases."""
 
@@ -100,7 +237,9 @@ class WorkflowDatabaseManager:
     TABLE_XTRIGGERS = CylcWorkflowDAO.TABLE_XTRIGGERS
     TABLE_ABS_OUTPUTS = CylcWorkflowDAO.TABLE_ABS_OUTPUTS
 
-    def __init__(self, pri_d=None, pub_d=None):
+    def __init__(
+        self, pri_d=None, pub_d=None, pri_persistent=False, pub_thread=False
+    ):
         self.pri_path = None
         if pri_d:
             self.pri_path = os.path.join(
@@ -111,6 +250,11 @@ class WorkflowDatabaseManager:
                 pub_d, CylcWorkflowDAO.DB_FILE_BASE_NAME)
         self.pri_dao = None
         self.pub_dao = None
+        # keep the private DB connection open & use WAL mode?
+        self.pri_persistent = pri_persistent
+        # write to the public DB in a background thread?
+        self.pub_thread = pub_thread
+        self.pub_writer: Optional[PublicDatabaseWriter] = None
         self.n_restart = 0
 
         self.db_deletes_map: Dict[str, List[DbArgDict]] = {
@@ -139,6 +283,15 @@ class WorkflowDatabaseManager:
             self.TABLE_XTRIGGERS: [],
             self.TABLE_ABS_OUTPUTS: []}
         self.db_updates_map: Dict[str, List[DbUpdateTuple]] = {}
+        # The rows last written by put_task_pool, by table and primary key.
+        # Used to write only the rows which have changed since.
+        # (None means the table content is unknown, rewrite all rows.)
+        self.task_pool_rows: Dict[str, Optional[Dict[tuple, DbArgDict]]] = {
+            self.TABLE_TASK_POOL: None,
+            self.TABLE_TASK_PREREQUISITES: None,
+            self.TABLE_TASK_TIMEOUT_TIMERS: None,
+            self.TABLE_TASK_ACTION_TIMERS: None,
+        }
 
     def copy_pri_to_pub(self) -> None:
         """Copy content of primary database file to public database file."""
@@ -161,7 +314,15 @@ class WorkflowDatabaseManager:
             # Get default permissions level for public db:
             st_mode = os.stat(self.pub_dao.db_file_name).st_mode
 
+            # Ensure the private DB file is up to date (WAL mode)
+            self.pri_dao.checkpoint()
             copy(self.pri_dao.db_file_name, temp_pub_db_file_name)
+            if self.pri_dao.persistent:
+                # The public DB may be read from other hosts, which WAL mode
+                # doesn't support, so switch the copy back to rollback
+                # journal mode.
+                with CylcWorkflowDAO(temp_pub_db_file_name) as temp_dao:
+                    temp_dao.connect().execute("PRAGMA journal_mode=DELETE")
             os.rename(temp_pub_db_file_name, self.pub_dao.db_file_name)
             os.chmod(self.pub_dao.db_file_name, st_mode)
         except OSError:
@@ -235,13 +396,25 @@ class WorkflowDatabaseManager:
                 # ... however, in case there is a directory at the path for
                 # some bizarre reason:
                 rmtree(self.pri_path, ignore_errors=True)
-        self.pri_dao = self.get_pri_dao()
+        self.pri_dao = CylcWorkflowDAO(
+            self.pri_path,
+            create_tables=True,
+            persistent=self.pri_persistent,
+        )
         os.chmod(self.pri_path, PERM_PRIVATE)
         self.pub_dao = CylcWorkflowDAO(self.pub_path, is_public=True)
         self.copy_pri_to_pub()
+        if self.pub_thread:
+            self.pub_writer = PublicDatabaseWriter(
+                self.pub_path, self.pri_path
+            )
+            self.pub_writer.start()
 
     def on_workflow_shutdown(self):
         """Close data access objects."""
+        if self.pub_writer:
+            self.pub_writer.stop()
+            self.pub_writer = None
         if self.pri_dao:
             self.pri_dao.close()
             self.pri_dao = None
@@ -280,16 +453,16 @@ class WorkflowDatabaseManager:
                     self.pub_dao.add_update_item(
                         table_name, set_args, where_args)
 
-        # Previously, we used a separate thread for database writes. This has
-        # now been removed. For the private database, there is no real
-        # advantage in using a separate thread as it needs to be always in sync
-        # with what is current. For the public database, which does not need to
-        # be fully in sync, there is some advantage of using a separate
-        # thread/process, if writing to it becomes a bottleneck. At the moment,
-        # there is no evidence that this is a bottleneck, so it is better to
-        # keep the logic simple.
+        # For the private database, there is no real advantage in using a
+        # separate thread as it needs to be always in sync with what is
+        # current. The public database does not need to be fully in sync, so
+        # it can optionally be written to from a separate thread.
         self.pri_dao.execute_queued_items()
-        self.pub_dao.execute_queued_items()
+        if self.pub_writer:
+            # (only queued once committed to the private database)
+            self.pub_writer.put(self.pub_dao.pop_queued_items())
+        else:
+            self.pub_dao.execute_queued_items()
 
     def put_broadcast(self, modified_settings, is_cancel=False):
         """Put or clear broadcasts in runtime database."""
@@ -418,6 +591,8 @@ class WorkflowDatabaseManager:
         """Put statements to update the task_action_timers table."""
         if task_events_mgr.event_timers_updated:
             self.db_deletes_map[self.TABLE_TASK_ACTION_TIMERS].append({})
+            # the task poll and try timers must be rewritten too
+            self.task_pool_rows[self.TABLE_TASK_ACTION_TIMERS] = None
             for key, timer in task_events_mgr._event_timers.items():
                 key1, point, name, submit_num = key
                 self.db_inserts_map[self.TABLE_TASK_ACTION_TIMERS].append({
@@ -464,72 +639,79 @@ class WorkflowDatabaseManager:
             (set_args, where_args))
 
     def put_task_pool(self, pool: 'TaskPool') -> None:
-        """Delete task pool table content and recreate from current task pool.
+        """Update task pool table content from current task pool.
 
-        Also recreate:
+        Also update:
         - prerequisites table
         - timeout timers table
-        - action timers table
-
-        And update:
+        - action timers table (task poll and try timers)
         - task states table
+
+        Only rows which have changed since the last call are written
+        (inserted or replaced) or deleted. On the first call the task pool,
+        prerequisites and timeout timers tables are rewritten entirely.
         """
-        self.db_deletes_map[self.TABLE_TASK_POOL].append({})
-        # Comment this out to retain the trigger-time prereq status of past
-        # tasks (but then the prerequisite table will grow indefinitely):
-        self.db_deletes_map[self.TABLE_TASK_PREREQUISITES].append({})
-        # This should already be done by self.put_task_event_timers above:
-        # self.db_deletes_map[self.TABLE_TASK_ACTION_TIMERS].append({})
-        self.db_deletes_map[self.TABLE_TASK_TIMEOUT_TIMERS].append({})
+        rows: Dict[str, Dict[tuple, DbArgDict]] = {
+            table_name: {} for table_name in self.task_pool_rows
+        }
         for itask in pool.get_all_tasks():
+            name = itask.tdef.name
+            cycle = str(itask.point)
+            flow_nums = serialise(itask.flow_nums)
             for prereq in itask.state.prerequisites:
                 for (p_cycle, p_name, p_output), satisfied_state in (
                     prereq.satisfied.items()
                 ):
-                    self.put_insert_task_prerequisites(itask, {
-                        "flow_nums": serialise(itask.flow_nums),
+                    rows[self.TABLE_TASK_PREREQUISITES][
+                        (cycle, name, flow_nums, p_name, p_cycle, p_output)
+                    ] = {
+                        "cycle": cycle,
+                        "name": name,
+                        "flow_nums": flow_nums,
                         "prereq_name": p_name,
                         "prereq_cycle": p_cycle,
                         "prereq_output": p_output,
                         "satisfied": satisfied_state
-                    })
-            self.db_inserts_map[self.TABLE_TASK_POOL].append({
-                "name": itask.tdef.name,
-                "cycle": str(itask.point),
-                "flow_nums": serialise(itask.flow_nums),
+                    }
+            rows[self.TABLE_TASK_POOL][(cycle, name, flow_nums)] = {
+                "name": name,
+                "cycle": cycle,
+                "flow_nums": flow_nums,
                 "status": itask.state.status,
                 "is_held": itask.state.is_held
-            })
+            }
             if itask.timeout is not None:
-                self.db_inserts_map[self.TABLE_TASK_TIMEOUT_TIMERS].append({
-                    "name": itask.tdef.name,
-                    "cycle": str(itask.point),
+                rows[self.TABLE_TASK_TIMEOUT_TIMERS][(cycle, name)] = {
+                    "name": name,
+                    "cycle": cycle,
                     "timeout": itask.timeout
-                })
+                }
             if itask.poll_timer is not None:
-                self.db_inserts_map[self.TABLE_TASK_ACTION_TIMERS].append({
-                    "name": itask.tdef.name,
-                    "cycle": str(itask.point),
-                    "ctx_key": json.dumps("poll_timer"),
+                ctx_key = json.dumps("poll_timer")
+                rows[self.TABLE_TASK_ACTION_TIMERS][(cycle, name, ctx_key)] = {
+                    "name": name,
+                    "cycle": cycle,
+                    "ctx_key": ctx_key,
                     "ctx": self._namedtuple2json(itask.poll_timer.ctx),
                     "delays": json.dumps(itask.poll_timer.delays),
                     "num": itask.poll_timer.num,
                     "delay": itask.poll_timer.delay,
                     "timeout": itask.poll_timer.timeout
-                })
+                }
             for ctx_key_1, timer in itask.try_timers.items():
                 if timer is None:
                     continue
-                self.db_inserts_map[self.TABLE_TASK_ACTION_TIMERS].append({
-                    "name": itask.tdef.name,
-                    "cycle": str(itask.point),
-                    "ctx_key": json.dumps(("try_timers", ctx_key_1)),
+                ctx_key = json.dumps(("try_timers", ctx_key_1))
+                rows[self.TABLE_TASK_ACTION_TIMERS][(cycle, name, ctx_key)] = {
+                    "name": name,
+                    "cycle": cycle,
+                    "ctx_key": ctx_key,
                     "ctx": self._namedtuple2json(timer.ctx),
                     "delays": json.dumps(timer.delays),
                     "num": timer.num,
                     "delay": timer.delay,
                     "timeout": timer.timeout
-                })
+                }
             if itask.state.time_updated:
                 set_args = {
                     "time_updated": itask.state.time_updated,
@@ -538,15 +720,48 @@ class WorkflowDatabaseManager:
                     "status": itask.state.status
                 }
                 where_args = {
-                    "cycle": str(itask.point),
-                    "name": itask.tdef.name,
-                    "flow_nums": serialise(itask.flow_nums)
+                    "cycle": cycle,
+                    "name": name,
+                    "flow_nums": flow_nums
                 }
                 self.db_updates_map.setdefault(self.TABLE_TASK_STATES, [])
                 self.db_updates_map[self.TABLE_TASK_STATES].append(
                     (set_args, where_args)
                 )
                 itask.state.time_updated = None
+        for table_name, table_rows in rows.items():
+            self._put_task_pool_rows(table_name, table_rows)
+
+    def _put_task_pool_rows(
+        self, table_name: str, rows: Dict[tuple, DbArgDict]
+    ) -> None:
+        """Queue the statements to bring a task pool table up to date.
+
+        Args:
+            table_name: The table to update.
+            rows: The table's new content by primary key.
+
+        """
+        old_rows = self.task_pool_rows[table_name]
+        self.task_pool_rows[table_name] = rows
+        if old_rows is None:
+            # The table content is unknown, rewrite it.
+            # (The task action timers table is shared with the task event
+            # timers, it is cleared by put_task_event_timers.)
+            if table_name != self.TABLE_TASK_ACTION_TIMERS:
+                self.db_deletes_map[table_name].append({})
+            self.db_inserts_map[table_name].extend(rows.values())
+            return
+        # Note: delete statements are executed before inserts.
+        primary_keys = CylcWorkflowDAO.get_primary_keys(table_name)
+        for key in old_rows.keys() - rows.keys():
+            self.db_deletes_map[table_name].append(
+                dict(zip(primary_keys, key))
+            )
+        for key, args in rows.items():
+            if old_rows.get(key) != args:
+                # (inserts replace existing rows with the same primary key)
+                self.db_inserts_map[table_name].append(args)
 
     def put_tasks_to_hold(
         self, tasks: Set[Tuple[str, 'PointBase']]
@@ -663,7 +878,12 @@ class WorkflowDatabaseManager:
         self.db_updates_map[table_name].append((set_args, where_args))
 
     def recover_pub_from_pri(self):
-        """Recover public database from private database."""
+        """Recover public database from private database.
+
+        (The public database writer thread does this itself, if used.)
+        """
+        if self.pub_writer:
+            return
         if self.pub_dao.n_tries >= self.pub_dao.MAX_TRIES:
             self.copy_pri_to_pub()
             LOG.warning(
@@ -764,6 +984,19 @@ class WorkflowDatabaseManager:
         )
         conn.commit()
 
+    @staticmethod
+    def upgrade_pre_820(pri_dao: CylcWorkflowDAO) -> None:
+        """Upgrade on restart from a pre-8.2.0 database.
+
+        Add the secondary indexes (see CylcWorkflowDAO.INDEXES) which speed
+        up task lookups in large databases.
+        """
+        LOG.info(
+            "DB upgrade (pre-8.2.0): add indexes "
+            f"{', '.join(CylcWorkflowDAO.INDEXES)}"
+        )
+        pri_dao.create_indexes()
+
     @classmethod
     def upgrade(cls, db_file: Union['Path', str]) -> None:
         """Upgrade this database to this Cylc version.
@@ -774,6 +1007,8 @@ class WorkflowDatabaseManager:
                 cls.upgrade_pre_803(pri_dao)
             if last_run_ver < parse_version("8.1.0.dev"):
                 cls.upgrade_pre_810(pri_dao)
+            if last_run_ver < parse_version("8.2.0.dev"):
+                cls.upgrade_pre_820(pri_dao)
 
     @classmethod
     def check_db_compatibility(cls, db_file: Union['Path', str]) -> Version:
@@ -14,13 +14,18 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import asyncio
+from concurrent.futures import Future, ProcessPoolExecutor
 from contextlib import suppress
 from enum import Enum
 import json
+from multiprocessing import get_context
 import re
 from copy import deepcopy
 from time import time
-from typing import Any, Dict, List, Optional, Tuple, Callable
+from typing import (
+    TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple, Callable
+)
 
 from cylc.flow import LOG
 from cylc.flow.exceptions import XtriggerConfigError
@@ -31,10 +36,13 @@ from cylc.flow.xtriggers.wall_clock import wall_clock
 from cylc.flow.subprocctx import SubFuncContext
 from cylc.flow.broadcast_mgr import BroadcastMgr
 from cylc.flow.data_store_mgr import DataStoreMgr
-from cylc.flow.subprocpool import SubProcPool
+from cylc.flow.subprocpool import SubProcPool, run_function_in_executor
 from cylc.flow.task_proxy import TaskProxy
 from cylc.flow.subprocpool import get_func
 
+if TYPE_CHECKING:
+    from cylc.flow.async_util import Wakeup
+
 
 class TemplateVariables(Enum):
     """Templates variables for string replacement in xtrigger functions.
@@ -182,6 +190,13 @@ class XtriggerManager:
     managed uniquely - i.e. many tasks depending on the same clock trigger
     (with same offset from cycle point) get satisfied by the same call.
 
+    Functions which declare themselves safe to do so (by setting the
+    attribute "executor_safe = True" on the function) can be run in a pool
+    of long-lived worker processes rather than a new "cylc function-run"
+    subprocess for each call (if executor_size > 0). Such functions must
+    return promptly as, unlike subprocesses, they cannot be killed on
+    timeout.
+
     Args:
         workflow: workflow name
         user: workflow owner
@@ -189,6 +204,9 @@ class XtriggerManager:
         proc_pool: pool of Subprocesses
         workflow_run_dir: workflow run directory
         workflow_share_dir: workflow share directory
+        executor_size: number of worker processes for running executor
+            safe functions (0 to run all functions in the process pool)
+        wakeup: set when an executor function returns (to wake the main loop)
 
     """
 
@@ -201,6 +219,8 @@ class XtriggerManager:
         user: Optional[str] = None,
         workflow_run_dir: Optional[str] = None,
         workflow_share_dir: Optional[str] = None,
+        executor_size: int = 0,
+        wakeup: 'Optional[Wakeup]' = None,
     ):
         # Workflow function and clock triggers by label.
         self.functx_map: Dict[str, SubFuncContext] = {}
@@ -210,6 +230,9 @@ class XtriggerManager:
         self.sat_xtrig: dict = {}
         # Signatures of active functions (waiting on callback).
         self.active: list = []
+        # Earliest time an unsatisfied xtrigger is next due to be checked
+        # (clock trigger time or next call time), see call_xtriggers_async.
+        self.t_next_due: Optional[float] = None
 
         self.workflow_run_dir = workflow_run_dir
 
@@ -233,6 +256,13 @@ class XtriggerManager:
         self.broadcast_mgr = broadcast_mgr
         self.data_store_mgr = data_store_mgr
 
+        self.executor_size = executor_size
+        self.wakeup = wakeup
+        # (started on demand)
+        self.executor: Optional[ProcessPoolExecutor] = None
+        # Calls submitted to the executor which have not completed yet.
+        self.executor_futures: Set[Future] = set()
+
     @staticmethod
     def validate_xtrigger(label: str, fctx: SubFuncContext, fdir: str) -> None:
         """Validate an Xtrigger function.
@@ -427,6 +457,8 @@ class XtriggerManager:
                     self.sat_xtrig[sig] = {}
                     self.data_store_mgr.delta_task_xtrigger(sig, True)
                     LOG.info('xtrigger satisfied: %s = %s', label, sig)
+                else:
+                    self._set_next_due(ctx.func_kwargs.get('trigger_time'))
                 continue
             # General case: potentially slow asynchronous function call.
             if sig in self.sat_xtrig:
@@ -450,11 +482,87 @@ class XtriggerManager:
             now = time()
             if sig in self.t_next_call and now < self.t_next_call[sig]:
                 # Too soon to call this one again.
+                self._set_next_due(self.t_next_call[sig])
                 continue
             self.t_next_call[sig] = now + ctx.intvl
             # Queue to the process pool, and record as active.
             self.active.append(sig)
-            self.proc_pool.put_command(ctx, callback=self.callback)
+            if not self._call_in_executor(ctx):
+                self.proc_pool.put_command(ctx, callback=self.callback)
+
+    def _call_in_executor(self, ctx: SubFuncContext) -> bool:
+        """Call an xtrigger function in the executor if it is safe to do so.
+
+        The callback is called in the main loop when the function returns.
+
+        Returns:
+            False if the function must be run via the process pool.
+
+        """
+        if not self.executor_size or not getattr(
+            get_func(ctx.func_name, self.workflow_run_dir),
+            'executor_safe',
+            False
+        ):
+            return False
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Not called from the main loop.
+            return False
+        if self.executor is None:
+            # (spawn rather than fork the scheduler which runs other threads)
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.executor_size,
+                mp_context=get_context('spawn'),
+            )
+        LOG.debug(f'{ctx.func_name}: calling in executor')
+        executor_future = self.executor.submit(
+            run_function_in_executor,
+            ctx.func_name,
+            json.dumps(ctx.func_args),
+            json.dumps(ctx.func_kwargs),
+            self.workflow_run_dir,
+        )
+        self.executor_futures.add(executor_future)
+        executor_future.add_done_callback(self.executor_futures.discard)
+        asyncio.wrap_future(executor_future, loop=loop).add_done_callback(
+            lambda future: self._executor_callback(ctx, future)
+        )
+        return True
+
+    def _executor_callback(
+        self, ctx: SubFuncContext, future: 'asyncio.Future'
+    ) -> None:
+        """Callback for xtrigger functions called in the executor."""
+        if future.cancelled():
+            # Shutting down.
+            return
+        try:
+            ctx.ret_code, ctx.out, ctx.err = future.result()
+        except Exception as exc:
+            # e.g. the worker process died
+            ctx.ret_code, ctx.out, ctx.err = 1, None, str(exc)
+        self.callback(ctx)
+        if self.wakeup is not None:
+            self.wakeup.set()
+
+    def shutdown(self) -> None:
+        """Stop the executor (if started)."""
+        if self.executor is not None:
+            # Cancel calls which have not started.
+            # (Executor.shutdown(cancel_futures=True) requires Python 3.9)
+            for future in list(self.executor_futures):
+                future.cancel()
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+    def _set_next_due(self, due: Optional[float]) -> None:
+        """Record the time an xtrigger is next due, if it is the earliest."""
+        if due is not None and (
+            self.t_next_due is None or due < self.t_next_due
+        ):
+            self.t_next_due = due
 
     def housekeep(self, itasks: List[TaskProxy]):
         """Delete satisfied xtriggers no longer needed by any task.
@@ -15,6 +15,8 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 """Test cylc.flow.client.WorkflowRuntimeClient."""
+import asyncio
+
 import pytest
 
 from cylc.flow.network.client import WorkflowRuntimeClient
@@ -50,3 +52,29 @@ async def test_protobuf(harness):
     pb_data = PB_METHOD_MAP['pb_entire_workflow']()
     pb_data.ParseFromString(ret)
     assert schd.workflow in pb_data.workflow.id
+
+
+async def test_concurrent_requests(harness):
+    """It should pipeline concurrent requests over the one connection."""
+    schd, client = harness
+    rets = await asyncio.gather(*(
+        client.async_request(
+            'graphql',
+            {'request_string': 'query { workflows { id } }'}
+        )
+        if ind % 2 else
+        client.async_request('pb_entire_workflow')
+        for ind in range(20)
+    ))
+    for ind, ret in enumerate(rets):
+        if ind % 2:
+            # each response was returned to the request which made it
+            assert schd.workflow in ret['workflows'][0]['id']
+        else:
+            pb_data = PB_METHOD_MAP['pb_entire_workflow']()
+            pb_data.ParseFromString(ret)
+            assert schd.workflow in pb_data.workflow.id
+
+    # the client should tidy up once all requests have been answered
+    assert not client._pending
+    assert client._reader is None
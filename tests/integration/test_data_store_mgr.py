@@ -18,11 +18,13 @@ import pytest
 from typing import TYPE_CHECKING
 
 from cylc.flow.data_store_mgr import (
+    EDGES,
     FAMILY_PROXIES,
     JOBS,
     TASKS,
     TASK_PROXIES,
-    WORKFLOW
+    WORKFLOW,
+    generate_checksum,
 )
 from cylc.flow.id import Tokens
 from cylc.flow.task_state import (
@@ -304,3 +306,70 @@ def test_delta_task_prerequisite(harness):
         p.satisfied
         for t in schd.data_store_mgr.updated[TASK_PROXIES].values()
         for p in t.prerequisites})
+
+
+async def test_checksums(flow, scheduler, start):
+    """Test the running checksums match those of the whole data-store."""
+    reg = flow({
+        'scheduler': {
+            'allow implicit tasks': True
+        },
+        'scheduling': {
+            'graph': {
+                'R1': 'foo => bar => baz'
+            }
+        }
+    })
+    schd = scheduler(reg)
+    async with start(schd):
+        await schd.update_data_structure()
+        schd.pool.hold_tasks('*')
+        await schd.update_data_structure()
+        # prune a task
+        itask = schd.pool.get_all_tasks()[0]
+        schd.pool.remove(itask, 'test')
+        await schd.update_data_structure()
+        data = schd.data_store_mgr.data[schd.data_store_mgr.workflow_id]
+        for key, checksum in schd.data_store_mgr.checksums.items():
+            s_att = 'id' if key == EDGES else 'stamp'
+            assert checksum == generate_checksum(
+                getattr(element, s_att) for element in data[key].values()
+            )
+
+
+async def test_graph_neighbours(flow, scheduler, start):
+    """Test graph neighbours are memoised for the n-window nodes only."""
+    reg = flow({
+        'scheduler': {
+            'allow implicit tasks': True
+        },
+        'scheduling': {
+            'graph': {
+                'R1': 'a => b => c => d'
+            }
+        }
+    })
+    schd = scheduler(reg)
+    async with start(schd):
+        await schd.update_data_structure()
+        data_store_mgr = schd.data_store_mgr
+        tp_data = data_store_mgr.data[data_store_mgr.workflow_id][
+            TASK_PROXIES]
+        assert set(data_store_mgr.graph_neighbours) == set(tp_data)
+        a_id = data_store_mgr.id_.duplicate(cycle='1', task='a').id
+        has_children, children, parents = (
+            data_store_mgr.graph_neighbours[a_id]
+        )
+        assert has_children
+        assert [tokens.relative_id for tokens, _ in children] == ['1/b']
+        assert parents == []
+
+        # move the window on to c, a is pruned along with its neighbours
+        for name in ('a', 'b'):
+            itask, = schd.pool.get_all_tasks()
+            assert itask.identity == f'1/{name}'
+            schd.pool.spawn_on_output(itask, 'succeeded')
+            schd.pool.remove(itask, 'test')
+            await schd.update_data_structure()
+        assert a_id not in tp_data
+        assert set(data_store_mgr.graph_neighbours) == set(tp_data)
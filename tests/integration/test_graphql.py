@@ -16,7 +16,9 @@
 
 """Test the top-level (root) GraphQL queries."""
 
+import asyncio
 import pytest
+from async_timeout import timeout
 from typing import TYPE_CHECKING
 
 from cylc.flow.id import Tokens
@@ -348,3 +350,35 @@ async def test_jobs(harness):
     assert ret == {
         'job': {'id': f'{j_id}'}
     }
+
+
+async def test_loop_phase_timings(flow, scheduler, run, one_conf):
+    schd = scheduler(flow(one_conf))
+    async with run(schd):
+        async with timeout(10):
+            # wait for the main loop to complete an iteration
+            while 'plugins' not in schd.loop_timings.phases:
+                await asyncio.sleep(0.1)
+        client = WorkflowRuntimeClient(schd.workflow)
+        ret = await client.async_request(
+            'graphql',
+            {'request_string': 'query { workflows { loopPhaseTimings } }'}
+        )
+    timings = ret['workflows'][0]['loopPhaseTimings']
+    assert set(timings) == {
+        'commands',
+        'process pool',
+        'xtriggers',
+        'release queued tasks',
+        'task messages',
+        'data store',
+        'database',
+        'plugins',
+    }
+    for timing in timings.values():
+        assert sum(timing['histogram'].values()) == timing['count']
+    # one sample per phase per main loop iteration
+    # (the query may land part way through an iteration)
+    assert 0 <= (
+        timings['commands']['count'] - timings['plugins']['count']
+    ) <= 1
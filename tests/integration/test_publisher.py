@@ -16,6 +16,7 @@
 from async_timeout import timeout
 import pytest
 
+from cylc.flow.data_store_mgr import ALL_DELTAS, DELTAS_MAP
 from cylc.flow.network.subscriber import (
     WorkflowSubscriber,
     process_delta_msg
@@ -46,3 +47,23 @@ async def test_publisher(flow, scheduler, run, one_conf, port_range):
                 break
         else:
             raise Exception("Delta wasn't added or updated")
+
+
+async def test_publish_all_deltas(flow, scheduler, start, one_conf):
+    """The "all" deltas should comprise the published per-topic deltas."""
+    reg = flow(one_conf)
+    schd = scheduler(reg)
+    async with start(schd):
+        await schd.update_data_structure()
+        published = dict(schd.data_store_mgr.publish_deltas)
+        all_deltas = DELTAS_MAP[ALL_DELTAS].FromString(
+            published.pop(ALL_DELTAS.encode())
+        )
+        assert published
+        assert {
+            field.name: value
+            for field, value in all_deltas.ListFields()
+        } == {
+            topic.decode(): DELTAS_MAP[topic.decode()].FromString(data)
+            for topic, data in published.items()
+        }
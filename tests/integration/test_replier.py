@@ -15,9 +15,13 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from async_timeout import timeout
+from concurrent.futures import Future
+import os
 from cylc.flow.network import decode_
 from cylc.flow.network.client import WorkflowRuntimeClient
+from cylc.flow.network.replier import WorkflowReplier
 import asyncio
+from unittest.mock import Mock
 
 import pytest
 
@@ -41,3 +45,25 @@ async def test_listener(one, start, ):
         one.server.replier.queue.put('foobar')
         with pytest.raises(ValueError):
             one.server.replier.listener()
+
+
+def test_late_response_after_stop():
+    """A worker finishing after stop must not write to the closed pipe."""
+    replier = WorkflowReplier(Mock(schd=Mock(workflow='x')))
+    replier._bespoke_stop()
+    # the closed fd numbers are likely to be reused by the next pipe
+    read_fd, write_fd = os.pipe()
+    os.set_blocking(read_fd, False)
+    try:
+        future: Future = Future()
+        future.set_result(b'late')
+        replier._put_response([b'id'], future)
+        with pytest.raises(BlockingIOError):
+            os.read(read_fd, 1)
+        # stopping again must not close the reused fds
+        replier._bespoke_stop()
+        os.fstat(read_fd)
+        os.fstat(write_fd)
+    finally:
+        os.close(read_fd)
+        os.close(write_fd)
@@ -14,15 +14,17 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import asyncio
+from contextlib import suppress
 import logging
 from typing import AsyncGenerator, Callable
 from unittest.mock import Mock
 
 import pytest
 
-from cylc.flow.data_store_mgr import EDGES, TASK_PROXIES
+from cylc.flow.data_store_mgr import DELTA_UPDATED, EDGES, TASK_PROXIES
 from cylc.flow.id import Tokens
-from cylc.flow.network.resolvers import Resolvers
+from cylc.flow.network.resolvers import Resolvers, node_filter
 from cylc.flow.scheduler import Scheduler
 from cylc.flow.workflow_status import StopMode
 
@@ -126,6 +128,57 @@ async def test_get_nodes_all(mock_flow, node_args):
     assert len(nodes) == 1
 
 
+@pytest.mark.parametrize('args', [
+    {},
+    {'states': ['waiting']},
+    {'states': ['waiting', 'failed'], 'is_held': False},
+    {'is_queued': True},
+    {'ids': [Tokens('2000*/foo', relative=True)]},
+    {'ids': [Tokens('20000101T0000Z/foo', relative=True)]},
+    {'ids': [Tokens('20000101T0000Z', relative=True)], 'exstates': ['x']},
+])
+async def test_get_nodes_all_indexed(mock_flow, node_args, args):
+    """Nodes selected via the data-store indexes should match a full scan."""
+    node_index = mock_flow.schd.data_store_mgr.node_indexes[mock_flow.id][
+        TASK_PROXIES]
+    assert set(node_index.values) == set(mock_flow.data[TASK_PROXIES])
+    node_args.update(args)
+    nodes = await mock_flow.resolvers.get_nodes_all(TASK_PROXIES, node_args)
+    expected = [
+        node
+        for node in mock_flow.data[TASK_PROXIES].values()
+        if node_filter(node, TASK_PROXIES, node_args, node.state)
+    ]
+    assert expected
+    # (in store order)
+    assert [node.id for node in nodes] == [node.id for node in expected]
+
+
+async def test_get_nodes_all_paginated(mock_flow, node_args):
+    """It should page through nodes using the cursor."""
+    node_args['first'] = 2
+    ids = []
+    while True:
+        page = await mock_flow.resolvers.get_nodes_all(
+            TASK_PROXIES, node_args
+        )
+        assert len(page) <= 2
+        if not page:
+            break
+        ids.extend(node.id for node in page)
+        node_args['after'] = page[-1].id
+    assert ids == sorted(mock_flow.data[TASK_PROXIES])
+
+    # a cursor which has left the store is still valid
+    node_args['after'] = f'{ids[0]}-gone'
+    page = await mock_flow.resolvers.get_nodes_all(TASK_PROXIES, node_args)
+    assert [node.id for node in page] == ids[1:3]
+    # unless the elements are sorted
+    node_args['sort'] = Mock(keys=['name'], reverse=False)
+    with pytest.raises(ValueError, match='Cursor not found'):
+        await mock_flow.resolvers.get_nodes_all(TASK_PROXIES, node_args)
+
+
 async def test_get_nodes_by_ids(mock_flow, node_args):
     """Test method returning workflow(s) node messages
     who's ID is a match to any given."""
@@ -237,3 +290,55 @@ async def test_stop(
             log, level=logging.INFO, contains="Command succeeded: stop"
         )
         assert one.stop_mode == StopMode.REQUEST_CLEAN
+
+
+async def test_subscribe_delta(one: Scheduler, start: Callable):
+    """Test delta subscriptions are woken by published deltas."""
+    async with start(one):
+        resolvers = Resolvers(one.data_store_mgr, schd=one)
+        w_id = one.data_store_mgr.workflow_id
+        info = Mock(field_name='deltas', variable_values={}, context={})
+        subscription = resolvers.subscribe_delta(
+            'root',
+            info,
+            {'workflows': [w_id], 'ignore_interval': 0},
+        )
+        waiter = asyncio.ensure_future(subscription.__anext__())
+        await asyncio.sleep(0.1)
+        # the subscription is awaiting deltas
+        assert not waiter.done()
+        sub_id = info.variable_values['backend_sub_id']
+        assert sub_id in one.data_store_mgr.delta_queues[w_id]
+
+        # publishing deltas wakes the subscription
+        one.pool.hold_tasks(['*'])
+        await one.update_data_structure()
+        delta_store = await asyncio.wait_for(waiter, 5)
+        assert delta_store['id'] == w_id
+        assert any(
+            task.is_held
+            for task in delta_store[DELTA_UPDATED][TASK_PROXIES].values()
+        )
+
+        # deltas published while the last is being processed are coalesced
+        one.pool.release_held_tasks(['*'])
+        await one.update_data_structure()
+        one.pool.hold_tasks(['*'])
+        await one.update_data_structure()
+        waiter = asyncio.ensure_future(subscription.__anext__())
+        await asyncio.sleep(0.1)
+        assert not waiter.done()
+        await resolvers.flow_delta_processed(info.context, 'root')
+        delta_store = await asyncio.wait_for(waiter, 5)
+        assert all(
+            task.is_held
+            for task in delta_store[DELTA_UPDATED][TASK_PROXIES].values()
+        )
+
+        # cancelling the subscription tidies up
+        waiter = asyncio.ensure_future(subscription.__anext__())
+        await asyncio.sleep(0.1)
+        waiter.cancel()
+        with suppress(asyncio.CancelledError):
+            await waiter
+        assert sub_id not in one.data_store_mgr.delta_queues[w_id]
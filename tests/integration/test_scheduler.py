@@ -20,7 +20,10 @@ from pathlib import Path
 import pytest
 from typing import Any, Callable
 
+from async_timeout import timeout
+
 from cylc.flow.exceptions import CylcError
+from cylc.flow.network.resolvers import TaskMsg
 from cylc.flow.parsec.exceptions import ParsecError
 from cylc.flow.pathutil import get_cylc_run_dir, get_workflow_run_dir
 from cylc.flow.scheduler import Scheduler, SchedulerStop
@@ -32,6 +35,7 @@ from cylc.flow.task_state import (
     TASK_STATUS_FAILED
 )
 
+from cylc.flow.wallclock import get_current_time_string
 from cylc.flow.workflow_status import AutoRestartMode
 
 from .utils.flow_tools import _make_flow
@@ -371,3 +375,83 @@ async def test_error_during_auto_restart(
 
     assert log_filter(log, level=logging.ERROR, contains=err_msg)
     assert TRACEBACK_MSG in log.text
+
+
+async def test_event_driven_main_loop(
+    one: Scheduler,
+    run: Callable,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """The event driven main loop should sleep until woken by a command."""
+    one.main_loop_event_driven = True
+    one.main_loop_max_sleep = 60
+    n_loops = 0
+    process_command_queue = one.process_command_queue
+
+    def _process_command_queue():
+        nonlocal n_loops
+        n_loops += 1
+        process_command_queue()
+
+    monkeypatch.setattr(one, 'process_command_queue', _process_command_queue)
+    async with run(one):
+        # wait for the main loop to go to sleep
+        await asyncio.sleep(0.5)
+        itask = one.pool.get_tasks()[0]
+        assert not itask.state.is_held
+        loops = n_loops
+        await asyncio.sleep(0.5)
+        # the main loop should be asleep
+        assert n_loops == loops
+        # a queued command should wake it up straight away
+        one.command_queue.put(('hold', (['1/one'],), {}))
+        await asyncio.sleep(0.2)
+        assert itask.state.is_held
+
+
+async def test_event_driven_main_loop_releases_tasks(
+    flow: Callable,
+    scheduler: Callable,
+    run: Callable,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """The event driven main loop should release a task straight away once
+    a task message has satisfied its prerequisites."""
+    id_ = flow({
+        'scheduling': {
+            'graph': {'R1': 'a => b'},
+        },
+        'runtime': {'a': {}, 'b': {}},
+    })
+    schd = scheduler(id_, paused_start=False)
+    schd.main_loop_event_driven = True
+    schd.main_loop_max_sleep = 60
+    submitted = []
+
+    def submit_task_jobs(_workflow, itasks, *args, **kwargs):
+        for itask in itasks:
+            if itask.identity not in submitted:
+                submitted.append(itask.identity)
+                itask.submit_num += 1
+                itask.waiting_on_job_prep = False
+                itask.state_reset(TASK_STATUS_SUBMITTED)
+        return []
+
+    async with run(schd):
+        monkeypatch.setattr(
+            schd.task_job_mgr, 'submit_task_jobs', submit_task_jobs
+        )
+        # release 1/a
+        schd.main_loop_wakeup.set()
+        async with timeout(5):
+            while submitted != ['1/a']:
+                await asyncio.sleep(0.05)
+        # wait for the main loop to go to sleep
+        await asyncio.sleep(0.5)
+        schd.message_queue.put(
+            TaskMsg('1/a/01', get_current_time_string(), 'INFO', 'succeeded')
+        )
+        # 1/b should be released without waiting for the max sleep
+        async with timeout(5):
+            while submitted != ['1/a', '1/b']:
+                await asyncio.sleep(0.05)
@@ -14,12 +14,15 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import asyncio
 from typing import Callable
 from async_timeout import timeout
 from getpass import getuser
+from threading import Event
 
 import pytest
 
+from cylc.flow.network.client import WorkflowRuntimeClient
 from cylc.flow.network.server import PB_METHOD_MAP
 from cylc.flow.scheduler import Scheduler
 
@@ -55,6 +58,23 @@ def test_graphql(myflow):
     assert myflow.id == data['workflows'][0]['id']
 
 
+def test_graphql_pagination(myflow):
+    """Test GraphQL node queries can be paged through."""
+    request_string = f'''
+        query {{
+            taskProxies(workflows: ["{myflow.id}"], first: 1, after: "%s") {{
+                id
+            }}
+        }}
+    '''
+    data = call_server_method(myflow.server.graphql, request_string % '')
+    (task_proxy,) = data['taskProxies']
+    data = call_server_method(
+        myflow.server.graphql, request_string % task_proxy['id']
+    )
+    assert data['taskProxies'] == []
+
+
 def test_pb_data_elements(myflow):
     """Test Protobuf elements endpoint method."""
     element_type = 'workflow'
@@ -128,3 +148,48 @@ async def test_publish_before_shutdown(
         one.server.publish_queue.put([(b'fake', b'blah')])
         await one.server.stop('i said stop!')
         assert not one.server.publish_queue.qsize()
+
+
+def test_is_read_only(myflow):
+    """It should serve only queries and data-store requests concurrently."""
+    def message(command, request_string=None):
+        return {
+            'command': command,
+            'args': {'request_string': request_string},
+        }
+
+    assert myflow.server.is_read_only(message('pb_entire_workflow'))
+    assert myflow.server.is_read_only(
+        message('graphql', 'query { workflows { id } }')
+    )
+    assert myflow.server.is_read_only(
+        message('graphql', '{ workflows { id } }')
+    )
+    assert not myflow.server.is_read_only(
+        message('graphql', 'mutation { pause(workflows: ["*"]) { result } }')
+    )
+    assert not myflow.server.is_read_only(message('graphql', 'not graphql'))
+    assert not myflow.server.is_read_only(message('api'))
+
+
+async def test_concurrent_requests(one: Scheduler, start):
+    """A slow read-only request should not hold up other requests."""
+    async with start(one):
+        release = Event()
+
+        def _slow(**_kwargs):
+            release.wait(5)
+            return b'slow'
+
+        one.server.pb_entire_workflow = _slow
+        slow_client = WorkflowRuntimeClient(one.workflow)
+        client = WorkflowRuntimeClient(one.workflow)
+        slow_request = asyncio.ensure_future(
+            slow_client.async_request('pb_entire_workflow')
+        )
+        async with timeout(2):
+            assert 'graphql' in await client.async_request('api')
+        assert not slow_request.done()
+        release.set()
+        async with timeout(2):
+            assert await slow_request == b'slow'
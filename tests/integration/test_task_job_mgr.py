@@ -14,7 +14,9 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import asyncio
 import logging
+from pathlib import Path
 
 from cylc.flow import CYLC_LOG
 from cylc.flow.task_state import TASK_STATUS_RUNNING
@@ -104,3 +106,81 @@ async def test_run_job_cmd_no_hosts_error(
             log,
             contains='No available hosts for no-host-platform',
         )
+
+
+async def test_batch_syntax_checks(flow, scheduler, start):
+    """It should check job scripts in a batch before they are submitted."""
+    id_ = flow({
+        'scheduling': {
+            'graph': {
+                'R1': 'good & bad'
+            }
+        },
+        'runtime': {
+            'good': {
+                'script': 'true'
+            },
+            'bad': {
+                'script': 'if true; then'
+            },
+        }
+    })
+    schd = scheduler(id_)
+    async with start(schd):
+        schd.task_job_mgr.batch_syntax_checks = True
+        itasks = schd.pool.get_tasks()
+        for itask in itasks:
+            itask.waiting_on_job_prep = True
+
+        # the job files are written, the syntax check is pending
+        assert schd.task_job_mgr.prep_submit_task_jobs(
+            schd.workflow, itasks) == [[], []]
+        assert all(itask.waiting_on_job_prep for itask in itasks)
+
+        # wait for the syntax check to complete
+        while schd.proc_pool.is_not_done():
+            schd.proc_pool.process()
+            await asyncio.sleep(0.1)
+
+        prepared, bad = schd.task_job_mgr.prep_submit_task_jobs(
+            schd.workflow, itasks)
+        assert [itask.tdef.name for itask in prepared] == ['good']
+        assert [itask.tdef.name for itask in bad] == ['bad']
+        assert schd.task_job_mgr.job_file_writer.syntax_checks == {}
+
+
+async def test_batch_syntax_checks_task_removed(flow, scheduler, start):
+    """It should forget the syntax check of a task removed from the pool."""
+    id_ = flow({
+        'scheduling': {
+            'graph': {
+                'R1': 'foo'
+            }
+        },
+        'runtime': {
+            'foo': {
+                'script': 'true'
+            },
+        }
+    })
+    schd = scheduler(id_)
+    async with start(schd):
+        schd.task_job_mgr.batch_syntax_checks = True
+        job_file_writer = schd.task_job_mgr.job_file_writer
+        (itask,) = schd.pool.get_tasks()
+        itask.waiting_on_job_prep = True
+        assert schd.task_job_mgr.prep_submit_task_jobs(
+            schd.workflow, [itask]) == [[], []]
+        assert job_file_writer.syntax_checks
+        job_dir = Path(schd.workflow_run_dir, 'log', 'job', '1', 'foo')
+        assert list(job_dir.glob('**/*.tmp'))
+
+        # the task is removed whilst its syntax check is running
+        schd.pool.remove(itask, 'request')
+        assert job_file_writer.syntax_checks == {}
+        while schd.proc_pool.is_not_done():
+            schd.proc_pool.process()
+            await asyncio.sleep(0.1)
+        assert job_file_writer.syntax_checks == {}
+        # the temporary job file is removed
+        assert not list(job_dir.glob('**/*.tmp'))
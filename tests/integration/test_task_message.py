@@ -0,0 +1,86 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Test cylc.flow.task_message."""
+
+import asyncio
+
+from async_timeout import timeout
+import pytest
+
+from cylc.flow import task_message
+from cylc.flow.exceptions import ClientTimeout
+from cylc.flow.scheduler import Scheduler
+
+
+async def test_send_messages_batch(
+    one: Scheduler, start, monkeypatch
+):
+    """It should send the messages of many jobs in few requests."""
+    monkeypatch.setattr(task_message, 'MAX_BATCH_SIZE', 3)
+    batch = [
+        (f'1/foo/{ind:02d}', f'2000-01-01T00:00:{ind:02d}Z', [['INFO', 'x']])
+        for ind in range(1, 8)
+    ]
+    async with start(one):
+        received = []
+
+        def _put_messages(task_job, event_time, messages):
+            received.append((task_job, event_time, messages))
+            return (True, 'Messages queued')
+
+        monkeypatch.setattr(
+            one.server.resolvers, 'put_messages', _put_messages
+        )
+        requests = []
+        graphql = one.server.graphql
+
+        def _graphql(*args, **kwargs):
+            requests.append(args)
+            return graphql(*args, **kwargs)
+
+        monkeypatch.setattr(one.server, 'graphql', _graphql)
+        async with timeout(10):
+            # (the client is synchronous so run it in a thread)
+            await asyncio.get_running_loop().run_in_executor(
+                None,
+                task_message.send_messages_batch,
+                one.workflow,
+                batch,
+            )
+    assert received == batch
+    # 7 jobs in batches of up to 3
+    assert len(requests) == 3
+
+
+def test_send_messages_batch_errors(monkeypatch):
+    """A failed request should not stop the remaining ones being sent."""
+    monkeypatch.setattr(task_message, 'MAX_BATCH_SIZE', 1)
+    requests = []
+
+    def _client(command, kwargs):
+        requests.append(kwargs['variables']['taskJob'])
+        if len(requests) == 1:
+            raise ClientTimeout('timeout')
+
+    monkeypatch.setattr(task_message, 'get_client', lambda workflow: _client)
+    batch = [
+        (f'1/foo/{ind:02d}', '2000-01-01T00:00:00Z', [['INFO', 'x']])
+        for ind in range(1, 4)
+    ]
+    with pytest.raises(ClientTimeout):
+        task_message.send_messages_batch('myflow', batch)
+    assert requests == ['1/foo/01', '1/foo/02', '1/foo/03']
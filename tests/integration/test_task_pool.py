@@ -577,3 +577,79 @@ async def test_runahead_after_remove(
     # Should update after removing the first point.
     task_pool.remove_tasks(['1/*'])
     assert int(task_pool.runahead_limit_point) == 5
+
+
+async def test_tasks_by_name(
+    example_flow: Scheduler
+) -> None:
+    """The by-name index should track tasks added to and removed from the pool.
+
+    """
+    task_pool = example_flow.pool
+
+    def by_name():
+        return {
+            name: sorted(str(point) for point in points)
+            for name, points in task_pool.tasks_by_name.items()
+        }
+
+    assert by_name() == {
+        'foo': ['1', '2', '3', '4', '5'],
+        'bar': ['1', '2', '3', '4', '5'],
+        'pub': ['2'],
+    }
+    assert task_pool.get_task(IntegerPoint('2'), 'pub').identity == '2/pub'
+    assert task_pool.get_task(IntegerPoint('3'), 'pub') is None
+    assert task_pool._get_main_task_by_id('1/foo').identity == '1/foo'
+    # (2/pub is in the hidden pool)
+    assert task_pool._get_main_task_by_id('2/pub') is None
+
+    task_pool.remove_tasks(['*/foo', '2/pub'])
+    assert by_name() == {
+        'bar': ['1', '2', '3', '4', '5'],
+    }
+    assert task_pool.get_tasks_by_name('foo') == []
+    assert len(task_pool.get_tasks_by_name('bar')) == 5
+
+
+async def test_tasks_by_status(
+    example_flow: Scheduler
+) -> None:
+    """The status index should track the state of the main pool tasks."""
+    task_pool = example_flow.pool
+
+    def by_status(*statuses):
+        return get_task_ids(
+            (itask.tdef.name, itask.point)
+            for itask in task_pool.get_tasks_by_status(*statuses)
+        )
+
+    assert by_status(TASK_STATUS_WAITING) == get_task_ids(
+        (itask.tdef.name, itask.point) for itask in task_pool.get_tasks()
+    )
+    # (2/pub is in the hidden pool)
+    assert '2/pub' not in by_status(TASK_STATUS_WAITING)
+    assert by_status(TASK_STATUS_RUNNING) == []
+
+    itask = task_pool.get_task(IntegerPoint('1'), 'foo')
+    itask.state_reset(TASK_STATUS_RUNNING)
+    assert by_status(TASK_STATUS_RUNNING) == ['1/foo']
+    assert '1/foo' not in by_status(TASK_STATUS_WAITING)
+    assert itask in task_pool.get_updated_tasks()
+    assert not itask.state.is_updated
+    assert task_pool.get_updated_tasks() == []
+
+    # tasks released from the queues are counted as active
+    bar = task_pool.get_task(IntegerPoint('1'), 'bar')
+    bar.waiting_on_job_prep = True
+    assert list(task_pool.tasks_by_status.waiting_on_job_prep) == [bar]
+    released = task_pool.release_queued_tasks()
+    assert bar in released
+    assert set(released) == {
+        itask for itask in task_pool.get_tasks()
+        if itask.waiting_on_job_prep
+    }
+
+    task_pool.remove(itask)
+    assert by_status(TASK_STATUS_RUNNING) == []
+    assert itask.status_index is None
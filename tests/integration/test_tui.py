@@ -0,0 +1,70 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Test Tui against a running workflow."""
+
+import asyncio
+
+from async_timeout import timeout
+
+from cylc.flow.task_state import TASK_STATUS_WAITING
+from cylc.flow.tui.app import TuiApp
+
+
+async def test_tui_deltas(flow, scheduler, run, one_conf):
+    """Tui should take a snapshot of the workflow then follow the deltas."""
+    reg = flow(one_conf)
+    schd = scheduler(reg, paused_start=True)
+    async with run(schd):
+        app = TuiApp(schd.workflow)
+        loop = asyncio.get_running_loop()
+
+        # (the client makes blocking requests so use another thread)
+        snapshot = await loop.run_in_executor(None, app.get_snapshot)
+        assert snapshot['id_'] == schd.tokens.id
+        assert app.store.data['task_proxies'][
+            schd.tokens.duplicate(cycle='1', task='one').id
+        ].state == TASK_STATUS_WAITING
+        (cycle,) = snapshot['children']
+        (task,) = cycle['children']
+        assert task['data']['name'] == 'one'
+        assert not task['data']['isHeld']
+
+        # changes are picked up from the published deltas
+        schd.pool.hold_tasks(['1/one'])
+        async with timeout(5):
+            while True:
+                snapshot = await loop.run_in_executor(None, app.get_snapshot)
+                if snapshot:
+                    (task,) = snapshot['children'][0]['children']
+                    if task['data']['isHeld']:
+                        break
+                await asyncio.sleep(0.1)
+
+        # nothing to do if nothing has changed
+        await asyncio.sleep(0.5)
+        await loop.run_in_executor(None, app.get_snapshot)
+        # (the deltas reconcile with the workflow's checksums)
+        assert app.store.checksums == {
+            key: schd.data_store_mgr.checksums[key]
+            for key in app.store.checksums
+        }
+        assert await loop.run_in_executor(None, app.get_snapshot) is None
+
+        # unless the filters change
+        app.filter_by_task_state(TASK_STATUS_WAITING)
+        assert await loop.run_in_executor(None, app.get_snapshot)
+
+        app.disconnect()
@@ -109,3 +109,42 @@ async def test_db_upgrade_pre_803(
     # Restart should now succeed.
     async with start(schd):
         assert ('n_restart', '2') in db_select(schd, False, 'workflow_params')
+
+
+async def test_put_task_pool_incremental(flow, scheduler, start, db_select):
+    """put_task_pool should only write the rows which have changed."""
+    reg = flow({
+        'scheduler': {'allow implicit tasks': True},
+        'scheduling': {'graph': {'R1': 'a & b'}},
+    })
+    schd: Scheduler = scheduler(reg, paused_start=True)
+    async with start(schd):
+        db_mgr = schd.workflow_db_mgr
+        inserts = db_mgr.db_inserts_map[db_mgr.TABLE_TASK_POOL]
+        deletes = db_mgr.db_deletes_map[db_mgr.TABLE_TASK_POOL]
+        db_mgr.put_task_pool(schd.pool)
+        assert sorted(
+            db_select(schd, True, 'task_pool', 'name', 'is_held')
+        ) == [('a', 0), ('b', 0)]
+
+        # nothing has changed => nothing to write
+        db_mgr.put_task_pool(schd.pool)
+        assert not inserts
+        assert not deletes
+
+        # only the changed task should be written
+        schd.pool.hold_tasks(['1/a'])
+        db_mgr.put_task_pool(schd.pool)
+        assert [row['name'] for row in inserts] == ['a']
+        assert not deletes
+        assert sorted(
+            db_select(schd, True, 'task_pool', 'name', 'is_held')
+        ) == [('a', 1), ('b', 0)]
+
+        # only the removed task should be deleted
+        schd.pool.remove(schd.pool.get_task(schd.pool.get_min_point(), 'b'))
+        db_mgr.put_task_pool(schd.pool)
+        assert not inserts
+        assert deletes == [{'cycle': '1', 'name': 'b', 'flow_nums': '[1]'}]
+        assert db_select(schd, True, 'task_pool', 'name') == [('a',)]
+        assert not db_select(schd, False, 'task_prerequisites', name='b')
@@ -26,6 +26,7 @@ from cylc.flow.parsec.util import (
     listjoin,
     m_override,
     pdeepcopy,
+    poverlay,
     poverride,
     printcfg,
     replicate,
@@ -193,6 +194,40 @@ def test_poverride_prepend():
     assert target["name"] == expected
 
 
+# --- poverlay
+
+def test_poverlay():
+    base = OrderedDictWithDefaults()
+    base["name"] = OrderedDictWithDefaults()
+    base["name"]["index"] = 0
+    base["name"]["key"] = [5]
+    base["other"] = OrderedDictWithDefaults()
+    base["other"]["value"] = "water"
+    base.defaults_ = {"default": 1}
+    assert poverlay(base, None) is base  # harmless, returns the base
+
+    sparse = OrderedDictWithDefaults()
+    sparse["name"] = OrderedDictWithDefaults()
+    sparse["name"]["value"] = "oil"
+    sparse["name"]["key"] = [1, 2, 3, 4]
+    result = poverlay(base, sparse, prepend=True)
+
+    # the result is the same as a deep copy overridden by the sparse dict
+    expected = pdeepcopy(base)
+    poverride(expected, sparse, prepend=True)
+    assert dict(result.items()) == dict(expected.items())
+    assert list(result["name"]) == list(expected["name"])
+    assert result["default"] == 1
+
+    # the base is unchanged
+    assert base["name"] == {"index": 0, "key": [5]}
+
+    # the sections which are not overridden are shared with the base
+    assert result["other"] is base["other"]
+    assert result["name"] is not base["name"]
+    assert result["name"]["key"] is not sparse["name"]["key"]
+
+
 # -- m_override
 
 def test_m_override():
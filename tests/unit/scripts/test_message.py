@@ -0,0 +1,59 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Test logic in cylc-message script."""
+
+from io import StringIO
+
+import pytest
+
+from cylc.flow.exceptions import InputError
+from cylc.flow.option_parsers import Options
+from cylc.flow.scripts import message
+from cylc.flow.scripts.message import batch_main, get_option_parser
+
+
+Opts = Options(get_option_parser())
+
+
+def test_batch_main(monkeypatch):
+    """It should group the messages read from STDIN by job."""
+    monkeypatch.setattr(
+        message, 'parse_id', lambda id_, **_kwargs: (id_, None, None)
+    )
+    recorded = []
+    monkeypatch.setattr(
+        message,
+        'record_messages_batch',
+        lambda *args: recorded.append(args),
+    )
+    monkeypatch.setattr('sys.stdin', StringIO(
+        '1/a/01 started\n'
+        '\n'
+        '1/b/01 WARNING: hello world\n'
+        '1/a/01 succeeded\n'
+    ))
+    batch_main(Opts(batch=True), 'myflow')
+    assert recorded == [(
+        'myflow',
+        [
+            ('1/a/01', [['INFO', 'started'], ['INFO', 'succeeded']]),
+            ('1/b/01', [['WARNING', 'hello world']]),
+        ],
+    )]
+
+    monkeypatch.setattr('sys.stdin', StringIO('1/a/01\n'))
+    with pytest.raises(InputError):
+        batch_main(Opts(batch=True), 'myflow')
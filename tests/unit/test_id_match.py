@@ -294,6 +294,41 @@ def test_filter_ids_namespace_hierarchy(task_pool, ids, matched, not_matched):
     assert _not_matched == not_matched
 
 
+def test_filter_ids_tasks_by_name(task_pool):
+    """Ensure task names are looked up in the by-name index if provided."""
+    pool = task_pool(
+        {
+            1: ['1/a:x', '1/b:y'],
+            2: ['2/a:y', '2/b:x'],
+        },
+        {
+            'a': ['A'],
+            'b': ['A'],
+        },
+    )
+    tasks_by_name = {}
+    for itasks in pool.values():
+        for itask in itasks.values():
+            tasks_by_name.setdefault(itask.tdef.name, {})[itask.point] = itask
+
+    for ids, matched, not_matched in [
+        (['*/a'], ['1/a:x', '2/a:y'], []),
+        (['2/b'], ['2/b:x'], []),
+        (['*/a:y'], ['2/a:y'], []),
+        (['*/A'], ['1/a:x', '1/b:y', '2/a:y', '2/b:x'], []),
+        (['*/c'], [], ['*/c']),
+    ]:
+        _matched, _not_matched = filter_ids(
+            [pool], ids, tasks_by_name=tasks_by_name
+        )
+        assert [get_task_id(itask) for itask in _matched] == matched
+        assert _not_matched == not_matched
+
+    # the pool should not be searched for task names in the index
+    _matched, _ = filter_ids([{}], ['*/a'], tasks_by_name=tasks_by_name)
+    assert [get_task_id(itask) for itask in _matched] == ['1/a:x', '2/a:y']
+
+
 def test_filter_ids_out_format():
     filter_ids({}, [], out=IDTokens.Cycle)
     with pytest.raises(ValueError):
@@ -105,3 +105,38 @@ def test_queue_and_release(
     # check second assignment overrides first
     for group in expected_foo_groups:
         assert "foo" in queue_mgr.queues[group].members
+
+
+def test_queue_order_hold_and_remove():
+    """Test queued tasks are released in order, skipping held tasks."""
+    queue_mgr = IndepQueueManager(QCONFIG, ALL_TASK_NAMES, DESCENDANTS)
+    itasks = {}
+    for name in ["s1", "s2", "s3", "s4", "s5", "not-a-task"]:
+        itask = Mock()
+        itask.tdef.name = name
+        itask.state.is_held = name == "s1"
+        itasks[name] = itask
+        queue_mgr.push_task(itask)
+
+    # unknown task names are not queued
+    assert list(queue_mgr.queues["sml"].tasks) == [
+        itasks[name] for name in ["s1", "s2", "s3", "s4", "s5"]
+    ]
+
+    # tasks can be removed from anywhere in the queue
+    queue_mgr.remove_task(itasks["s3"])
+    queue_mgr.remove_task(itasks["not-a-task"])
+
+    # held tasks keep their place in the queue
+    active = Counter(["s5", "o1"])
+    released = queue_mgr.release_tasks(active)
+    assert [r.tdef.name for r in released] == ["s2", "s4"]
+    assert active == Counter(["s5", "o1", "s2", "s4"])
+    assert list(queue_mgr.queues["sml"].tasks) == [
+        itasks["s1"], itasks["s5"]
+    ]
+
+    itasks["s1"].state.is_held = False
+    released = queue_mgr.release_tasks(Counter(["s5"]))
+    assert [r.tdef.name for r in released] == ["s1", "s5"]
+    assert not queue_mgr.queues["sml"].tasks
@@ -22,6 +22,7 @@ import io
 import os
 from pathlib import Path
 import pytest
+from subprocess import run
 from tempfile import NamedTemporaryFile
 from textwrap import dedent
 
@@ -439,6 +440,25 @@ def test_write_runtime_environment():
         assert(fake_file.getvalue() == expected)
 
 
+def test_write_runtime_environment_cached():
+    """Test the runtime environment is rendered once for equal configs."""
+    JobFileWriter._render_runtime_environment.cache_clear()
+    job_file_writer = JobFileWriter()
+    results = []
+    for _ in range(2):
+        job_conf = {
+            'environment': {'sheep': '~baa/baa', 'duck': 'quack%(i)d'},
+            'param_var': {'i': 1},
+        }
+        with io.StringIO() as fake_file:
+            job_file_writer._write_runtime_environment(fake_file, job_conf)
+            results.append(fake_file.getvalue())
+    assert results[0] == results[1]
+    assert 'duck="quack1"' in results[0]
+    cache_info = JobFileWriter._render_runtime_environment.cache_info()
+    assert (cache_info.hits, cache_info.misses) == (1, 1)
+
+
 def test_write_epilogue():
     """Test epilogue is correctly written in jobscript"""
     expected = '\n' + dedent('''
@@ -533,3 +553,87 @@ def test_homeless_platform(fixture_get_platform):
         job_sh_txt = job_sh.read()
         if 'HOME' in job_sh_txt:
             raise Exception('$HOME found in job.sh\n{job_sh_txt}')
+
+
+def test_write_deferred(fixture_get_platform, tmp_path):
+    """Test job files can be syntax checked in a batch."""
+    def _job_conf(job_d, script):
+        return {
+            "platform": fixture_get_platform(),
+            "task_id": job_d.rsplit('/', 1)[0],
+            "workflow_name": "b",
+            "work_d": "c/d",
+            "uuid_str": "e",
+            'environment': {},
+            "job_d": job_d,
+            "try_num": 1,
+            "flow_nums": {1},
+            "param_var": {},
+            "execution_time_limit": None,
+            "namespace_hierarchy": [],
+            "dependencies": [],
+            "init-script": "",
+            "env-script": "",
+            "err-script": "",
+            "pre-script": "",
+            "script": script,
+            "post-script": "",
+            "exit-script": "",
+        }
+
+    job_file_writer = JobFileWriter(cache_syntax_checks=True)
+    good = str(tmp_path / 'good')
+    bad = str(tmp_path / 'bad')
+    assert not job_file_writer.write_deferred(
+        good, _job_conf('1/a/01', 'echo good'))
+    assert not job_file_writer.write_deferred(
+        bad, _job_conf('1/b/01', 'if true; then'))
+    assert job_file_writer.syntax_checks == {good: None, bad: None}
+
+    # check both job files with one command
+    ctx, job_files = job_file_writer.get_syntax_check_ctx()
+    assert job_file_writer.get_syntax_check_ctx() is None
+    proc = run(
+        ctx.cmd,
+        input=ctx.cmd_kwargs['stdin_str'],
+        capture_output=True,
+        text=True,
+    )
+    ctx.ret_code, ctx.out, ctx.err = proc.returncode, proc.stdout, proc.stderr
+    job_file_writer.syntax_check_callback(ctx, job_files)
+
+    assert job_file_writer.syntax_checks[good] is True
+    assert os.access(good, os.X_OK)
+    error = job_file_writer.syntax_checks[bad]
+    assert isinstance(error, RuntimeError)
+    assert 'syntax error' in str(error)
+    assert not os.path.exists(bad)
+    # the temporary file is left behind for debugging
+    assert os.path.exists(f'{bad}.tmp')
+
+    # the result for the good script is cached
+    good2 = str(tmp_path / 'good2')
+    assert job_file_writer.write_deferred(
+        good2, _job_conf('2/a/01', 'echo good'))
+    assert os.path.exists(good2)
+
+    # the check must not run any part of the job script
+    executed = tmp_path / 'executed'
+    injected = str(tmp_path / 'injected')
+    assert not job_file_writer.write_deferred(
+        injected,
+        _job_conf(
+            '3/a/01', f'echo hi\n}}\n}}\ntouch {executed}\nf() {{\ng() {{'
+        ),
+    )
+    ctx, job_files = job_file_writer.get_syntax_check_ctx()
+    proc = run(
+        ctx.cmd,
+        input=ctx.cmd_kwargs['stdin_str'],
+        capture_output=True,
+        text=True,
+    )
+    ctx.ret_code, ctx.out, ctx.err = proc.returncode, proc.stdout, proc.stderr
+    job_file_writer.syntax_check_callback(ctx, job_files)
+    assert isinstance(job_file_writer.syntax_checks[injected], RuntimeError)
+    assert not executed.exists()
@@ -0,0 +1,97 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import io
+import json
+import os
+from subprocess import Popen
+
+from cylc.flow.cylc_subproc import procopen
+from cylc.flow.job_runner_mgr import JobRunnerManager
+from cylc.flow.task_job_logs import JOB_LOG_STATUS
+
+
+def test_jobs_poll_runner(tmp_path, capsys):
+    """It should mark only the jobs no longer in the job runner as exited."""
+    # a process which has definitely finished
+    proc = Popen(['true'])
+    proc.wait()
+    job_ids = {'1/live/01': str(os.getpid()), '1/gone/01': str(proc.pid)}
+    for job_log_dir, job_id in job_ids.items():
+        (tmp_path / job_log_dir).mkdir(parents=True)
+        (tmp_path / job_log_dir / JOB_LOG_STATUS).write_text(
+            f'{JobRunnerManager.CYLC_JOB_RUNNER_NAME}=background\n'
+            f'{JobRunnerManager.CYLC_JOB_ID}={job_id}\n'
+        )
+
+    JobRunnerManager().jobs_poll(str(tmp_path), list(job_ids))
+
+    summaries = {}
+    for line in capsys.readouterr().out.splitlines():
+        _, job_log_dir, summary = line.split('|', 2)
+        summaries[job_log_dir] = json.loads(summary)
+    assert summaries['1/live/01']['job_runner_exit_polled'] == 0
+    assert summaries['1/gone/01']['job_runner_exit_polled'] == 1
+    # the poll result should be recorded in the status file
+    assert JobRunnerManager.CYLC_JOB_RUNNER_EXIT_POLLED in (
+        tmp_path / '1/gone/01' / JOB_LOG_STATUS
+    ).read_text()
+    assert JobRunnerManager.CYLC_JOB_RUNNER_EXIT_POLLED not in (
+        tmp_path / '1/live/01' / JOB_LOG_STATUS
+    ).read_text()
+
+
+def test_jobs_poll_runner_large_output(tmp_path, capsys, monkeypatch):
+    """It should stream a large poll output through a buffered pipe."""
+    poll_cmd = tmp_path / 'poll'
+    poll_cmd.write_text('#!/bin/sh\nseq 200000\necho live\n')
+    poll_cmd.chmod(0o755)
+
+    class FakeRunner:
+        POLL_CMD = str(poll_cmd)
+
+    job_ids = {'1/live/01': 'live', '1/gone/01': 'gone'}
+    for job_log_dir, job_id in job_ids.items():
+        (tmp_path / job_log_dir).mkdir(parents=True)
+        (tmp_path / job_log_dir / JOB_LOG_STATUS).write_text(
+            f'{JobRunnerManager.CYLC_JOB_RUNNER_NAME}=fake\n'
+            f'{JobRunnerManager.CYLC_JOB_ID}={job_id}\n'
+        )
+
+    procs = []
+
+    def _procopen(*args, **kwargs):
+        proc = procopen(*args, **kwargs)
+        procs.append(proc)
+        return proc
+
+    monkeypatch.setattr(
+        'cylc.flow.job_runner_mgr.procopen', _procopen
+    )
+    job_runner_mgr = JobRunnerManager()
+    monkeypatch.setattr(
+        job_runner_mgr, '_get_sys', lambda _name: FakeRunner
+    )
+    job_runner_mgr.jobs_poll(str(tmp_path), list(job_ids))
+
+    # (an unbuffered pipe would be read one byte at a time)
+    assert [type(proc.stdout) for proc in procs] == [io.BufferedReader]
+    summaries = {}
+    for line in capsys.readouterr().out.splitlines():
+        _, job_log_dir, summary = line.split('|', 2)
+        summaries[job_log_dir] = json.loads(summary)
+    assert summaries['1/live/01']['job_runner_exit_polled'] == 0
+    assert summaries['1/gone/01']['job_runner_exit_polled'] == 1
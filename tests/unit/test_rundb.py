@@ -153,3 +153,96 @@ def test_context_manager_exit(
         mock_close.assert_called_once()
     # Close connection for real:
     dao.close()
+
+
+def test_persistent_connection(tmp_path: Path):
+    """Test persistent connections stay open and use WAL mode."""
+    db_file = tmp_path / 'db'
+    dao = CylcWorkflowDAO(db_file, create_tables=True, persistent=True)
+    conn = dao.connect()
+    assert list(conn.execute('PRAGMA journal_mode')) == [('wal',)]
+    dao.add_insert_item(
+        CylcWorkflowDAO.TABLE_WORKFLOW_PARAMS, {'key': 'a', 'value': 'b'})
+    dao.execute_queued_items()
+    # the connection should not have been closed
+    assert dao.conn is conn
+    # the change should be visible to other connections
+    with CylcWorkflowDAO(db_file) as other:
+        assert list(
+            other.connect().execute('SELECT * FROM workflow_params')
+        ) == [('a', 'b')]
+    dao.close()
+
+
+def test_persistent_connection_file_removed(tmp_path: Path):
+    """Test persistent connections detect removal of the DB file."""
+    db_dir = tmp_path / 'srv'
+    db_dir.mkdir()
+    db_file = db_dir / 'db'
+    dao = CylcWorkflowDAO(db_file, create_tables=True, persistent=True)
+    dao.connect()
+    # remove the directory containing the DB
+    for path in db_dir.iterdir():
+        path.unlink()
+    db_dir.rmdir()
+    dao.add_insert_item(
+        CylcWorkflowDAO.TABLE_WORKFLOW_PARAMS, {'key': 'a', 'value': 'b'})
+    with pytest.raises(sqlite3.OperationalError):
+        dao.execute_queued_items()
+    dao.close()
+
+
+def test_index_creation(tmp_path: Path):
+    """Test indexes are created along with their tables."""
+    db_file = tmp_path / 'db'
+    stmt = (
+        "SELECT name FROM sqlite_master"
+        " WHERE type='index' AND name NOT LIKE 'sqlite_autoindex_%'"
+    )
+    with CylcWorkflowDAO(db_file, create_tables=True) as dao:
+        indexes = {i[0] for i in dao.connect().execute(stmt)}
+    assert indexes == set(CylcWorkflowDAO.INDEXES)
+
+
+def test_select_for_datastore(tmp_path: Path):
+    """Test the datastore history loads match on cycle, name (& flow)."""
+    db_file = tmp_path / 'db'
+    with CylcWorkflowDAO(db_file, create_tables=True) as dao:
+        conn = dao.connect()
+        for cycle, name in [
+            ('20000101T0000Z', 'a'),
+            ('20000101T0000Z', 'b'),
+            ('20000102T0000Z', 'a'),
+        ]:
+            conn.execute(
+                "INSERT INTO task_states VALUES"
+                " (?, ?, '[1]', '', '', 1, 'succeeded', 0, 0)",
+                [name, cycle],
+            )
+            conn.execute(
+                "INSERT INTO task_prerequisites VALUES"
+                " (?, ?, '[1]', 'x', ?, 'succeeded', 'satisfied naturally')",
+                [cycle, name, cycle],
+            )
+            conn.execute(
+                "INSERT INTO task_jobs (cycle, name, submit_num)"
+                " VALUES (?, ?, 1)",
+                [cycle, name],
+            )
+        conn.commit()
+
+        assert [
+            row[:2] for row in dao.select_tasks_for_datastore(
+                ['20000101T0000Z/a', '20000102T0000Z/a', '20000103T0000Z/a']
+            )
+        ] == [('20000101T0000Z', 'a'), ('20000102T0000Z', 'a')]
+        assert [
+            row[:2] for row in dao.select_jobs_for_datastore(
+                ['20000101T0000Z/b']
+            )
+        ] == [('20000101T0000Z', 'b')]
+        assert [
+            row[:2] for row in dao.select_prereqs_for_datastore(
+                ['20000101T0000Z/a/[1]', '20000102T0000Z/a/[2]']
+            )
+        ] == [('20000101T0000Z', 'a')]
@@ -18,6 +18,7 @@ from tempfile import (
     NamedTemporaryFile, SpooledTemporaryFile, TemporaryFile,
     TemporaryDirectory
 )
+import json
 import unittest
 import pytest
 
@@ -25,9 +26,15 @@ from pathlib import Path
 from types import SimpleNamespace
 
 from cylc.flow import LOG
+from cylc.flow.async_util import Wakeup
 from cylc.flow.task_events_mgr import TaskJobLogsRetrieveContext
 from cylc.flow.subprocctx import SubProcContext
-from cylc.flow.subprocpool import SubProcPool, _XTRIG_FUNCS, get_func
+from cylc.flow.subprocpool import (
+    SubProcPool,
+    _XTRIG_FUNCS,
+    get_func,
+    run_function_in_executor,
+)
 
 
 class TestSubProcPool(unittest.TestCase):
@@ -354,3 +361,84 @@ def test_rsync_255_fail(mock_ctx, expect, ctx_kwargs):
         }
     )
     assert output == expect
+
+
+async def test_asyncio_subprocs():
+    """Commands should run as asyncio subprocesses if use_asyncio is set."""
+    wakeup = Wakeup()
+    wakeup.bind()
+    pool = SubProcPool(use_asyncio=True, wakeup=wakeup)
+    pool.size = 2
+    done = []
+
+    def callback(ctx):
+        done.append(ctx)
+
+    for ind in range(3):
+        pool.put_command(
+            SubProcContext(
+                ind,
+                ['bash', '-c', f'echo out{ind}; echo err{ind} >&2; exit {ind}']
+            ),
+            callback=callback,
+        )
+    # commands start immediately (up to the pool size)
+    assert len(pool.async_runnings) == 2
+    assert len(pool.queuings) == 1
+    assert not pool.is_polling()
+
+    # and call back when done (without calling process())
+    await wakeup.wait(10)
+    await pool.async_wait()
+    assert not pool.is_not_done()
+    assert sorted(
+        (ctx.cmd_key, ctx.ret_code, ctx.out, ctx.err) for ctx in done
+    ) == [
+        (0, 0, 'out0\n', 'err0\n'),
+        (1, 1, 'out1\n', 'err1\n'),
+        (2, 2, 'out2\n', 'err2\n'),
+    ]
+
+
+async def test_asyncio_subprocs_timeout():
+    """Asyncio subprocesses should be killed on timeout."""
+    pool = SubProcPool(use_asyncio=True)
+    pool.proc_pool_timeout = 0.5
+    done = []
+    pool.put_command(
+        SubProcContext('sleep', ['bash', '-c', 'echo start; sleep 10']),
+        callback=done.append,
+    )
+    await pool.async_wait()
+    (ctx,) = done
+    assert ctx.ret_code == -9
+    assert ctx.out == 'start\n'
+    assert 'killed on timeout (0.5)' in ctx.err
+
+
+async def test_asyncio_subprocs_callback_error():
+    """Errors in callbacks should be raised by process()."""
+    pool = SubProcPool(use_asyncio=True)
+
+    def callback(ctx):
+        raise ValueError('oops')
+
+    pool.put_command(SubProcContext('true', ['true']), callback=callback)
+    await pool.async_wait()
+    with pytest.raises(ValueError, match='oops'):
+        pool.process()
+
+
+def test_run_function_in_executor():
+    """It should return what "cylc function-run" would."""
+    ret_code, out, err = run_function_in_executor(
+        'echo', '["a"]', '{"succeed": true}', ''
+    )
+    assert ret_code == 0
+    assert json.loads(out) == [True, {'succeed': True}]
+    assert 'echo: ARGS:' in err
+
+    ret_code, out, err = run_function_in_executor('echo', '[', '{}', '')
+    assert ret_code == 1
+    assert out == ''
+    assert 'JSONDecodeError' in err
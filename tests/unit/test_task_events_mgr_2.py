@@ -99,3 +99,36 @@ def test_get_workflow_platforms_conf(broadcast, workflow, platforms, expected):
         task_events_mgr._get_workflow_platforms_conf(itask, KEY) ==
         expected
     )
+
+
+def test_get_next_due_time():
+    """Test TaskEventsManager.get_next_due_time()."""
+    task_events_mgr = TaskEventsManager(
+        None, None, None, None, None, None, None, None, None)
+    assert task_events_mgr.get_next_due_time([]) is None
+
+    itasks = [
+        Mock(timeout=None, poll_timer=None),
+        Mock(timeout=30, poll_timer=Mock(timeout=20)),
+        Mock(timeout=None, poll_timer=Mock(timeout=None)),
+    ]
+    assert task_events_mgr.get_next_due_time(itasks) == 20
+
+    # waiting event timers are not due
+    mail = TaskEventsManager.HANDLER_MAIL
+    task_events_mgr._event_timers = {
+        'a': Mock(is_waiting=True, timeout=5),
+        'b': Mock(is_waiting=False, timeout=10),
+        'c': Mock(is_waiting=False, timeout=2, ctx=Mock(ctx_type=mail)),
+    }
+    assert task_events_mgr.get_next_due_time(itasks) == 2
+
+    # mail notifications are held back until the next mail time
+    task_events_mgr.next_mail_time = 8
+    assert task_events_mgr.get_next_due_time(itasks) == 8
+    task_events_mgr.next_mail_time = 1
+    assert task_events_mgr.get_next_due_time(itasks) == 2
+    task_events_mgr.next_mail_time = 15
+    assert task_events_mgr.get_next_due_time(itasks) == 10
+    # ... unless the workflow is stopping
+    assert task_events_mgr.get_next_due_time(itasks, stop_mode=True) == 2
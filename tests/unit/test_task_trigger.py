@@ -14,6 +14,8 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from unittest.mock import Mock
+
 from cylc.flow.cycling.loader import get_point, get_sequence
 from cylc.flow.task_trigger import TaskTrigger, Dependency
 from cylc.flow.task_outputs import TaskOutputs
@@ -171,3 +173,45 @@ def test_str(set_cycling_type):
 
     trigger = TaskTrigger('name', None, 'output')
     assert str(trigger) == 'name:output'
+
+
+def test_get_prerequisite_conditional(set_cycling_type):
+    """Conditional expressions should be compiled once per dependency."""
+    set_cycling_type()
+    one = get_point('1')
+    two = get_point('2')
+    tdef = Mock(
+        start_point=one, initial_point=one, max_future_prereq_offset=None
+    )
+
+    a = TaskTrigger('a', None, 'succeeded')
+    b = TaskTrigger('b', '-P1', 'succeeded')
+    c = TaskTrigger('c', None, 'failed')
+    dependency = Dependency([a, '|', [b, '&', c]], [a, b, c], False)
+
+    prereq_1 = dependency.get_prerequisite(one, tdef)
+    prereq_2 = dependency.get_prerequisite(two, tdef)
+    assert prereq_1.conditional_expression is not None
+    assert (
+        prereq_1.conditional_expression is prereq_2.conditional_expression
+    )
+    assert prereq_2.get_raw_conditional_expression() == (
+        '2/a succeeded|(1/b succeeded&2/c failed)'
+    )
+
+    assert not prereq_2.is_satisfied()
+    prereq_2.satisfy_me({('1', 'b', 'succeeded')})
+    assert not prereq_2.is_satisfied()
+    prereq_2.satisfy_me({('2', 'c', 'failed')})
+    assert prereq_2.is_satisfied()
+
+    # (0/b is pre-initial)
+    assert not prereq_1.is_satisfied()
+    prereq_1.satisfy_me({('1', 'c', 'failed')})
+    assert prereq_1.is_satisfied()
+
+    # all-of dependencies need no expression
+    dependency = Dependency([a, '&', c], [a, c], False)
+    assert dependency.get_prerequisite(one, tdef).conditional_expression is (
+        None
+    )
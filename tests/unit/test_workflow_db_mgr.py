@@ -18,12 +18,16 @@
 Tests for worklfow_db_manager
 """
 
+from contextlib import closing
 import pytest
 import sqlite3
+from threading import Event, Thread
+from time import sleep, time
 
 from cylc.flow.exceptions import CylcError, ServiceFileError
 from cylc.flow.workflow_db_mgr import (
     CylcWorkflowDAO,
+    PublicDatabaseWriter,
     WorkflowDatabaseManager,
 )
 
@@ -97,6 +101,24 @@ def test_upgrade_pre_810_pass_on_single_flow(_setup_db):
     assert result == '[1]'
 
 
+def test_upgrade_pre_820(_setup_db):
+    """It should add the indexes to the tables of an existing DB."""
+    db_file_name = _setup_db([])
+    stmt = (
+        "SELECT name FROM sqlite_master"
+        " WHERE type='index' AND name NOT LIKE 'sqlite_autoindex_%'"
+    )
+    with CylcWorkflowDAO(db_file_name, create_tables=True) as dao:
+        # (indexes of tables missing from the old DB are created with them)
+        assert 'task_states_cycle_name_status' not in {
+            row[0] for row in dao.connect().execute(stmt)
+        }
+        WorkflowDatabaseManager.upgrade_pre_820(dao)
+        assert {
+            row[0] for row in dao.connect().execute(stmt)
+        } == set(CylcWorkflowDAO.INDEXES)
+
+
 def test_check_workflow_db_compat(_setup_db, capsys):
     """method can pick private or public db to check.
     """
@@ -116,3 +138,129 @@ def test_check_workflow_db_compat(_setup_db, capsys):
 
     with pytest.raises(ServiceFileError, match='99.99'):
         WorkflowDatabaseManager.check_db_compatibility(pri_path)
+
+
+def test_copy_pri_to_pub_persistent(tmp_path):
+    """The public DB should be a complete, non-WAL copy of a WAL private DB.
+    """
+    (tmp_path / 'pri').mkdir()
+    (tmp_path / 'pub').mkdir()
+    db_mgr = WorkflowDatabaseManager(
+        tmp_path / 'pri', tmp_path / 'pub', pri_persistent=True
+    )
+    db_mgr.on_workflow_start(is_restart=False)
+    db_mgr.put_workflow_params_1('foo', 'bar')
+    db_mgr.process_queued_ops()
+    assert db_mgr.pri_dao.conn is not None
+    db_mgr.copy_pri_to_pub()
+    with CylcWorkflowDAO(db_mgr.pub_path) as pub_dao:
+        conn = pub_dao.connect()
+        assert list(conn.execute('PRAGMA journal_mode')) == [('delete',)]
+        assert ('foo', 'bar') in list(
+            conn.execute('SELECT * FROM workflow_params')
+        )
+    db_mgr.on_workflow_shutdown()
+
+
+def test_pub_writer_thread(tmp_path):
+    """Public DB writes should be made by the writer thread."""
+    (tmp_path / 'pri').mkdir()
+    (tmp_path / 'pub').mkdir()
+    db_mgr = WorkflowDatabaseManager(
+        tmp_path / 'pri', tmp_path / 'pub', pub_thread=True
+    )
+    db_mgr.on_workflow_start(is_restart=False)
+    assert db_mgr.pub_writer.thread.is_alive()
+    db_mgr.put_workflow_params_1('foo', 'bar')
+    db_mgr.process_queued_ops()
+    # the statements should have been handed over to the writer thread
+    assert not any(
+        table.insert_queue for table in db_mgr.pub_dao.tables.values()
+    )
+    writer = db_mgr.pub_writer
+    db_mgr.on_workflow_shutdown()
+    assert not writer.thread.is_alive()
+    with CylcWorkflowDAO(db_mgr.pub_path) as pub_dao:
+        assert ('foo', 'bar') in list(
+            pub_dao.connect().execute('SELECT * FROM workflow_params')
+        )
+
+
+def test_pub_writer_recovery(tmp_path, monkeypatch, caplog):
+    """The writer thread should recover a stuck public DB from the private.
+    """
+    pri_path = tmp_path / 'pri'
+    pub_path = tmp_path / 'pub'
+    with CylcWorkflowDAO(pri_path, create_tables=True) as pri_dao:
+        pri_dao.add_insert_item(
+            CylcWorkflowDAO.TABLE_WORKFLOW_PARAMS, {'key': 'a', 'value': 'b'})
+        pri_dao.execute_queued_items()
+    pub_path.touch()
+    monkeypatch.setattr(CylcWorkflowDAO, 'MAX_TRIES', 2)
+    monkeypatch.setattr(PublicDatabaseWriter, 'RETRY_INTERVAL', 0.01)
+    writer = PublicDatabaseWriter(str(pub_path), str(pri_path))
+    writer.start()
+    # the public DB has no tables so this will fail
+    writer.put([(
+        'INSERT OR REPLACE INTO workflow_params VALUES(?, ?)',
+        [('a', 'b')],
+    )])
+    for _ in range(100):
+        if any('recovered from' in msg for msg in caplog.messages):
+            break
+        sleep(0.05)
+    writer.stop()
+    with CylcWorkflowDAO(pub_path) as pub_dao:
+        assert list(
+            pub_dao.connect().execute('SELECT * FROM workflow_params')
+        ) == [('a', 'b')]
+
+
+def test_pub_writer_recovery_busy(tmp_path):
+    """Recovery should complete whilst the private DB is being written to."""
+    pri_path = tmp_path / 'pri'
+    pub_path = tmp_path / 'pub'
+    with CylcWorkflowDAO(pri_path, create_tables=True) as pri_dao:
+        # (bigger than a few pages)
+        for index in range(4000):
+            pri_dao.add_insert_item(
+                CylcWorkflowDAO.TABLE_WORKFLOW_PARAMS,
+                {'key': str(index), 'value': 'x' * 4096},
+            )
+        pri_dao.execute_queued_items()
+    pub_path.touch()
+    writer = PublicDatabaseWriter(str(pub_path), str(pri_path))
+
+    stop = Event()
+
+    def _write():
+        with closing(sqlite3.connect(pri_path)) as conn:
+            while not stop.is_set():
+                conn.execute(
+                    'INSERT OR REPLACE INTO workflow_params VALUES(?, ?)',
+                    ('busy', str(time())),
+                )
+                conn.commit()
+                sleep(0.001)
+
+    results = []
+    writer_thread = Thread(target=_write, daemon=True)
+    recover_thread = Thread(
+        target=lambda: results.append(writer._recover_from_pri()),
+        daemon=True,
+    )
+    writer_thread.start()
+    try:
+        recover_thread.start()
+        recover_thread.join(30)
+        assert results == [True]
+    finally:
+        stop.set()
+        writer_thread.join()
+        recover_thread.join()
+    with CylcWorkflowDAO(pub_path) as pub_dao:
+        assert list(
+            pub_dao.connect().execute(
+                'SELECT value FROM workflow_params WHERE key == "0"'
+            )
+        ) == [('x' * 4096,)]
@@ -14,10 +14,13 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from concurrent.futures import Future
 import logging
 import pytest
+from unittest.mock import Mock
 
 from cylc.flow import CYLC_LOG
+from cylc.flow.async_util import Wakeup
 from cylc.flow.cycling.iso8601 import ISO8601Point, ISO8601Sequence, init
 from cylc.flow.exceptions import XtriggerConfigError
 from cylc.flow.id import Tokens
@@ -336,3 +339,54 @@ def test_check_xtriggers(xtrigger_mgr):
     xtrigger_mgr.check_xtriggers(itask1, lambda foo: None)
     # won't be satisfied, as it is async, we are are not calling callback
     assert not xtrigger_mgr.sat_xtrig
+
+
+async def test_call_xtriggers_in_executor(xtrigger_mgr, tmp_path):
+    """Executor safe functions should be called in the executor."""
+    xtrigger_mgr.executor_size = 1
+    xtrigger_mgr.workflow_run_dir = str(tmp_path)
+    wakeup = xtrigger_mgr.wakeup = Wakeup()
+    wakeup.bind()
+    put_command = xtrigger_mgr.proc_pool.put_command = Mock()
+
+    echo_xtrig = SubFuncContext(
+        label="echo_1",
+        func_name="echo",
+        func_args=[],
+        func_kwargs={"succeed": True},
+    )
+    xtrigger_mgr.add_trig("echo_1", echo_xtrig, str(tmp_path))
+    tdef = TaskDef(
+        name="foo",
+        rtcfg=None,
+        run_mode="live",
+        start_point=1,
+        initial_point=1
+    )
+    init()
+    sequence = ISO8601Sequence('P1D', '2000')
+    tdef.xtrig_labels[sequence] = ["echo_1"]
+    itask = TaskProxy(Tokens('~user/workflow'), tdef, ISO8601Point('2019'))
+
+    try:
+        xtrigger_mgr.call_xtriggers_async(itask)
+        assert len(xtrigger_mgr.active) == 1
+        assert await wakeup.wait(60)
+    finally:
+        xtrigger_mgr.shutdown()
+    # the function was not run via the process pool
+    assert put_command.call_count == 0
+    assert len(xtrigger_mgr.active) == 0
+    assert xtrigger_mgr.sat_xtrig == {'echo(succeed=True)': {'succeed': True}}
+
+
+def test_shutdown_cancels_pending_calls(xtrigger_mgr):
+    """Shutdown should cancel executor calls which have not started."""
+    executor = xtrigger_mgr.executor = Mock()
+    pending = Future()
+    xtrigger_mgr.executor_futures.add(pending)
+    xtrigger_mgr.shutdown()
+    assert pending.cancelled()
+    # (cancel_futures is not available before Python 3.9)
+    executor.shutdown.assert_called_once_with(wait=False)
+    assert xtrigger_mgr.executor is None
@@ -16,7 +16,12 @@
 
 
 import cylc.flow.tui.data
-from cylc.flow.tui.data import generate_mutation
+from cylc.flow.data_messages_pb2 import (  # type: ignore
+    AllDeltas,
+    PbEntireWorkflow,
+)
+from cylc.flow.data_store_mgr import TASK_PROXIES, generate_checksum
+from cylc.flow.tui.data import TuiStore, generate_mutation
 
 
 def test_generate_mutation(monkeypatch):
@@ -36,3 +41,30 @@ def test_generate_mutation(monkeypatch):
             }
         }
     '''
+
+
+def test_apply_deltas_checksum():
+    """It should request a re-sync if the checksums don't match."""
+    entire_workflow = PbEntireWorkflow()
+    for id_ in ('1/a', '1/b'):
+        entire_workflow.task_proxies.add(id=id_, stamp=f'{id_}@1')
+    store = TuiStore()
+    store.sync(entire_workflow.SerializeToString())
+    assert store.checksums[TASK_PROXIES] == generate_checksum(
+        ['1/a@1', '1/b@1']
+    )
+
+    # a delta which brings the store into line with the workflow
+    deltas = AllDeltas()
+    deltas.task_proxies.time = 1
+    deltas.task_proxies.updated.add(id='1/a', stamp='1/a@2')
+    deltas.task_proxies.checksum = generate_checksum(['1/a@2', '1/b@1'])
+    assert store.apply_deltas(deltas.SerializeToString())
+    assert store.checksums[TASK_PROXIES] == deltas.task_proxies.checksum
+
+    # a delta which follows one the store has missed
+    deltas = AllDeltas()
+    deltas.task_proxies.time = 3
+    deltas.task_proxies.updated.add(id='1/a', stamp='1/a@4')
+    deltas.task_proxies.checksum = generate_checksum(['1/a@4', '1/b@3'])
+    assert not store.apply_deltas(deltas.SerializeToString())
@@ -0,0 +1,110 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from cylc.flow.tui.app import TuiApp
+from cylc.flow.tui.tree import rerender_running_tasks
+from cylc.flow.tui.util import compute_tree
+
+
+def get_flow(tasks):
+    """Return GraphQL style data for a workflow with the given tasks."""
+    return {
+        'id': '~u/w',
+        'name': 'w',
+        'status': 'running',
+        'stateTotals': {},
+        'cyclePoints': [{
+            'id': '~u/w//1/root',
+            'cyclePoint': '1',
+            'state': 'waiting',
+            'isHeld': False,
+            'isQueued': False,
+            'isRunahead': False,
+        }],
+        'familyProxies': [],
+        'taskProxies': [
+            {
+                'id': f'~u/w//1/{name}',
+                'name': name,
+                'cyclePoint': '1',
+                'state': state,
+                'isHeld': False,
+                'isQueued': False,
+                'isRunahead': False,
+                'firstParent': {'id': '~u/w//1/root', 'name': 'root'},
+                'jobs': [],
+                'task': {'meanElapsedTime': None},
+            }
+            for name, state in tasks.items()
+        ],
+    }
+
+
+def get_text(node):
+    """Return the text displayed for a node."""
+    return b''.join(node.get_widget().render((80,)).text).decode()
+
+
+def test_update_tree():
+    """It should patch the tree in place, preserving the display state."""
+    app = TuiApp('w')
+    app.update_tree(compute_tree(get_flow({'a': 'waiting', 'b': 'waiting'})))
+    root = app.tree_walker.get_focus()[1]
+    cycle = root.get_first_child()
+    task_a = cycle.get_first_child()
+    task_b = cycle.get_last_child()
+    assert 'a' in get_text(task_a)
+    widget_b = task_b.get_widget()
+    text_b = get_text(task_b)
+
+    # collapse the cycle and focus on the first task
+    cycle.get_widget().expanded = False
+    app.listbox._body.set_focus(task_a)
+
+    # task "a" is removed, task "b" changes state
+    app.update_tree(compute_tree(get_flow({'b': 'running'})))
+    assert app.tree_walker.get_focus()[1].get_root() is root
+    assert cycle.get_first_child() is task_b
+    assert task_b.get_key() == 0
+    assert task_b.get_widget() is widget_b
+    assert get_text(task_b) != text_b
+    assert task_b.get_value()['data']['state'] == 'running'
+
+    # the collapse state is preserved
+    assert not cycle.get_widget().expanded
+
+    # the focus moves to the parent of the removed task
+    assert app.tree_walker.get_focus()[1] is cycle
+
+    # a new task is loaded on demand
+    app.update_tree(compute_tree(get_flow({'b': 'running', 'c': 'waiting'})))
+    assert cycle.get_last_child().get_value()['id_'] == '~u/w//1/c'
+
+
+def test_rerender_running_tasks():
+    """It should re-render the widgets of running tasks only."""
+    app = TuiApp('w')
+    app.update_tree(compute_tree(get_flow({'a': 'waiting', 'b': 'running'})))
+    root = app.tree_walker.get_focus()[1]
+    cycle = root.get_first_child()
+    task_a = cycle.get_first_child()
+    task_b = cycle.get_last_child()
+    widget_a = task_a.get_widget()._w
+    widget_b = task_b.get_widget()._w
+
+    rerender_running_tasks(root)
+    assert task_a.get_widget()._w is widget_a
+    assert task_b.get_widget()._w is not widget_b